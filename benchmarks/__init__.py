@@ -0,0 +1,5 @@
+from dotenv import load_dotenv
+
+# The benchmarks are entrypoints of their own: load .env before the project modules read their settings,
+# as uvicorn --env-file does for the app.
+load_dotenv(".env")
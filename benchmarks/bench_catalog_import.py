@@ -0,0 +1,142 @@
+"""
+Measures catalog import and export throughput (rows per second) and peak traced memory. The catalog
+is generated up front and replayed in network-sized chunks; allocations made before a measurement are
+not traced, so the peak reflects the pipeline, not the input. Throughput is measured in a separate
+untraced run because tracing slows allocation-heavy code down severalfold. Without --parse-only the database from docker-compose.yml must be running; imported hoses
+get a "bench-" id prefix and are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_catalog_import --rows 200000 --format csv
+    python -m benchmarks.bench_catalog_import --rows 200000 --parse-only
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+
+import prisma.models
+from project.catalog_io import (
+    CSV_MEDIA_TYPE,
+    CatalogRow,
+    format_csv,
+    iter_catalog_rows,
+)
+from project.database import database
+from project.exportCatalog_service import exportCatalog
+from project.importCatalog_service import streamCatalogImport
+from project.streaming import NDJSON_MEDIA_TYPE
+
+PLATFORMS = ("amazon", "ebay", "homedepot")
+NETWORK_CHUNK_BYTES = 64 * 1024
+
+
+def _row(i: int) -> Dict[str, object]:
+    return {
+        "hoseId": f"bench-{i // len(PLATFORMS):09d}",
+        "length": 5 + (i % 50),
+        "diameter": 1 + (i % 7) * 0.25,
+        "platform": PLATFORMS[i % len(PLATFORMS)],
+        "price": round(10 + (i % 400) * 0.5, 2),
+        "currency": "USD",
+        "available": i % 5 != 0,
+        "link": f"https://example.com/hose/{i}",
+    }
+
+
+def generate_catalog(rows: int, format: str) -> List[bytes]:
+    chunks: List[bytes] = []
+    buffer = format_csv([], header=True) if format == "csv" else ""
+    for start in range(0, rows, 1000):
+        batch = [_row(i) for i in range(start, min(rows, start + 1000))]
+        if format == "csv":
+            buffer += format_csv(batch)
+        else:
+            buffer += "".join(json.dumps(row) + "\n" for row in batch)
+        while len(buffer) >= NETWORK_CHUNK_BYTES:
+            chunks.append(buffer[:NETWORK_CHUNK_BYTES].encode("utf-8"))
+            buffer = buffer[NETWORK_CHUNK_BYTES:]
+    if buffer:
+        chunks.append(buffer.encode("utf-8"))
+    return chunks
+
+
+async def replay(chunks: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _measure(
+    rows: int, run: Callable[[], Awaitable[None]], trace_memory: bool
+) -> dict:
+    started = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - started
+    result = {
+        "rows": rows,
+        "elapsed_s": round(elapsed, 2),
+        "rows_per_s": round(rows / elapsed),
+    }
+    if trace_memory:
+        tracemalloc.start()
+        await run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mib"] = round(peak / 2**20, 1)
+    return result
+
+
+async def main(rows: int, format: str, chunk_size: int, parse_only: bool) -> None:
+    content_type = CSV_MEDIA_TYPE if format == "csv" else NDJSON_MEDIA_TYPE
+    catalog = generate_catalog(rows, format)
+    print(f"catalog: {rows} rows, {sum(map(len, catalog)) / 2**20:.1f} MiB of {format}")
+
+    async def parse() -> None:
+        async for raw in iter_catalog_rows(replay(catalog), content_type):
+            if isinstance(raw, dict):
+                CatalogRow.model_validate(raw)
+
+    print("parse + validate:", await _measure(rows, parse, trace_memory=True))
+    if parse_only:
+        return
+
+    await database.client.connect()
+    try:
+
+        async def load() -> None:
+            async for progress in streamCatalogImport(
+                replay(catalog), content_type, chunk_size
+            ):
+                pass
+            if progress.failed:
+                print("failed rows:", progress.failed, progress.errors[:3])
+
+        # The traced second run finds every hose and re-imports the rows as updates.
+        print(
+            f"import (chunks of {chunk_size}):",
+            await _measure(rows, load, trace_memory=True),
+        )
+
+        async def export() -> None:
+            async for _ in exportCatalog(format):
+                pass
+
+        exported = await prisma.models.PurchaseOption.prisma().count()
+        print("export:", await _measure(exported, export, trace_memory=True))
+    finally:
+        await prisma.models.Hose.prisma().delete_many(
+            where={"id": {"startswith": "bench-"}}
+        )
+        await database.client.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--parse-only", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.format, args.chunk_size, args.parse_only))
@@ -0,0 +1,67 @@
+"""
+Measures event-loop latency while a burst of signups hashes passwords, comparing bcrypt called
+inline on the loop (the old createUser behaviour) with the bounded password_hasher pool.
+
+Usage:
+    python -m benchmarks.bench_password_hashing --signups 32 --rounds 12
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+import bcrypt
+from project.password_hashing import PasswordHasher
+
+TICK_SECONDS = 0.001
+
+
+async def _probe_loop_lag(stop: asyncio.Event, lags: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+async def _measure(signups: int, hash_one: Callable[[str], Awaitable[str]]) -> dict:
+    stop = asyncio.Event()
+    lags: List[float] = []
+    probe = asyncio.create_task(_probe_loop_lag(stop, lags))
+    await asyncio.sleep(TICK_SECONDS * 5)
+    started = time.perf_counter()
+    await asyncio.gather(*(hash_one(f"password-{i}") for i in range(signups)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    lags.sort()
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "loop_lag_p50_ms": round(statistics.median(lags) * 1000, 2),
+        "loop_lag_p99_ms": round(lags[int(len(lags) * 0.99) - 1] * 1000, 2),
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2),
+    }
+
+
+async def main(signups: int, rounds: int, workers: int, executor: str) -> None:
+    async def inline_hash(password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode()
+
+    hasher = PasswordHasher(rounds, workers, executor)
+    try:
+        print("inline bcrypt:", await _measure(signups, inline_hash))
+        print(f"{executor} pool x{workers}:", await _measure(signups, hasher.hash))
+        print("pool stats:", hasher.stats())
+    finally:
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--signups", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    args = parser.parse_args()
+    asyncio.run(main(args.signups, args.rounds, args.workers, args.executor))
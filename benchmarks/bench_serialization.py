@@ -0,0 +1,183 @@
+"""
+Measures the per-row cost of turning database records into a JSON list response, before and after the
+fast path: a validated response model per row returned through FastAPI's response_model handling,
+versus JSON-ready dicts built straight from the records and rendered once by FastJSONResponse.
+model_construct is listed for comparison; with pydantic 2 it is no faster than validating, because
+validation runs in compiled code and model_construct does not. Records are synthetic stand-ins for
+Prisma records, so no database is needed.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from project.fetchCompatibilities_service import (
+    GetCompatibilitiesResponse,
+    HoseCompatibility,
+    compatibility_row,
+)
+from project.listProducts_service import (
+    ProductDetail,
+    ProductsListResponse,
+    PurchaseOptionDetail,
+    product_row,
+)
+from project.serialization import FastJSONResponse
+
+
+def fake_hoses(rows: int) -> List[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=f"hose-{i}",
+            length=10.0 + i % 40,
+            diameter=1.5,
+            PurchaseOptions=[
+                SimpleNamespace(
+                    platform=platform,
+                    price=19.99,
+                    currency="USD",
+                    available=True,
+                    link=f"https://example.com/{platform}/{i}",
+                )
+                for platform in ("amazon", "ebay")
+            ],
+        )
+        for i in range(rows)
+    ]
+
+
+def fake_compatibilities(rows: int) -> List[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=f"compat-{i}",
+            hoseId=f"hose-{i % 100}",
+            userId=f"user-{i % 10}",
+            compatible=i % 3 != 0,
+            checkedAt=now,
+            attachment="sprinkler",
+        )
+        for i in range(rows)
+    ]
+
+
+def validated_product(hose: Any) -> ProductDetail:
+    return ProductDetail(
+        id=hose.id,
+        length=hose.length,
+        diameter=hose.diameter,
+        purchaseOptions=[
+            PurchaseOptionDetail(
+                platform=option.platform,
+                price=option.price,
+                currency=option.currency,
+                available=option.available,
+                link=option.link,
+            )
+            for option in hose.PurchaseOptions
+        ],
+    )
+
+
+def constructed_product(hose: Any) -> ProductDetail:
+    return ProductDetail.model_construct(
+        id=hose.id,
+        length=hose.length,
+        diameter=hose.diameter,
+        purchaseOptions=[
+            PurchaseOptionDetail.model_construct(
+                platform=option.platform,
+                price=option.price,
+                currency=option.currency,
+                available=option.available,
+                link=option.link,
+            )
+            for option in hose.PurchaseOptions
+        ],
+    )
+
+
+def validated_compatibility(record: Any) -> HoseCompatibility:
+    return HoseCompatibility(
+        id=record.id,
+        hoseId=record.hoseId,
+        userId=record.userId,
+        compatible=record.compatible,
+        checkedAt=record.checkedAt,
+        attachment=record.attachment,
+    )
+
+
+def per_row_us(rows: int, repeat: int, run: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return round(best / rows * 1e6, 2)
+
+
+def build_app(hoses: List[Any], compatibilities: List[Any]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before/products", response_model=ProductsListResponse)
+    async def products_before() -> ProductsListResponse:
+        return ProductsListResponse(products=[validated_product(h) for h in hoses])
+
+    @app.get("/after/products", response_model=ProductsListResponse)
+    async def products_after() -> FastJSONResponse:
+        return FastJSONResponse({"products": [product_row(h) for h in hoses]})
+
+    @app.get("/before/compatibilities", response_model=GetCompatibilitiesResponse)
+    async def compatibilities_before() -> GetCompatibilitiesResponse:
+        return GetCompatibilitiesResponse(
+            compatibilities=[validated_compatibility(r) for r in compatibilities]
+        )
+
+    @app.get("/after/compatibilities", response_model=GetCompatibilitiesResponse)
+    async def compatibilities_after() -> FastJSONResponse:
+        return FastJSONResponse(
+            {"compatibilities": [compatibility_row(r) for r in compatibilities]}
+        )
+
+    return app
+
+
+def main(rows: int, repeat: int) -> None:
+    hoses = fake_hoses(rows)
+    compatibilities = fake_compatibilities(rows)
+    print(f"per-row cost in microseconds, best of {repeat}, {rows} rows")
+    print(
+        "build products  validated:",
+        per_row_us(rows, repeat, lambda: [validated_product(h) for h in hoses]),
+        " model_construct:",
+        per_row_us(rows, repeat, lambda: [constructed_product(h) for h in hoses]),
+        " dict rows:",
+        per_row_us(rows, repeat, lambda: [product_row(h) for h in hoses]),
+    )
+    client = TestClient(build_app(hoses, compatibilities))
+    for resource in ("products", "compatibilities"):
+        before = client.get(f"/before/{resource}")
+        after = client.get(f"/after/{resource}")
+        assert before.json() == after.json(), f"{resource} responses differ"
+        print(
+            f"GET {resource}  response_model:",
+            per_row_us(rows, repeat, lambda: client.get(f"/before/{resource}")),
+            " FastJSONResponse:",
+            per_row_us(rows, repeat, lambda: client.get(f"/after/{resource}")),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,94 @@
+"""
+Measures cold-start time of the application with eager and lazy (LAZY_ROUTES=1) route modules:
+the time to import project.server, and the time from spawning uvicorn until the first request is
+answered. The first request needs the database from docker-compose.yml to be running.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5 --path /tips
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import project.server; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _env(lazy: bool) -> Dict[str, str]:
+    return {**os.environ, "LAZY_ROUTES": "1" if lazy else "0"}
+
+
+def measure_import(lazy: bool) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        env=_env(lazy),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_request(lazy: bool, port: int, path: str, timeout: float) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "project.server:app", "--port", str(port)],
+        env=_env(lazy),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1)
+                return time.perf_counter() - started
+            except urllib.error.HTTPError:
+                return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise TimeoutError(f"uvicorn did not answer {path} within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _summary(samples: List[float]) -> dict:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main(runs: int, port: int, path: str, timeout: float, skip_server: bool) -> None:
+    for lazy in (False, True):
+        label = "lazy" if lazy else "eager"
+        imports = [measure_import(lazy) for _ in range(runs)]
+        print(f"{label} import project.server:", _summary(imports))
+        if not skip_server:
+            first = [
+                measure_first_request(lazy, port, path, timeout) for _ in range(runs)
+            ]
+            print(f"{label} spawn to first response on {path}:", _summary(first))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/tips")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--skip-server", action="store_true", help="only measure the import time"
+    )
+    args = parser.parse_args()
+    main(args.runs, args.port, args.path, args.timeout, args.skip_server)
@@ -0,0 +1,127 @@
+"""
+Measures what the table version triggers of migrations/table_versions.sql cost concurrent writers.
+concurrency tasks each update their own hose repeat times, every update in a transaction held open for
+hold seconds after the write to stand in for the rest of a request's work, with the Hose trigger in
+three variants: absent, bumping a single counter row per table (how the versions were first kept), and
+bumping the per-connection shards the migration uses. Run against the database from docker-compose.yml
+after applying the migration, which the benchmark re-applies when it is done. Seeded hoses get a
+"bench-versions-" id prefix and are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_table_versions --concurrency 16 --repeat 150 --hold 0.002
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import prisma
+from benchmarks.seed import SeedVolumes, clear, seed
+from project.database import database
+
+PREFIX = "bench-versions-"
+MIGRATION = Path(__file__).resolve().parent.parent / "migrations" / "table_versions.sql"
+
+SINGLE_ROW_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO "TableVersion" ("name", "shard", "version") VALUES (TG_TABLE_NAME, 0, 1)
+    ON CONFLICT ("name", "shard") DO UPDATE SET "version" = "TableVersion"."version" + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+UPDATE_QUERY = 'UPDATE "Hose" SET "length" = "length" + 1 WHERE "id" = $1'
+
+
+def migration_statements() -> List[str]:
+    chunks = MIGRATION.read_text().split(";\n\n")
+    statements = (chunk.strip().rstrip(";") for chunk in chunks)
+    return [statement for statement in statements if statement]
+
+
+async def apply_migration() -> None:
+    for statement in migration_statements():
+        await prisma.get_client().execute_raw(statement)
+
+
+async def install(variant: str) -> None:
+    await apply_migration()
+    if variant == "none":
+        await prisma.get_client().execute_raw(
+            'DROP TRIGGER "Hose_bump_version" ON "Hose"'
+        )
+    elif variant == "single-row":
+        await prisma.get_client().execute_raw(SINGLE_ROW_FUNCTION)
+
+
+async def writer(hose_id: str, repeat: int, hold: float) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        async with prisma.get_client().tx() as transaction:
+            await transaction.execute_raw(UPDATE_QUERY, hose_id)
+            if hold:
+                await asyncio.sleep(hold)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _summary(samples: List[float], elapsed: float) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "writes_per_s": round(len(ordered) / elapsed),
+        "p50_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 2),
+    }
+
+
+async def main(concurrency: int, repeat: int, hold: float) -> None:
+    await database.client.connect()
+    try:
+        await clear(PREFIX)
+        volumes = SeedVolumes(
+            users=1,
+            hoses=concurrency,
+            measurements=0,
+            compatibilities=0,
+            usage_logs=0,
+            tips=0,
+            questions=0,
+            answers=0,
+        )
+        data = await seed(volumes, prefix=PREFIX)
+        print(f"{concurrency} writers, {repeat} updates each, held {hold * 1000:g} ms")
+        baseline: Optional[float] = None
+        for variant in ("none", "single-row", "sharded"):
+            await install(variant)
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(writer(hose_id, repeat, hold) for hose_id in data.hose_ids)
+            )
+            summary = _summary(
+                [sample for samples in results for sample in samples],
+                time.perf_counter() - started,
+            )
+            baseline = baseline or summary["writes_per_s"]
+            print(
+                f"{variant:10}  {summary}",
+                f" throughput: {summary['writes_per_s'] / baseline:.0%} of no trigger",
+            )
+    finally:
+        await apply_migration()
+        await clear(PREFIX)
+        await database.client.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=150)
+    parser.add_argument("--hold", type=float, default=0.002)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.repeat, args.hold))
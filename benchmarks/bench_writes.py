@@ -0,0 +1,191 @@
+"""
+Measures the latency of the single-statement write paths against the previous ones, which read the
+record with find_unique before writing it: updateMeasurement, updateProduct, updateUser,
+createMeasurement and deleteCompatibility. The previous versions are reproduced here query for query. Each path runs repeat
+times against the database from docker-compose.yml, alternating before and after so that both see the
+same cache and connection state; the latency saved per write is about one database round-trip.
+For updateUser only the database statements are timed, not the building of its response. Each
+deleteCompatibility run deletes an entry created for it, outside the timed section.
+Seeded users and hoses get a "bench-writes-" id prefix and are deleted afterwards, together with the
+measurements created.
+
+Usage:
+    python -m benchmarks.bench_writes --repeat 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import prisma
+import prisma.enums
+import prisma.models
+from benchmarks.seed import SeedVolumes, clear, seed
+from project.createMeasurement_service import createMeasurement
+from project.database import database
+from project.deleteCompatibility_service import deleteCompatibility
+from project.updateMeasurement_service import updateMeasurement
+from project.updateProduct_service import ProductDetails, updateProduct
+from project.updateUser_service import UPDATE_USER_QUERY
+
+PREFIX = "bench-writes-"
+
+
+async def update_measurement_before(measurement_id: str) -> None:
+    actions = prisma.models.HoseMeasurement.prisma()
+    if await actions.find_unique(where={"id": measurement_id}) is None:
+        raise ValueError("Measurement not found")
+    await actions.update(
+        where={"id": measurement_id},
+        data={"Hose": {"update": {"length": 25.0, "diameter": 0.625}}},
+    )
+
+
+async def update_product_before(hose_id: str) -> None:
+    actions = prisma.models.Hose.prisma()
+    if await actions.find_unique(where={"id": hose_id}) is None:
+        raise ValueError("Product not found")
+    await actions.update(where={"id": hose_id}, data={"length": 25.0})
+
+
+async def update_user_before(user_id: str) -> None:
+    actions = prisma.models.User.prisma()
+    if await actions.find_unique(where={"id": user_id}) is None:
+        raise ValueError("User not found")
+    await actions.update(
+        where={"id": user_id}, data={"email": f"{user_id}@example.com"}
+    )
+
+
+async def create_measurement_before(hose_id: str, user_id: str) -> None:
+    if await prisma.models.User.prisma().find_unique(where={"id": user_id}) is None:
+        raise ValueError("User not found")
+    if await prisma.models.Hose.prisma().find_unique(where={"id": hose_id}) is None:
+        raise ValueError("Hose not found")
+    await prisma.models.HoseMeasurement.prisma().create(
+        data={"hoseId": hose_id, "userId": user_id}
+    )
+
+
+async def delete_compatibility_before(compatibility_id: str) -> None:
+    compatibility = await prisma.models.HoseCompatibility.prisma().find_unique(
+        where={"id": compatibility_id}
+    )
+    if compatibility is None:
+        raise ValueError("Compatibility entry not found")
+    user = await prisma.models.User.prisma().find_unique(
+        where={"id": compatibility.userId}
+    )
+    if user is None or user.role != prisma.enums.UserRole.ADMINISTRATOR:
+        raise ValueError("Insufficient permissions")
+    await prisma.models.HoseCompatibility.prisma().delete(
+        where={"id": compatibility_id}
+    )
+
+
+def _checked(result: Any) -> None:
+    if getattr(result, "success", True) is False:
+        raise RuntimeError(result.message)
+
+
+def _paths(
+    hose_id: str, user_id: str, measurement_id: str
+) -> Dict[str, Dict[str, Callable[..., Awaitable[Any]]]]:
+    details = ProductDetails(name="bench", description="", price=25.0, available=True)
+    return {
+        "updateMeasurement": {
+            "before": lambda: update_measurement_before(measurement_id),
+            "after": lambda: updateMeasurement(measurement_id, 25.0, 0.625),
+        },
+        "updateProduct": {
+            "before": lambda: update_product_before(hose_id),
+            "after": lambda: updateProduct(hose_id, details),
+        },
+        "updateUser": {
+            "before": lambda: update_user_before(user_id),
+            "after": lambda: prisma.get_client().query_raw(
+                UPDATE_USER_QUERY, user_id, f"{user_id}@example.com", None
+            ),
+        },
+        "createMeasurement": {
+            "before": lambda: create_measurement_before(hose_id, user_id),
+            "after": lambda: createMeasurement(hose_id, 25.0, 0.625, user_id),
+        },
+        "deleteCompatibility": {
+            "before": delete_compatibility_before,
+            "after": deleteCompatibility,
+        },
+    }
+
+
+def _setups(hose_id: str, user_id: str) -> Dict[str, Callable[[], Awaitable[Tuple]]]:
+    async def compatibility_entry() -> Tuple[str]:
+        entry = await prisma.models.HoseCompatibility.prisma().create(
+            data={
+                "hoseId": hose_id,
+                "userId": user_id,
+                "attachment": "bench",
+                "compatible": True,
+            }
+        )
+        return (entry.id,)
+
+    return {"deleteCompatibility": compatibility_entry}
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 3),
+    }
+
+
+async def main(repeat: int) -> None:
+    await database.client.connect()
+    try:
+        await clear(PREFIX)
+        volumes = SeedVolumes(
+            users=1,
+            hoses=1,
+            measurements=1,
+            compatibilities=0,
+            usage_logs=0,
+            tips=0,
+            questions=0,
+            answers=0,
+        )
+        data = await seed(volumes, prefix=PREFIX)
+        hose_id, user_id = data.hose_ids[0], data.user_ids[0]
+        await prisma.models.User.prisma().update(
+            where={"id": user_id}, data={"role": prisma.enums.UserRole.ADMINISTRATOR}
+        )
+        paths = _paths(hose_id, user_id, data.measurement_ids[0])
+        setups = _setups(hose_id, user_id)
+        print(f"latency per write, {repeat} runs each")
+        for name, variants in paths.items():
+            samples: Dict[str, List[float]] = {variant: [] for variant in variants}
+            for _ in range(repeat):
+                for variant, run in variants.items():
+                    args = await setups[name]() if name in setups else ()
+                    started = time.perf_counter()
+                    _checked(await run(*args))
+                    samples[variant].append(time.perf_counter() - started)
+            before, after = (_summary(samples[v]) for v in ("before", "after"))
+            print(
+                f"{name:18}  before: {before}  after: {after}",
+                f" saved: {1 - after['p50_ms'] / before['p50_ms']:.0%} of p50",
+            )
+    finally:
+        await clear(PREFIX)
+        await database.client.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,712 @@
+"""
+Load test of every route in project/server.py. Seeds the database from docker-compose.yml (see
+benchmarks.seed), drives each route in turn with a closed-loop async load generator and writes the
+throughput, error count and p50/p95/p99 latency of every route into a JSON report, so that two
+commits can be compared with --compare.
+
+By default the app runs in-process behind httpx's ASGI transport, started after seeding, so no server
+is needed; --base-url targets a running server instead (which must use the same database). Records the
+routes create or delete are set up and cleaned up outside the timed requests; the seeded data and
+everything created through the API during the run is removed afterwards.
+
+Usage:
+    python -m benchmarks.load_test --duration 10 --concurrency 16 --output report.json
+    python -m benchmarks.load_test --base-url http://localhost:8080 --routes "GET /products*"
+    python -m benchmarks.load_test --output new.json --compare old.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import count
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+import prisma.models
+from benchmarks.seed import (
+    ATTACHMENTS,
+    SEARCH_WORDS,
+    SeedData,
+    SeedVolumes,
+    add_volume_arguments,
+    clear,
+    seed,
+    volumes_from_arguments,
+)
+from fastapi.routing import APIRoute
+from project.catalog_io import CSV_MEDIA_TYPE, format_csv
+from project.database import database
+from project.server import app
+from project.streaming import NDJSON_MEDIA_TYPE
+
+REQUEST_TIMEOUT_SECONDS = 60.0
+
+
+class LoadContext(NamedTuple):
+    """
+    What request builders draw on: the seeded ids, a random generator and a run-wide sequence number.
+    """
+
+    data: SeedData
+    prefix: str
+    rng: random.Random
+    sequence: Any
+
+
+class Scenario(NamedTuple):
+    """
+    The load for one route. build returns the keyword arguments of httpx.AsyncClient.request other than
+    the method; it may create the record a request deletes, which is not timed.
+    """
+
+    method: str
+    route: str
+    build: Callable[[LoadContext], Awaitable[Dict[str, Any]]]
+
+
+def _static(url: str) -> Callable[[LoadContext], Awaitable[Dict[str, Any]]]:
+    async def build(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": url}
+
+    return build
+
+
+def _hose(ctx: LoadContext) -> str:
+    return ctx.rng.choice(ctx.data.hose_ids)
+
+
+def _user(ctx: LoadContext) -> str:
+    return ctx.rng.choice(ctx.data.user_ids)
+
+
+def _measurement(ctx: LoadContext) -> str:
+    return ctx.rng.choice(ctx.data.measurement_ids)
+
+
+def _compatibility(ctx: LoadContext) -> str:
+    return ctx.rng.choice(ctx.data.compatibility_ids)
+
+
+def _unique(ctx: LoadContext, kind: str) -> str:
+    return f"{ctx.prefix}{kind}-run-{next(ctx.sequence)}"
+
+
+async def _new_hose(ctx: LoadContext) -> str:
+    hose = await prisma.models.Hose.prisma().create(
+        data={"id": _unique(ctx, "hose"), "length": 25.0, "diameter": 0.625}
+    )
+    return hose.id
+
+
+async def _new_user(ctx: LoadContext) -> str:
+    user_id = _unique(ctx, "user")
+    await prisma.models.User.prisma().create(
+        data={"id": user_id, "email": f"{user_id}@example.com", "password": "x"}
+    )
+    return user_id
+
+
+async def _new_measurement(ctx: LoadContext) -> str:
+    measurement = await prisma.models.HoseMeasurement.prisma().create(
+        data={"hoseId": _hose(ctx), "userId": _user(ctx)}
+    )
+    return measurement.id
+
+
+async def _new_compatibility(ctx: LoadContext) -> str:
+    compatibility = await prisma.models.HoseCompatibility.prisma().create(
+        data={
+            "hoseId": _hose(ctx),
+            "userId": _user(ctx),
+            "compatible": True,
+            "attachment": "nozzle",
+        }
+    )
+    return compatibility.id
+
+
+async def _new_tip(ctx: LoadContext) -> str:
+    tip = await prisma.models.CareTip.prisma().create(
+        data={
+            "id": _unique(ctx, "tip"),
+            "title": "Load test",
+            "description": "load-test tip",
+            "practices": [],
+            "hoseIds": [_hose(ctx)],
+        }
+    )
+    return tip.id
+
+
+def _catalog_csv(ctx: LoadContext, rows: int) -> bytes:
+    hose_id = _unique(ctx, "hose")
+    return format_csv(
+        [
+            {
+                "hoseId": f"{hose_id}-{i}",
+                "length": 50,
+                "diameter": 0.75,
+                "platform": "amazon",
+                "price": 24.99,
+                "currency": "USD",
+                "available": True,
+                "link": "https://example.com/amazon/load",
+            }
+            for i in range(rows)
+        ],
+        header=True,
+    ).encode("utf-8")
+
+
+def build_scenarios() -> List[Scenario]:
+    """
+    The request mix for every route in project/server.py, one scenario per method and path.
+    """
+
+    def scenario(method: str, route: str):
+        def register(build: Callable[[LoadContext], Awaitable[Dict[str, Any]]]):
+            scenarios.append(Scenario(method, route, build))
+            return build
+
+        return register
+
+    scenarios: List[Scenario] = [
+        Scenario(method, route, _static(route))
+        for method, route in (
+            ("GET", "/metrics"),
+            ("GET", "/health/ready"),
+            ("GET", "/cache/stats"),
+            ("POST", "/compatibilities/matrix:rebuild"),
+            ("POST", "/analytics/usage:rollup"),
+        )
+    ]
+
+    @scenario("GET", "/products")
+    async def list_products(ctx: LoadContext) -> Dict[str, Any]:
+        low = ctx.rng.choice((10, 15, 25, 50))
+        return {
+            "url": "/products",
+            "params": {
+                "hose_length_min": low,
+                "hose_length_max": low * 2,
+                "hose_diameter_min": 0.5,
+                "hose_diameter_max": 0.75,
+            },
+        }
+
+    @scenario("GET", "/products/nearest")
+    async def nearest_products(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/products/nearest",
+            "params": {
+                "length": ctx.rng.uniform(10, 100),
+                "diameter": ctx.rng.uniform(0.5, 1.0),
+                "limit": 10,
+            },
+        }
+
+    @scenario("GET", "/products/{productId}")
+    async def product_details(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/products/{_hose(ctx)}"}
+
+    @scenario("GET", "/products/{productId}/attachments")
+    async def product_attachments(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/products/{_hose(ctx)}/attachments"}
+
+    @scenario("GET", "/products/{productId}/prices")
+    async def product_prices(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": f"/products/{_hose(ctx)}/prices",
+            "params": {"user_location": "DE"},
+        }
+
+    @scenario("POST", "/products")
+    async def create_product(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/products",
+            "params": {"length": 25, "diameter": 0.625},
+            "json": ["kink-resistant"],
+        }
+
+    @scenario("PUT", "/products/{productId}")
+    async def update_product(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": f"/products/{_hose(ctx)}",
+            "json": {
+                "name": "Garden hose",
+                "description": "load test",
+                "price": 29.99,
+                "available": True,
+            },
+        }
+
+    @scenario("DELETE", "/products/{productId}")
+    async def delete_product(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/products/{await _new_hose(ctx)}"}
+
+    @scenario("POST", "/products:import")
+    async def import_catalog(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/products:import",
+            "content": _catalog_csv(ctx, 100),
+            "headers": {"content-type": CSV_MEDIA_TYPE},
+        }
+
+    @scenario("GET", "/products:export")
+    async def export_catalog(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": "/products:export", "params": {"format": "csv"}}
+
+    @scenario("GET", "/purchase-platforms")
+    async def purchase_platforms(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/purchase-platforms",
+            "params": {"product_id": _hose(ctx), "user_location": "US"},
+        }
+
+    @scenario("POST", "/purchase-platforms/basket")
+    async def price_basket(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/purchase-platforms/basket",
+            "json": {
+                "items": [
+                    {"productId": _hose(ctx), "quantity": ctx.rng.randint(1, 3)}
+                    for _ in range(5)
+                ],
+                "currency": "EUR",
+            },
+        }
+
+    @scenario("GET", "/compatibilities")
+    async def list_compatibilities(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": "/compatibilities", "json": {}}
+
+    @scenario("GET", "/compatibilities/check")
+    async def check_compatibility(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/compatibilities/check",
+            "params": {"hoseId": _hose(ctx), "attachment": ctx.rng.choice(ATTACHMENTS)},
+        }
+
+    @scenario("GET", "/compatibilities/{compatibilityId}")
+    async def get_compatibility(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/compatibilities/{_compatibility(ctx)}"}
+
+    @scenario("POST", "/compatibilities")
+    async def create_compatibility(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/compatibilities",
+            "params": {
+                "hoseId": _hose(ctx),
+                "userId": _user(ctx),
+                "compatible": True,
+                "attachment": ctx.rng.choice(ATTACHMENTS),
+            },
+        }
+
+    @scenario("PUT", "/compatibilities/{compatibilityId}")
+    async def update_compatibility(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": f"/compatibilities/{_compatibility(ctx)}",
+            "params": {
+                "compatible": ctx.rng.random() > 0.3,
+                "attachment": ctx.rng.choice(ATTACHMENTS),
+                "checkedAt": datetime.now(timezone.utc).isoformat(),
+            },
+        }
+
+    @scenario("DELETE", "/compatibilities/{compatibilityId}")
+    async def delete_compatibility(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/compatibilities/{await _new_compatibility(ctx)}"}
+
+    @scenario("GET", "/measurements")
+    async def list_measurements(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": "/measurements", "json": {}}
+
+    @scenario("GET", "/measurements/stats")
+    async def measurement_stats(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": "/measurements/stats", "params": {"days": 7}}
+
+    @scenario("GET", "/measurements/{measurementId}")
+    async def get_measurement(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/measurements/{_measurement(ctx)}"}
+
+    @scenario("POST", "/measurements")
+    async def create_measurement(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/measurements",
+            "params": {
+                "hoseId": _hose(ctx),
+                "userId": _user(ctx),
+                "length": 25,
+                "diameter": 0.625,
+            },
+        }
+
+    @scenario("POST", "/measurements:batch")
+    async def create_measurements_batch(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/measurements:batch",
+            "content": "".join(
+                json.dumps(
+                    {
+                        "hoseId": _hose(ctx),
+                        "userId": _user(ctx),
+                        "length": 25,
+                        "diameter": 0.625,
+                    }
+                )
+                + "\n"
+                for _ in range(100)
+            ),
+            "headers": {"content-type": NDJSON_MEDIA_TYPE},
+        }
+
+    @scenario("PUT", "/measurements/{measurementId}")
+    async def update_measurement(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": f"/measurements/{_measurement(ctx)}",
+            "params": {"length": 25, "diameter": 0.625},
+        }
+
+    @scenario("DELETE", "/measurements/{measurementId}")
+    async def delete_measurement(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/measurements/{await _new_measurement(ctx)}"}
+
+    @scenario("GET", "/users")
+    async def list_users(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": "/users", "params": {"limit": 50}}
+
+    @scenario("GET", "/users/{userId}")
+    async def user_details(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/users/{_user(ctx)}"}
+
+    @scenario("GET", "/users/{userId}/timeline")
+    async def user_timeline(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/users/{_user(ctx)}/timeline", "params": {"limit": 50}}
+
+    @scenario("POST", "/users")
+    async def create_user(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/users",
+            "params": {
+                "email": f"{_unique(ctx, 'user')}@example.com",
+                "password": "load-test-password",
+                "role": "STANDARD_USER",
+            },
+        }
+
+    @scenario("PUT", "/users/{userId}")
+    async def update_user(ctx: LoadContext) -> Dict[str, Any]:
+        user_id = _user(ctx)
+        return {
+            "url": f"/users/{user_id}",
+            "params": {
+                "email": f"{user_id}@example.com",
+                "name": "Load Test",
+                "role": "STANDARD_USER",
+            },
+        }
+
+    @scenario("DELETE", "/users/{userId}")
+    async def delete_user(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/users/{await _new_user(ctx)}"}
+
+    @scenario("POST", "/user-inquiries")
+    async def log_user_inquiry(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/user-inquiries",
+            "params": {
+                "userId": _user(ctx),
+                "inquiryDetails": "How long is this hose?",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        }
+
+    @scenario("GET", "/questions/search")
+    async def search_questions(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/questions/search",
+            "params": {
+                "q": " ".join(ctx.rng.sample(SEARCH_WORDS, ctx.rng.randint(1, 3))),
+                "limit": 20,
+            },
+        }
+
+    @scenario("GET", "/analytics/usage")
+    async def usage_analytics(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/analytics/usage",
+            "params": {"granularity": ctx.rng.choice(("hour", "day")), "top": 10},
+        }
+
+    @scenario("GET", "/tips")
+    async def list_tips(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": "/tips", "json": {}}
+
+    @scenario("GET", "/tips/{tipId}")
+    async def get_tip(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/tips/{ctx.rng.choice(ctx.data.tip_ids)}"}
+
+    @scenario("POST", "/tips")
+    async def create_tip(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": "/tips",
+            "params": {"description": "Drain before winter", "hoseTypeId": _hose(ctx)},
+            "json": ["Store coiled"],
+        }
+
+    @scenario("PUT", "/tips/{tipId}")
+    async def update_tip(ctx: LoadContext) -> Dict[str, Any]:
+        return {
+            "url": f"/tips/{ctx.rng.choice(ctx.data.tip_ids)}",
+            "params": {"tipTitle": "Winter", "tipContent": "Drain before winter"},
+            "json": [_hose(ctx)],
+        }
+
+    @scenario("DELETE", "/tips/{tipId}")
+    async def delete_tip(ctx: LoadContext) -> Dict[str, Any]:
+        return {"url": f"/tips/{await _new_tip(ctx)}"}
+
+    return scenarios
+
+
+def app_routes() -> List[str]:
+    """
+    The "METHOD /path" of every route the app serves, including the ones hidden from the schema.
+    """
+    return sorted(
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    )
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    index = max(
+        0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    summary: Dict[str, Any] = {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+    if latencies:
+        summary.update(
+            {
+                f"{name}_ms": round(percentile(latencies, fraction) * 1000, 2)
+                for name, fraction in (
+                    ("p50", 0.5),
+                    ("p95", 0.95),
+                    ("p99", 0.99),
+                    ("max", 1.0),
+                )
+            }
+        )
+    return summary
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ctx: LoadContext,
+    concurrency: int,
+    duration: float,
+) -> Dict[str, Any]:
+    """
+    Sends requests for one scenario from concurrency workers, each waiting for its response before
+    sending the next, until duration seconds have passed.
+
+    Returns:
+        Dict[str, Any]: requests, errors (transport errors and 4xx/5xx responses), rps and latency
+        percentiles in milliseconds.
+    """
+    latencies: List[float] = []
+    failures: List[str] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            kwargs = await scenario.build(ctx)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, **kwargs)
+                await response.aread()
+                if response.status_code >= 400:
+                    failures.append(
+                        f"HTTP {response.status_code}: {response.text[:200]}"
+                    )
+            except httpx.HTTPError as e:
+                failures.append(f"{type(e).__name__}: {e}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies, len(failures), time.perf_counter() - started)
+    if failures:
+        result["first_error"] = failures[0]
+    return result
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Lists the routes whose p95 latency grew, or whose throughput or success rate fell, by more than
+    threshold (a fraction) relative to the baseline report.
+    """
+    regressions = []
+    for name, current in report["routes"].items():
+        previous = baseline["routes"].get(name)
+        if not previous or not previous.get("requests") or not current.get("requests"):
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms"
+            )
+        if current["rps"] < previous["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+        error_rate = current["errors"] / current["requests"]
+        previous_error_rate = previous["errors"] / previous["requests"]
+        if error_rate > previous_error_rate + threshold:
+            regressions.append(
+                f"{name}: error rate {previous_error_rate:.0%} -> {error_rate:.0%}"
+            )
+    return regressions
+
+
+async def run(
+    scenarios: List[Scenario],
+    volumes: SeedVolumes,
+    prefix: str,
+    concurrency: int,
+    duration: float,
+    base_url: Optional[str],
+) -> Dict[str, Any]:
+    run_started = datetime.now(timezone.utc)
+    await database.client.connect()
+    try:
+        await clear(prefix)
+        seeding_started = time.perf_counter()
+        data = await seed(volumes, prefix)
+        seed_seconds = round(time.perf_counter() - seeding_started, 1)
+    except Exception:
+        await clear(prefix)
+        await database.client.disconnect()
+        raise
+    lifespan = None
+    transport = None
+    if not base_url:
+        # Start the app after seeding so that its startup preloads see the seeded data.
+        await database.client.disconnect()
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        # Report unhandled errors as 500 responses, as a server would, instead of raising them here.
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    routes: Dict[str, Any] = {}
+    try:
+        ctx = LoadContext(data, prefix, random.Random(1), count())
+        async with httpx.AsyncClient(
+            base_url=base_url or "http://load-test",
+            transport=transport,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        ) as client:
+            for scenario in scenarios:
+                name = f"{scenario.method} {scenario.route}"
+                routes[name] = await drive(client, scenario, ctx, concurrency, duration)
+                print(name, routes[name], file=sys.stderr)
+    finally:
+        await clear(prefix, created_since=run_started)
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        else:
+            await database.client.disconnect()
+    return {
+        "revision": git_revision(),
+        "started_at": run_started.isoformat(),
+        "python": platform.python_version(),
+        "target": base_url or "in-process",
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "seed": volumes._asdict(),
+        "seed_s": seed_seconds,
+        "routes": routes,
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    scenarios = build_scenarios()
+    covered = {f"{s.method} {s.route}" for s in scenarios}
+    missing = [route for route in app_routes() if route not in covered]
+    if missing:
+        print("routes without a load scenario:", ", ".join(missing), file=sys.stderr)
+    if args.routes:
+        scenarios = [
+            s
+            for s in scenarios
+            if any(fnmatch.fnmatch(f"{s.method} {s.route}", p) for p in args.routes)
+        ]
+    report = asyncio.run(
+        run(
+            scenarios,
+            volumes_from_arguments(args),
+            args.prefix,
+            args.concurrency,
+            args.duration,
+            args.base_url,
+        )
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print("regression:", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument(
+        "--routes", nargs="*", help='Glob patterns such as "GET /products*"'
+    )
+    parser.add_argument("--output", default="load_report.json")
+    parser.add_argument("--compare", help="A previous report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    add_volume_arguments(parser)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,22 @@
+"""
+Prints how long each module takes to execute while importing the application, slowest first.
+Set LAZY_ROUTES=1 to see the import cost with service modules deferred.
+
+Usage:
+    python -m benchmarks.profile_imports --top 30 --sort cumulative
+"""
+
+import argparse
+import importlib
+
+from project.import_hooks import ImportProfiler
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="project.server")
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative")
+    args = parser.parse_args()
+    with ImportProfiler() as profiler:
+        importlib.import_module(args.module)
+    print(profiler.report(args.top, args.sort))
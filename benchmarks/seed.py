@@ -0,0 +1,297 @@
+"""
+Seeds the database from docker-compose.yml with a parametrized volume of synthetic users, hoses,
+purchase options, measurements, compatibilities, usage logs, care tips, questions and answers for the
+load tests. Every
+seeded user, hose and tip id starts with the given prefix, so clear() removes them (and, by cascade,
+every row that references them) without touching other data. Rows created through the API during a
+load test get generated ids; clear() removes those by creation time instead.
+
+Usage:
+    python -m benchmarks.seed --users 1000 --hoses 5000 --measurements 50000
+    python -m benchmarks.seed --clear
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import bcrypt
+import prisma.models
+from project.database import database
+
+DEFAULT_PREFIX = "load-"
+INSERT_CHUNK_SIZE = 5000
+PLATFORMS = ("amazon", "ebay", "homedepot")
+ATTACHMENTS = ("sprinkler", "nozzle", "reel", "splitter")
+# Vocabulary of the seeded questions and answers, and of the load test's search queries.
+SEARCH_WORDS = (
+    "leak",
+    "kink",
+    "crack",
+    "coupling",
+    "washer",
+    "nozzle",
+    "reel",
+    "pressure",
+    "winter",
+    "storage",
+    "sun",
+    "brass",
+    "vinyl",
+    "rubber",
+    "expandable",
+    "length",
+    "diameter",
+    "repair",
+    "warranty",
+    "faucet",
+    "connector",
+    "sprinkler",
+    "drip",
+    "burst",
+)
+
+
+class SeedVolumes(NamedTuple):
+    """
+    Number of rows seeded per table. Purchase options are seeded per hose, one per platform.
+    """
+
+    users: int = 200
+    hoses: int = 1000
+    measurements: int = 10000
+    compatibilities: int = 10000
+    usage_logs: int = 50000
+    tips: int = 100
+    questions: int = 2000
+    answers: int = 4000
+    days: int = 30
+
+
+class SeedData(NamedTuple):
+    """
+    Ids of the seeded rows, used by the load generator to build requests.
+    """
+
+    user_ids: List[str]
+    hose_ids: List[str]
+    measurement_ids: List[str]
+    compatibility_ids: List[str]
+    tip_ids: List[str]
+
+
+async def _create_many(actions: Any, rows: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await actions.create_many(data=rows[start : start + INSERT_CHUNK_SIZE])
+
+
+async def seed(
+    volumes: SeedVolumes, prefix: str = DEFAULT_PREFIX, seed: int = 0
+) -> SeedData:
+    """
+    Inserts the synthetic data set with create_many. The data is deterministic for a given seed, so two
+    runs with the same volumes query the same shape of data.
+
+    Args:
+        volumes (SeedVolumes): Number of rows per table.
+        prefix (str): Prefix of every seeded id.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        SeedData: Ids of the seeded rows.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    window = timedelta(days=volumes.days).total_seconds()
+    # Hashing is deliberately expensive; every seeded user shares one hash.
+    password = bcrypt.hashpw(b"load-test", bcrypt.gensalt(4)).decode()
+
+    def timestamp() -> datetime:
+        return now - timedelta(seconds=rng.uniform(0, window))
+
+    user_ids = [f"{prefix}user-{i:07d}" for i in range(volumes.users)]
+    hose_ids = [f"{prefix}hose-{i:07d}" for i in range(volumes.hoses)]
+    measurement_ids = [f"{prefix}m-{i:08d}" for i in range(volumes.measurements)]
+    compatibility_ids = [f"{prefix}c-{i:08d}" for i in range(volumes.compatibilities)]
+    tip_ids = [f"{prefix}tip-{i:06d}" for i in range(volumes.tips)]
+    question_ids = [f"{prefix}q-{i:08d}" for i in range(volumes.questions)]
+
+    def text() -> str:
+        return " ".join(rng.choices(SEARCH_WORDS, k=rng.randint(6, 24)))
+
+    await _create_many(
+        prisma.models.User.prisma(),
+        [
+            {"id": user_id, "email": f"{user_id}@example.com", "password": password}
+            for user_id in user_ids
+        ],
+    )
+    await _create_many(
+        prisma.models.Hose.prisma(),
+        [
+            {
+                "id": hose_id,
+                "length": float(rng.choice((10, 15, 25, 50, 75, 100))),
+                "diameter": rng.choice((0.5, 0.625, 0.75, 1.0)),
+            }
+            for hose_id in hose_ids
+        ],
+    )
+    await _create_many(
+        prisma.models.PurchaseOption.prisma(),
+        [
+            {
+                "hoseId": hose_id,
+                "platform": platform,
+                "price": round(rng.uniform(10, 120), 2),
+                "currency": "USD",
+                "available": rng.random() > 0.1,
+                "link": f"https://example.com/{platform}/{hose_id}",
+            }
+            for hose_id in hose_ids
+            for platform in PLATFORMS
+        ],
+    )
+    await _create_many(
+        prisma.models.HoseMeasurement.prisma(),
+        [
+            {
+                "id": measurement_id,
+                "hoseId": rng.choice(hose_ids),
+                "userId": rng.choice(user_ids),
+                "measuredAt": timestamp(),
+            }
+            for measurement_id in measurement_ids
+        ],
+    )
+    await _create_many(
+        prisma.models.HoseCompatibility.prisma(),
+        [
+            {
+                "id": compatibility_id,
+                "hoseId": rng.choice(hose_ids),
+                "userId": rng.choice(user_ids),
+                "compatible": rng.random() > 0.3,
+                "attachment": rng.choice(ATTACHMENTS),
+                "checkedAt": timestamp(),
+            }
+            for compatibility_id in compatibility_ids
+        ],
+    )
+    # Skew views towards a few popular hoses, as real traffic would.
+    popular = hose_ids[: max(1, len(hose_ids) // 20)]
+    await _create_many(
+        prisma.models.UsageLog.prisma(),
+        [
+            {
+                "hoseId": rng.choice(popular if rng.random() < 0.5 else hose_ids),
+                "userId": rng.choice(user_ids),
+                "viewedAt": timestamp(),
+                "information": "load-test view",
+            }
+            for _ in range(volumes.usage_logs)
+        ],
+    )
+    await _create_many(
+        prisma.models.CareTip.prisma(),
+        [
+            {
+                "id": tip_id,
+                "title": f"Care tip {i}",
+                "description": "Drain the hose and store it coiled, out of direct sunlight.",
+                "practices": ["Drain after use", "Store coiled"],
+                "hoseIds": rng.sample(hose_ids, min(3, len(hose_ids))),
+                "createdAt": timestamp(),
+            }
+            for i, tip_id in enumerate(tip_ids)
+        ],
+    )
+    await _create_many(
+        prisma.models.Question.prisma(),
+        [
+            {
+                "id": question_id,
+                "content": text() + "?",
+                "userId": rng.choice(user_ids),
+                "createdAt": timestamp(),
+            }
+            for question_id in question_ids
+        ],
+    )
+    if question_ids:
+        await _create_many(
+            prisma.models.Answer.prisma(),
+            [
+                {
+                    "content": text() + ".",
+                    "questionId": rng.choice(question_ids),
+                    "userId": rng.choice(user_ids),
+                    "createdAt": timestamp(),
+                }
+                for _ in range(volumes.answers)
+            ],
+        )
+    return SeedData(user_ids, hose_ids, measurement_ids, compatibility_ids, tip_ids)
+
+
+async def clear(
+    prefix: str = DEFAULT_PREFIX, created_since: Optional[datetime] = None
+) -> None:
+    """
+    Deletes every user, hose and care tip whose id starts with prefix, together with the rows
+    referencing them.
+
+    Args:
+        prefix (str): Prefix of the seeded ids.
+        created_since (Optional[datetime]): Also delete users, hoses and tips created at or after this
+            time, i.e. the ones a load test created through the API.
+    """
+    where: Dict[str, Any] = {"id": {"startswith": prefix}}
+    if created_since is not None:
+        where = {"OR": [where, {"createdAt": {"gte": created_since}}]}
+    await prisma.models.User.prisma().delete_many(where=where)
+    await prisma.models.Hose.prisma().delete_many(where=where)
+    await prisma.models.CareTip.prisma().delete_many(where=where)
+
+
+async def main(volumes: SeedVolumes, prefix: str, only_clear: bool) -> None:
+    await database.client.connect()
+    try:
+        await clear(prefix)
+        if only_clear:
+            return
+        started = time.perf_counter()
+        data = await seed(volumes, prefix)
+        print(
+            f"seeded {len(data.user_ids)} users, {len(data.hose_ids)} hoses,",
+            f"{volumes.measurements} measurements, {volumes.compatibilities} compatibilities,",
+            f"{volumes.usage_logs} usage logs, {volumes.tips} tips,",
+            f"{volumes.questions} questions, {volumes.answers} answers",
+            f"in {time.perf_counter() - started:.1f}s",
+        )
+    finally:
+        await database.client.disconnect()
+
+
+def add_volume_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = SeedVolumes()
+    for field in SeedVolumes._fields:
+        parser.add_argument(
+            f"--{field.replace('_', '-')}", type=int, default=getattr(defaults, field)
+        )
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX)
+
+
+def volumes_from_arguments(args: argparse.Namespace) -> SeedVolumes:
+    return SeedVolumes(*(getattr(args, field) for field in SeedVolumes._fields))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_volume_arguments(parser)
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(volumes_from_arguments(args), args.prefix, args.clear))
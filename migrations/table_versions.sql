@@ -0,0 +1,50 @@
+-- Write versions of the tables list endpoints derive their ETags from (project/http_cache.py).
+-- Apply after `prisma db push`, as a role allowed to create triggers on these tables:
+--     prisma db execute --file migrations/table_versions.sql --schema schema.prisma
+-- Re-running it is harmless.
+--
+-- Every write statement adds one to a row of "TableVersion" in the same transaction, so a new version
+-- becomes visible exactly when the written rows do. A table's version is spread over up to 1024 shard
+-- rows picked by backend pid, and readers sum them: concurrent writers only queue on each other's
+-- counter when their connections land on the same shard.
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO "TableVersion" ("name", "shard", "version")
+    VALUES (TG_TABLE_NAME, pg_backend_pid() % 1024, 1)
+    ON CONFLICT ("name", "shard") DO UPDATE SET "version" = "TableVersion"."version" + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER "Answer_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "Answer"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE OR REPLACE TRIGGER "CareTip_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "CareTip"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE OR REPLACE TRIGGER "Hose_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "Hose"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE OR REPLACE TRIGGER "HoseCompatibility_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "HoseCompatibility"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE OR REPLACE TRIGGER "HoseMeasurement_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "HoseMeasurement"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE OR REPLACE TRIGGER "PurchaseOption_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "PurchaseOption"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE OR REPLACE TRIGGER "Question_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "Question"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+CREATE OR REPLACE TRIGGER "User_bump_version"
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "User"
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
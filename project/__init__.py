@@ -0,0 +1,5 @@
+from project.config import LAZY_ROUTES
+from project.import_hooks import install_lazy_service_imports
+
+if LAZY_ROUTES:
+    install_lazy_service_imports()
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import prisma
+import prisma.models
+
+MAX_BATCH_SIZE = 1000
+
+
+class BatchLoader:
+    """
+    Batches lookups of records by id, DataLoader style. Every load() made while the event loop works
+    through the current tick is collected, and once the tick's callbacks have run the distinct ids are
+    fetched with one find_many(where={"id": {"in": [...]}}) per MAX_BATCH_SIZE ids. Each caller then
+    receives its own record, or None if it does not exist.
+
+    Nothing is cached across ticks, so a load never returns a record older than the query it joined,
+    and one loader per model can safely be shared by all requests. Meant for single event-loop use.
+    """
+
+    def __init__(self, name: str, actions: Callable[[], Any]) -> None:
+        self.name = name
+        self._actions = actions
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.loads = 0
+        self.batches = 0
+        self.keys = 0
+
+    async def load(self, record_id: str) -> Optional[Any]:
+        """
+        Looks up one record by id, in the batch of the current tick.
+
+        Args:
+            record_id (str): The id of the record.
+
+        Returns:
+            Optional[Any]: The record, or None if no record has this id.
+        """
+        self.loads += 1
+        future = self._pending.get(record_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = loop.create_future()
+            self._pending[record_id] = future
+        return await asyncio.shield(future)
+
+    async def load_many(self, record_ids: Iterable[str]) -> List[Optional[Any]]:
+        """
+        Looks up several records by id, in the batch of the current tick.
+
+        Args:
+            record_ids (Iterable[str]): The ids of the records.
+
+        Returns:
+            List[Optional[Any]]: The records in the order of record_ids, None where no record has the id.
+        """
+        return list(await asyncio.gather(*(self.load(i) for i in record_ids)))
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        ids = list(batch)
+        for start in range(0, len(ids), MAX_BATCH_SIZE):
+            chunk = {i: batch[i] for i in ids[start : start + MAX_BATCH_SIZE]}
+            asyncio.ensure_future(self._fetch(chunk))
+
+    async def _fetch(self, chunk: Dict[str, asyncio.Future]) -> None:
+        self.batches += 1
+        self.keys += len(chunk)
+        try:
+            records = await self._actions().find_many(where={"id": {"in": list(chunk)}})
+        except Exception as e:
+            for future in chunk.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        found = {record.id: record for record in records}
+        for record_id, future in chunk.items():
+            if not future.done():
+                future.set_result(found.get(record_id))
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns how many loads were requested and how many batches and distinct ids served them.
+
+        Returns:
+            Dict[str, float]: The counters, keyed by name.
+        """
+        return {"loads": self.loads, "batches": self.batches, "keys": self.keys}
+
+
+user_loader = BatchLoader("users", lambda: prisma.models.User.prisma())
+hose_loader = BatchLoader("hoses", lambda: prisma.models.Hose.prisma())
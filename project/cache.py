@@ -0,0 +1,158 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    A least-recently-used cache whose entries also expire after a fixed time-to-live. It is meant
+    for single event-loop use and therefore does no locking.
+
+    Read-through callers take generation() before reading the value from its source and pass it to
+    set(), which then skips the value if the key was invalidated in between, so a load that raced a
+    write cannot cache the pre-write value for a whole TTL. Keys are tracked individually for
+    invalidate(); invalidate_where() and clear() fence every key.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+        self._generation = 0
+        self._fenced_at = 0
+        self._invalidated_at: Dict[K, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+
+        Args:
+            key (K): The cache key.
+
+        Returns:
+            Optional[V]: The cached value, if present and fresh.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        """
+        Returns the current invalidation generation, to pass to set() once the value has been loaded.
+
+        Returns:
+            int: The generation.
+        """
+        return self._generation
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        """
+        Stores value under key, evicting the least recently used entry when the cache is full.
+
+        Args:
+            key (K): The cache key.
+            value (V): The value to cache.
+            generation (Optional[int]): The generation() taken before value was loaded. The value is
+                dropped if key has been invalidated since.
+        """
+        if self.max_entries <= 0:
+            return
+        if generation is not None and generation < max(
+            self._fenced_at, self._invalidated_at.get(key, 0)
+        ):
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """
+        Removes key from the cache if present.
+
+        Args:
+            key (K): The cache key.
+        """
+        self._generation += 1
+        self._invalidated_at[key] = self._generation
+        if len(self._invalidated_at) > max(self.max_entries, 1):
+            self._fence()
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def _fence(self) -> None:
+        self._generation += 1
+        self._fenced_at = self._generation
+        self._invalidated_at.clear()
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> None:
+        """
+        Removes every entry whose key matches predicate.
+
+        Args:
+            predicate (Callable[[K], bool]): Returns True for keys that should be dropped.
+        """
+        self._fence()
+        stale: List[K] = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+        self._fence()
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def keys(self) -> Iterable[K]:
+        """
+        Returns the keys currently held, including ones that have expired but not yet been evicted.
+
+        Returns:
+            Iterable[K]: The cached keys.
+        """
+        return list(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the hit, miss, eviction and invalidation counters of the cache.
+
+        Returns:
+            Dict[str, float]: The counters, keyed by name.
+        """
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Union
+
+import prisma.models
+from project.streaming import NDJSON_MEDIA_TYPE
+from pydantic import BaseModel, model_validator
+
+CSV_MEDIA_TYPE = "text/csv"
+
+CATALOG_COLUMNS = (
+    "hoseId",
+    "length",
+    "diameter",
+    "platform",
+    "price",
+    "currency",
+    "available",
+    "link",
+)
+
+
+class CatalogRow(BaseModel):
+    """
+    One line of a product catalog file: a hose and, optionally, one of its purchase options. A hose with
+    several purchase options spans several lines with the same hoseId.
+    """
+
+    hoseId: Optional[str] = None
+    length: float
+    diameter: float
+    platform: Optional[str] = None
+    price: Optional[float] = None
+    currency: Optional[str] = None
+    available: bool = True
+    link: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_purchase_option(self) -> "CatalogRow":
+        if self.platform and (
+            self.price is None or not self.currency or self.link is None
+        ):
+            raise ValueError(
+                "price, currency and link are required when platform is set"
+            )
+        return self
+
+
+class MalformedCatalogLine(NamedTuple):
+    """
+    A catalog line that could not be decoded into a row, identified by its line number (starting at 1).
+    """
+
+    line: int
+    message: str
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Splits a stream of byte chunks into decoded lines without buffering the whole stream.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw stream, e.g. Request.stream().
+
+    Yields:
+        str: Each line, without its line terminator.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8").rstrip("\r")
+
+
+def iter_catalog_rows(
+    chunks: AsyncIterator[bytes], content_type: str
+) -> AsyncIterator[Union[Dict[str, Any], MalformedCatalogLine]]:
+    """
+    Streams the raw rows of a CSV (with a header line) or NDJSON catalog. Empty CSV fields are omitted so
+    that they take their defaults. CSV fields must not contain line breaks. The content type is checked
+    when called, before the stream is read.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw catalog stream.
+        content_type (str): text/csv or application/x-ndjson.
+
+    Returns:
+        AsyncIterator[Union[Dict[str, Any], MalformedCatalogLine]]: One undecoded row per non-empty line, or
+            a MalformedCatalogLine for an NDJSON line that is not valid JSON.
+
+    Raises:
+        ValueError: Raised for an unsupported content type.
+    """
+    if CSV_MEDIA_TYPE in content_type:
+        return _csv_rows(chunks)
+    if NDJSON_MEDIA_TYPE in content_type:
+        return _ndjson_rows(chunks)
+    raise ValueError(
+        f"Unsupported catalog content type '{content_type}', "
+        f"expected {CSV_MEDIA_TYPE} or {NDJSON_MEDIA_TYPE}"
+    )
+
+
+async def _csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    header: Optional[List[str]] = None
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        yield {name: value for name, value in zip(header, values) if value != ""}
+
+
+async def _ndjson_rows(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Union[Dict[str, Any], MalformedCatalogLine]]:
+    number = 0
+    async for line in iter_lines(chunks):
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield MalformedCatalogLine(number, f"Invalid JSON: {e}")
+
+
+def catalog_rows(hose: prisma.models.Hose) -> List[Dict[str, Any]]:
+    """
+    Flattens a hose and its purchase options into catalog rows, the inverse of an import.
+
+    Args:
+        hose (prisma.models.Hose): The hose, with PurchaseOptions included.
+
+    Returns:
+        List[Dict[str, Any]]: One row per purchase option, or a single row without one.
+    """
+    base = {"hoseId": hose.id, "length": hose.length, "diameter": hose.diameter}
+    options = hose.PurchaseOptions or []
+    if not options:
+        return [base]
+    return [
+        {
+            **base,
+            "platform": option.platform,
+            "price": option.price,
+            "currency": option.currency,
+            "available": option.available,
+            "link": option.link,
+        }
+        for option in options
+    ]
+
+
+def format_csv(rows: Iterable[Dict[str, Any]], header: bool = False) -> str:
+    """
+    Formats catalog rows as CSV lines in CATALOG_COLUMNS order.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): The rows.
+        header (bool): Whether to start with the header line.
+
+    Returns:
+        str: The CSV text.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CATALOG_COLUMNS, lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Optional
+
+from project.compatibility_matrix import compatibility_matrix
+from pydantic import BaseModel
+
+
+class CompatibilityCheckResponse(BaseModel):
+    """
+    The latest known compatibility verdict between a hose and an attachment. known is False when the pair has never been checked.
+    """
+
+    hoseId: str
+    attachment: str
+    known: bool
+    compatible: Optional[bool] = None
+    checkedAt: Optional[datetime] = None
+    compatibilityId: Optional[str] = None
+
+
+async def checkCompatibility(
+    hoseId: str, attachment: str
+) -> CompatibilityCheckResponse:
+    """
+    Answers whether a hose is compatible with an attachment from the in-process compatibility matrix, using the most recent check recorded for the pair.
+
+    Args:
+        hoseId (str): The unique identifier of the hose.
+        attachment (str): The attachment name, matched exactly.
+
+    Returns:
+        CompatibilityCheckResponse: The latest known compatibility verdict between the hose and the attachment.
+
+    Example:
+        await checkCompatibility("hose123", "spray nozzle")
+        > CompatibilityCheckResponse(hoseId='hose123', attachment='spray nozzle', known=True, compatible=True, ...)
+    """
+    await compatibility_matrix.ensure_loaded()
+    verdict = compatibility_matrix.lookup(hoseId, attachment)
+    if verdict is None:
+        return CompatibilityCheckResponse(
+            hoseId=hoseId, attachment=attachment, known=False
+        )
+    return CompatibilityCheckResponse(
+        hoseId=hoseId,
+        attachment=attachment,
+        known=True,
+        compatible=verdict.compatible,
+        checkedAt=verdict.checkedAt,
+        compatibilityId=verdict.logId,
+    )
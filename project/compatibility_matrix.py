@@ -0,0 +1,302 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+import prisma
+import prisma.models
+from project.config import COMPATIBILITY_MATRIX_REFRESH_SECONDS
+from project.http_cache import table_validators
+from project.streaming import iter_batches
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]
+
+
+class CompatibilityVerdict(NamedTuple):
+    """
+    The latest compatibility check recorded for a (hose, attachment) pair.
+    """
+
+    logId: str
+    compatible: bool
+    checkedAt: datetime
+
+
+def _is_newer(
+    record: prisma.models.HoseCompatibility, verdict: CompatibilityVerdict
+) -> bool:
+    return (record.checkedAt, record.id) >= (verdict.checkedAt, verdict.logId)
+
+
+class CompatibilityMatrix:
+    """
+    Aggregates the HoseCompatibility log into the latest verdict per (hoseId, attachment), held as a
+    dict of dicts so that point lookups and "all attachments for a hose" are constant-time.
+
+    Creates are applied directly. Updates and deletes re-query only the affected pairs, because the
+    previous latest verdict of a pair may have to take over. Deleting a hose or user cascades to its log
+    entries, so those deletes have to be reported too. The matrix is built lazily on first use and can be
+    rebuilt from the full log at any time; pairs and hoses written during a rebuild are refreshed once the
+    new matrix has been swapped in.
+
+    Each worker holds its own matrix and only sees its own writes as they happen. Writes by other workers
+    are picked up by refresh(), which rebuilds the matrix when the write version of the HoseCompatibility
+    table has moved since the last build, and which runs every COMPATIBILITY_MATRIX_REFRESH_SECONDS in the
+    background. A verdict written by another worker is thus served after at most that interval plus the
+    duration of a rebuild; with the refresh disabled, not until the next explicit rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._matrix: Dict[str, Dict[str, CompatibilityVerdict]] = {}
+        self._pair_by_log: Dict[str, Pair] = {}
+        self._lock = asyncio.Lock()
+        self._rebuilding = False
+        self._dirty_pairs: Set[Pair] = set()
+        self._removed_hoses: Set[str] = set()
+        self.loaded = False
+        self.version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _set(self, pair: Pair, verdict: Optional[CompatibilityVerdict]) -> None:
+        hose_id, attachment = pair
+        attachments = self._matrix.get(hose_id, {})
+        previous = attachments.pop(attachment, None)
+        if previous is not None:
+            self._pair_by_log.pop(previous.logId, None)
+        if verdict is not None:
+            attachments[attachment] = verdict
+            self._pair_by_log[verdict.logId] = pair
+        if attachments:
+            self._matrix[hose_id] = attachments
+        else:
+            self._matrix.pop(hose_id, None)
+
+    def _apply(self, record: prisma.models.HoseCompatibility) -> None:
+        pair = (record.hoseId, record.attachment)
+        current = self._matrix.get(record.hoseId, {}).get(record.attachment)
+        if current is None or _is_newer(record, current):
+            self._set(
+                pair,
+                CompatibilityVerdict(record.id, record.compatible, record.checkedAt),
+            )
+
+    async def _refresh_pair(self, pair: Pair) -> None:
+        hose_id, attachment = pair
+        latest = await prisma.models.HoseCompatibility.prisma().find_first(
+            where={"hoseId": hose_id, "attachment": attachment},
+            order=[{"checkedAt": "desc"}, {"id": "desc"}],
+        )
+        self._set(
+            pair,
+            (
+                None
+                if latest is None
+                else CompatibilityVerdict(
+                    latest.id, latest.compatible, latest.checkedAt
+                )
+            ),
+        )
+
+    async def ensure_loaded(self) -> None:
+        """
+        Builds the matrix from the full log if it has not been built yet. Concurrent first callers share
+        one build.
+        """
+        if self.loaded:
+            return
+        async with self._lock:
+            if not self.loaded:
+                await self._rebuild()
+
+    async def rebuild(self) -> int:
+        """
+        Rebuilds the matrix from scratch by streaming the whole HoseCompatibility log in batches.
+
+        Returns:
+            int: The number of (hose, attachment) pairs in the rebuilt matrix.
+        """
+        async with self._lock:
+            return await self._rebuild()
+
+    async def refresh(self) -> bool:
+        """
+        Rebuilds the matrix if it has been built and the write version of the HoseCompatibility table has
+        moved since. A matrix nobody has used yet is left to be built on first use.
+
+        Returns:
+            bool: True if the matrix was rebuilt.
+        """
+        async with self._lock:
+            if not self.loaded:
+                return False
+            version = (await table_validators("HoseCompatibility")).etag
+            if version == self.version:
+                return False
+            await self._rebuild(version)
+            return True
+
+    async def _rebuild(self, version: Optional[str] = None) -> int:
+        if version is None:
+            version = (await table_validators("HoseCompatibility")).etag
+        self._rebuilding = True
+        self._dirty_pairs = set()
+        self._removed_hoses = set()
+        try:
+            fresh = CompatibilityMatrix()
+            async for batch in iter_batches(prisma.models.HoseCompatibility.prisma()):
+                for record in batch:
+                    fresh._apply(record)
+            self._matrix = fresh._matrix
+            self._pair_by_log = fresh._pair_by_log
+            self.version = version
+            self.loaded = True
+        finally:
+            self._rebuilding = False
+        for hose_id in self._removed_hoses:
+            self._drop_hose(hose_id)
+        for pair in self._dirty_pairs:
+            await self._refresh_pair(pair)
+        self._dirty_pairs = set()
+        self._removed_hoses = set()
+        return len(self._pair_by_log)
+
+    def record_created(self, record: prisma.models.HoseCompatibility) -> None:
+        """
+        Applies a newly created compatibility log entry.
+
+        Args:
+            record (prisma.models.HoseCompatibility): The created record.
+        """
+        if self._rebuilding:
+            self._dirty_pairs.add((record.hoseId, record.attachment))
+        if self.loaded:
+            self._apply(record)
+
+    async def record_updated(self, record: prisma.models.HoseCompatibility) -> None:
+        """
+        Applies an updated compatibility log entry, re-deriving the verdict of the pair the entry used
+        to belong to as well as the pair it belongs to now.
+
+        Args:
+            record (prisma.models.HoseCompatibility): The record after the update.
+        """
+        pairs = {(record.hoseId, record.attachment)}
+        previous_pair = self._pair_by_log.get(record.id)
+        if previous_pair is not None:
+            pairs.add(previous_pair)
+        if self._rebuilding:
+            self._dirty_pairs.update(pairs)
+        if self.loaded:
+            for pair in pairs:
+                await self._refresh_pair(pair)
+
+    async def record_deleted(self, record: prisma.models.HoseCompatibility) -> None:
+        """
+        Removes a deleted compatibility log entry, letting the next most recent entry of its pair take over.
+
+        Args:
+            record (prisma.models.HoseCompatibility): The record as it was before deletion.
+        """
+        pair = (record.hoseId, record.attachment)
+        if self._rebuilding:
+            self._dirty_pairs.add(pair)
+        current = self.lookup(*pair)
+        if self.loaded and current is not None and current.logId == record.id:
+            await self._refresh_pair(pair)
+
+    async def records_deleted(
+        self, records: Iterable[prisma.models.HoseCompatibility]
+    ) -> None:
+        """
+        Removes log entries deleted together, e.g. by the cascade of a user deletion.
+
+        Args:
+            records (Iterable[prisma.models.HoseCompatibility]): The records as they were before deletion.
+        """
+        for record in records:
+            await self.record_deleted(record)
+
+    def _drop_hose(self, hose_id: str) -> None:
+        for verdict in self._matrix.pop(hose_id, {}).values():
+            self._pair_by_log.pop(verdict.logId, None)
+
+    def hose_deleted(self, hose_id: str) -> None:
+        """
+        Drops every verdict of a deleted hose, whose log entries the database deleted with it.
+
+        Args:
+            hose_id (str): The deleted hose's id.
+        """
+        if self._rebuilding:
+            self._removed_hoses.add(hose_id)
+        self._drop_hose(hose_id)
+
+    def lookup(self, hose_id: str, attachment: str) -> Optional[CompatibilityVerdict]:
+        """
+        Returns the latest verdict for a hose and attachment.
+
+        Args:
+            hose_id (str): The hose id.
+            attachment (str): The attachment name, matched exactly.
+
+        Returns:
+            Optional[CompatibilityVerdict]: The verdict, or None if the pair was never checked.
+        """
+        return self._matrix.get(hose_id, {}).get(attachment)
+
+    def attachments_for(self, hose_id: str) -> Dict[str, CompatibilityVerdict]:
+        """
+        Returns the latest verdict for every attachment checked against a hose.
+
+        Args:
+            hose_id (str): The hose id.
+
+        Returns:
+            Dict[str, CompatibilityVerdict]: The verdicts keyed by attachment name.
+        """
+        return dict(self._matrix.get(hose_id, {}))
+
+    async def _run_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Compatibility matrix refresh failed")
+
+    def start(self, interval: float) -> None:
+        """
+        Starts refreshing the matrix in the background every interval seconds.
+
+        Args:
+            interval (float): Seconds between version checks.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run_periodically(interval), name="compatibility-matrix-refresh"
+            )
+
+    async def stop(self) -> None:
+        """
+        Cancels the background task, if any.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+compatibility_matrix = CompatibilityMatrix()
+
+
+def start_compatibility_matrix_refresh() -> None:
+    """
+    Starts the periodic refresh if COMPATIBILITY_MATRIX_REFRESH_SECONDS is positive.
+    """
+    if COMPATIBILITY_MATRIX_REFRESH_SECONDS > 0:
+        compatibility_matrix.start(COMPATIBILITY_MATRIX_REFRESH_SECONDS)
@@ -0,0 +1,101 @@
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Reads an integer setting from the environment.
+
+    Args:
+        name (str): The environment variable name.
+        default (int): The value used when the variable is unset or empty.
+
+    Returns:
+        int: The configured value.
+    """
+    value = os.environ.get(name, "")
+    return int(value) if value.strip() else default
+
+
+def env_float(name: str, default: float) -> float:
+    """
+    Reads a float setting from the environment.
+
+    Args:
+        name (str): The environment variable name.
+        default (float): The value used when the variable is unset or empty.
+
+    Returns:
+        float: The configured value.
+    """
+    value = os.environ.get(name, "")
+    return float(value) if value.strip() else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """
+    Reads a boolean setting from the environment. "1", "true", "yes" and "on" are truthy.
+
+    Args:
+        name (str): The environment variable name.
+        default (bool): The value used when the variable is unset or empty.
+
+    Returns:
+        bool: The configured value.
+    """
+    value = os.environ.get(name, "").strip().lower()
+    return value in ("1", "true", "yes", "on") if value else default
+
+
+def env_str(name: str, default: str) -> str:
+    """
+    Reads a string setting from the environment.
+
+    Args:
+        name (str): The environment variable name.
+        default (str): The value used when the variable is unset or empty.
+
+    Returns:
+        str: The configured value.
+    """
+    return os.environ.get(name, "").strip() or default
+
+
+BCRYPT_ROUNDS = env_int("BCRYPT_ROUNDS", 12)
+PASSWORD_HASH_EXECUTOR = env_str("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = env_int("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+PRODUCT_CACHE_TTL_SECONDS = env_float("PRODUCT_CACHE_TTL_SECONDS", 300.0)
+PRODUCT_CACHE_MAX_ENTRIES = env_int("PRODUCT_CACHE_MAX_ENTRIES", 1024)
+HOSE_INDEX_ENABLED = env_bool("HOSE_INDEX_ENABLED", False)
+HOSE_INDEX_REFRESH_SECONDS = env_float("HOSE_INDEX_REFRESH_SECONDS", 10.0)
+MEASUREMENT_BATCH_CHUNK_SIZE = env_int("MEASUREMENT_BATCH_CHUNK_SIZE", 1000)
+MEASUREMENT_BATCH_MAX_ITEMS = env_int("MEASUREMENT_BATCH_MAX_ITEMS", 50000)
+CURRENCY_RATES_PATH = env_str(
+    "CURRENCY_RATES_PATH",
+    os.path.join(os.path.dirname(__file__), "currency_rates.json"),
+)
+PRICE_CACHE_TTL_SECONDS = env_float("PRICE_CACHE_TTL_SECONDS", 600.0)
+PRICE_CACHE_MAX_ENTRIES = env_int("PRICE_CACHE_MAX_ENTRIES", 10000)
+PRODUCT_DETAIL_RELATION_LIMIT = env_int("PRODUCT_DETAIL_RELATION_LIMIT", 10)
+INQUIRY_QUEUE_MAX_SIZE = env_int("INQUIRY_QUEUE_MAX_SIZE", 10000)
+INQUIRY_FLUSH_BATCH_SIZE = env_int("INQUIRY_FLUSH_BATCH_SIZE", 500)
+INQUIRY_FLUSH_INTERVAL_SECONDS = env_float("INQUIRY_FLUSH_INTERVAL_SECONDS", 0.5)
+INQUIRY_QUEUE_PUT_TIMEOUT_SECONDS = env_float("INQUIRY_QUEUE_PUT_TIMEOUT_SECONDS", 0.05)
+USAGE_ROLLUP_INTERVAL_SECONDS = env_float("USAGE_ROLLUP_INTERVAL_SECONDS", 0.0)
+USAGE_ROLLUP_LAG_SECONDS = env_float("USAGE_ROLLUP_LAG_SECONDS", 60.0)
+USAGE_ROLLUP_BATCH_SIZE = env_int("USAGE_ROLLUP_BATCH_SIZE", 5000)
+LAZY_ROUTES = env_bool("LAZY_ROUTES", False)
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 0)
+DB_POOL_TIMEOUT_SECONDS = env_float("DB_POOL_TIMEOUT_SECONDS", 0.0)
+DB_CONNECT_TIMEOUT_SECONDS = env_float("DB_CONNECT_TIMEOUT_SECONDS", 0.0)
+DB_STATEMENT_TIMEOUT_SECONDS = env_float("DB_STATEMENT_TIMEOUT_SECONDS", 0.0)
+DB_WARMUP_ENABLED = env_bool("DB_WARMUP_ENABLED", False)
+DB_WARMUP_CONNECTIONS = env_int("DB_WARMUP_CONNECTIONS", 0)
+DB_READINESS_TIMEOUT_SECONDS = env_float("DB_READINESS_TIMEOUT_SECONDS", 2.0)
+CATALOG_IMPORT_CHUNK_SIZE = env_int("CATALOG_IMPORT_CHUNK_SIZE", 1000)
+SEARCH_INDEX_REFRESH_SECONDS = env_float("SEARCH_INDEX_REFRESH_SECONDS", 0.0)
+MEASUREMENT_STATS_TTL_SECONDS = env_float("MEASUREMENT_STATS_TTL_SECONDS", 300.0)
+SINGLE_FLIGHT_TIMEOUT_SECONDS = env_float("SINGLE_FLIGHT_TIMEOUT_SECONDS", 10.0)
+TIP_STORE_REFRESH_SECONDS = env_float("TIP_STORE_REFRESH_SECONDS", 30.0)
+COMPATIBILITY_MATRIX_REFRESH_SECONDS = env_float(
+    "COMPATIBILITY_MATRIX_REFRESH_SECONDS", 30.0
+)
@@ -2,6 +2,8 @@ from datetime import datetime
 
 import prisma
 import prisma.models
+from project.compatibility_matrix import compatibility_matrix
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
 
@@ -42,6 +44,8 @@ async def createCompatibility(
             "attachment": attachment,
         }
     )
+    compatibility_matrix.record_created(compatibility_log)
+    product_catalog_cache.details.invalidate(compatibility_log.hoseId)
     return CompatibilityCreationResponse(
         id=compatibility_log.id,
         hoseId=compatibility_log.hoseId,
@@ -2,8 +2,26 @@ from typing import Optional
 
 import prisma
 import prisma.models
+from project.database import sql_now
+from project.measurement_stats import measurement_stats
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
+# Inserts the measurement only if both the user and the hose exist, and reports which of them is missing,
+# in a single statement.
+CREATE_MEASUREMENT_QUERY = """
+WITH u AS (SELECT "id" FROM "User" WHERE "id" = $2),
+h AS (SELECT "id" FROM "Hose" WHERE "id" = $1),
+created AS (
+    INSERT INTO "HoseMeasurement" ("id", "hoseId", "userId", "measuredAt", "updatedAt")
+    SELECT gen_random_uuid()::text, h."id", u."id", $3::timestamp, $3::timestamp FROM u, h
+    RETURNING "id"
+)
+SELECT (SELECT "id" FROM created) AS "measurementId",
+    EXISTS (SELECT 1 FROM u) AS "userExists",
+    EXISTS (SELECT 1 FROM h) AS "hoseExists"
+"""
+
 
 class MeasurementCreationResponse(BaseModel):
     """
@@ -21,6 +39,9 @@ async def createMeasurement(
     """
     Creates a new measurement record in the database. This route receives measurement data (length, diameter) from the User Interface Module, and stores it in the Database Module. Expect a response indicating successful creation or an error.
 
+    The user and hose are checked and the measurement inserted in one statement. As with createMeasurementsBatch,
+    length and diameter belong to the hose and are not stored on the measurement row.
+
     Args:
     hoseId (str): Identifier for the hose which the measurements belong to.
     length (float): The measured length of the hose.
@@ -31,24 +52,21 @@ async def createMeasurement(
     MeasurementCreationResponse: This model represents the response after attempting to create a measurement for a hose. It returns success or failure with an error message.
     """
     try:
-        user = await prisma.models.User.prisma().find_unique(where={"id": userId})
-        if not user:
+        result = (
+            await prisma.get_client().query_raw(
+                CREATE_MEASUREMENT_QUERY, hoseId, userId, sql_now()
+            )
+        )[0]
+        if not result["userExists"]:
             return MeasurementCreationResponse(success=False, message="User not found.")
-        hose = await prisma.models.Hose.prisma().find_unique(where={"id": hoseId})
-        if not hose:
+        if not result["hoseExists"]:
             return MeasurementCreationResponse(success=False, message="Hose not found.")
-        new_measurement = await prisma.models.HoseMeasurement.prisma().create(
-            data={
-                "hose_id": hoseId,
-                "user_id": userId,
-                "length": length,
-                "diameter": diameter,
-            }
-        )
+        product_catalog_cache.details.invalidate(hoseId)
+        measurement_stats.invalidate(hoseId)
         return MeasurementCreationResponse(
             success=True,
             message="Measurement created successfully.",
-            measurementId=new_measurement.id,
+            measurementId=result["measurementId"],
         )
     except Exception as e:
         return MeasurementCreationResponse(
@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import prisma
+import prisma.models
+from project.config import MEASUREMENT_BATCH_CHUNK_SIZE, MEASUREMENT_BATCH_MAX_ITEMS
+from project.measurement_stats import measurement_stats
+from project.product_cache import product_catalog_cache
+from pydantic import BaseModel, ValidationError
+
+
+class MeasurementBatchItem(BaseModel):
+    """
+    A single reading in a batch upload, with the same fields as POST /measurements plus an optional capture time.
+    """
+
+    hoseId: str
+    userId: str
+    length: float
+    diameter: float
+    measuredAt: Optional[datetime] = None
+
+
+class MeasurementBatchItemResult(BaseModel):
+    """
+    The outcome for one item of a batch upload, identified by its position in the request.
+    """
+
+    index: int
+    success: bool
+    measurementId: Optional[str] = None
+    message: Optional[str] = None
+
+
+class MeasurementBatchResponse(BaseModel):
+    """
+    Summary and per-item outcome of a batch measurement upload.
+    """
+
+    created: int
+    failed: int
+    results: List[MeasurementBatchItemResult]
+
+
+async def _existing_ids(actions: Any, ids: Set[str]) -> Set[str]:
+    if not ids:
+        return set()
+    records = await actions.find_many(where={"id": {"in": list(ids)}})
+    return {record.id for record in records}
+
+
+async def createMeasurementsBatch(rows: List[Any]) -> MeasurementBatchResponse:
+    """
+    Creates many measurement records in one request. All referenced users and hoses are validated with one
+    IN query per model, and valid rows are inserted with create_many in chunks, so the number of database
+    round-trips grows with the number of chunks rather than the number of readings.
+
+    Ids are generated up front so that every created item can report its measurementId. Rows that fail
+    validation or reference an unknown user or hose are reported individually and do not affect the rest.
+
+    Args:
+        rows (List[Any]): The decoded JSON array or NDJSON lines of the request body.
+
+    Returns:
+        MeasurementBatchResponse: Summary and per-item outcome of the upload.
+
+    Raises:
+        ValueError: Raised if the batch exceeds MEASUREMENT_BATCH_MAX_ITEMS.
+
+    Example:
+        await createMeasurementsBatch([{"hoseId": "h1", "userId": "u1", "length": 15.0, "diameter": 1.9}])
+        > MeasurementBatchResponse(created=1, failed=0, results=[MeasurementBatchItemResult(index=0, success=True, ...)])
+    """
+    if len(rows) > MEASUREMENT_BATCH_MAX_ITEMS:
+        raise ValueError(
+            f"Batch of {len(rows)} measurements exceeds the limit of {MEASUREMENT_BATCH_MAX_ITEMS}"
+        )
+    results: List[Optional[MeasurementBatchItemResult]] = [None] * len(rows)
+    items: Dict[int, MeasurementBatchItem] = {}
+    for index, row in enumerate(rows):
+        try:
+            items[index] = MeasurementBatchItem.model_validate(row)
+        except ValidationError as e:
+            results[index] = MeasurementBatchItemResult(
+                index=index, success=False, message=str(e)
+            )
+    known_users = await _existing_ids(
+        prisma.models.User.prisma(), {item.userId for item in items.values()}
+    )
+    known_hoses = await _existing_ids(
+        prisma.models.Hose.prisma(), {item.hoseId for item in items.values()}
+    )
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+    for index, item in items.items():
+        if item.userId not in known_users:
+            results[index] = MeasurementBatchItemResult(
+                index=index, success=False, message="User not found."
+            )
+        elif item.hoseId not in known_hoses:
+            results[index] = MeasurementBatchItemResult(
+                index=index, success=False, message="Hose not found."
+            )
+        else:
+            data = {
+                "id": str(uuid.uuid4()),
+                "hoseId": item.hoseId,
+                "userId": item.userId,
+            }
+            if item.measuredAt is not None:
+                data["measuredAt"] = item.measuredAt
+            pending.append((index, data))
+    for start in range(0, len(pending), MEASUREMENT_BATCH_CHUNK_SIZE):
+        chunk = pending[start : start + MEASUREMENT_BATCH_CHUNK_SIZE]
+        try:
+            await prisma.models.HoseMeasurement.prisma().create_many(
+                data=[data for _, data in chunk]
+            )
+            outcome = {"success": True, "message": None}
+            for hose_id in {data["hoseId"] for _, data in chunk}:
+                product_catalog_cache.details.invalidate(hose_id)
+                measurement_stats.invalidate(hose_id)
+        except Exception as e:
+            outcome = {
+                "success": False,
+                "message": f"Error creating measurement: {str(e)}",
+            }
+        for index, data in chunk:
+            results[index] = MeasurementBatchItemResult(
+                index=index,
+                measurementId=data["id"] if outcome["success"] else None,
+                **outcome,
+            )
+    created = sum(1 for result in results if result.success)
+    return MeasurementBatchResponse(
+        created=created, failed=len(results) - created, results=results
+    )
@@ -2,6 +2,8 @@ from typing import List
 
 import prisma
 import prisma.models
+from project.hose_index import hose_index
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
 
@@ -37,6 +39,10 @@ async def createProduct(
                 "features": {"create": [{"name": feature} for feature in features]},
             }
         )
+        product_catalog_cache.invalidate_hose(
+            new_hose.id, (new_hose.length, new_hose.diameter)
+        )
+        hose_index.upsert(new_hose.id, new_hose.length, new_hose.diameter)
         return CreateHoseResponse(
             success=True, hoseId=new_hose.id, message="Successfully created new hose."
         )
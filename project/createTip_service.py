@@ -1,7 +1,9 @@
-from typing import List
+from typing import List, Optional
 
 import prisma
 import prisma.models
+from project.batch_loader import hose_loader
+from project.tip_store import tip_store
 from pydantic import BaseModel
 
 
@@ -11,23 +13,28 @@ class TipResponseModel(BaseModel):
     """
 
     id: str
+    title: str
     description: str
     hoseTypeId: str
     additionalTips: List[str]
 
 
 async def createTip(
-    description: str, hoseTypeId: str, additionalTips: List[str]
+    description: str,
+    hoseTypeId: str,
+    additionalTips: List[str],
+    title: Optional[str] = None,
 ) -> TipResponseModel:
     """
-    This function allows administrators to create a new care tip, associates it with a specific hose type, and optionally includes additional tips, storing all details in the database.
+    This function allows administrators to create a new care tip, associates it with a specific hose type, and optionally includes additional tips, storing all details in the database and publishing the tip to the in-memory tip store.
 
     Note: The function checks for the existence of the hose type in the database before creation and uses it to validate the incoming hoseTypeId.
 
     Args:
         description (str): Detailed description of the care tip.
         hoseTypeId (str): Identifier for the hose type to which this tip is relevant. Must match an existing hose type in the database.
-        additionalTips (List[str]): Optional additional tips related to the main tip.
+        additionalTips (List[str]): Optional additional tips related to the main tip, stored as its recommended practices.
+        title (Optional[str]): A short title. Defaults to the first line of the description.
 
     Returns:
         TipResponseModel: Response model for a newly created care tip, reflecting the stored data in the database after successful creation.
@@ -35,20 +42,22 @@ async def createTip(
     Raises:
         ValueError: Raised if the specified hoseTypeId does not match any existing hose type, ensuring data integrity and valid relationships in the database.
     """
-    hose = await prisma.models.Hose.prisma().find_unique(where={"id": hoseTypeId})
+    hose = await hose_loader.load(hoseTypeId)
     if not hose:
         raise ValueError(f"No hose found with the ID {hoseTypeId}")
-    new_hose = await prisma.models.Hose.prisma().update(
-        where={"id": hoseTypeId},
+    tip = await prisma.models.CareTip.prisma().create(
         data={
-            "extraDetails": {
-                "create": {"description": description, "additionalTips": additionalTips}
-            }
-        },
+            "title": title or description.splitlines()[0][:120],
+            "description": description,
+            "practices": additionalTips,
+            "hoseIds": [hoseTypeId],
+        }
     )
+    tip_store.record_saved(tip)
     return TipResponseModel(
-        id=new_hose.id,
-        description=description,
+        id=tip.id,
+        title=tip.title,
+        description=tip.description,
         hoseTypeId=hoseTypeId,
-        additionalTips=additionalTips,
+        additionalTips=tip.practices,
     )
@@ -1,9 +1,9 @@
 from typing import Optional
 
-import bcrypt
 import prisma
 import prisma.enums
 import prisma.models
+from project.password_hashing import password_hasher
 from pydantic import BaseModel
 
 
@@ -25,7 +25,7 @@ async def createUser(
 
     Args:
         email (str): Email address of the new user, must be unique across the system.
-        password (str): Password for the account creation. It should be stored encrypted.
+        password (str): Password for the account creation. It is hashed with bcrypt on the password worker pool before being stored.
         role (UserRole): Role of the user, determining access control levels. Default is STANDARD_USER.
 
     Returns:
@@ -38,12 +38,12 @@ async def createUser(
         return CreateUserResponseModel(
             success=False, message="A user with this email already exists."
         )
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed_password = await password_hasher.hash(password)
     try:
         user = await prisma.models.User.prisma().create(
             data={
                 "email": email,
-                "password": hashed_password.decode("utf-8"),
+                "password": hashed_password,
                 "role": role,
             }
         )
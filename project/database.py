@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+import prisma
+import prisma.models
+from prisma import Prisma
+from project.config import (
+    DB_CONNECT_TIMEOUT_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_STATEMENT_TIMEOUT_SECONDS,
+    DB_WARMUP_CONNECTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODELS = (
+    "User",
+    "Hose",
+    "HoseMeasurement",
+    "HoseCompatibility",
+    "UsageLog",
+    "PurchaseOption",
+    "Question",
+)
+
+
+def pooled_database_url(
+    url: str,
+    pool_size: int,
+    pool_timeout: float,
+    connect_timeout: float,
+    statement_timeout: float,
+) -> str:
+    """
+    Adds the Prisma connection pool parameters to a PostgreSQL connection URL. Settings left at 0 keep
+    whatever the URL specifies, or Prisma's default.
+
+    Args:
+        url (str): The database URL.
+        pool_size (int): The connection_limit of the query engine's pool.
+        pool_timeout (float): Seconds a query waits for a free pooled connection.
+        connect_timeout (float): Seconds to wait when opening a new connection.
+        statement_timeout (float): Seconds after which PostgreSQL cancels a statement.
+
+    Returns:
+        str: The URL with the parameters set.
+    """
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query))
+    if pool_size > 0:
+        params["connection_limit"] = str(pool_size)
+    if pool_timeout > 0:
+        params["pool_timeout"] = f"{pool_timeout:g}"
+    if connect_timeout > 0:
+        params["connect_timeout"] = f"{connect_timeout:g}"
+    if statement_timeout > 0:
+        params["options"] = f"-c statement_timeout={int(statement_timeout * 1000)}"
+    return urlunsplit(parts._replace(query=urlencode(params, quote_via=quote)))
+
+
+def sql_now() -> str:
+    """
+    Returns the current time as a naive UTC timestamp for raw queries, to be cast with ::timestamp. Prisma
+    fills @updatedAt and now() defaults from the application's clock, so raw writes use this instead of
+    the database's now() to keep the columns on one clock.
+
+    Returns:
+        str: The ISO-formatted timestamp.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class Database:
+    """
+    Owns the application's Prisma client: applies the pool settings, optionally warms the pool up after
+    connecting, and reports readiness.
+
+    Warming up runs as many concurrent trivial queries as connections should be pre-opened, which makes
+    the query engine open them, followed by one representative query per model so the engine's query
+    plans and PostgreSQL's statement caches are populated before the first request.
+    """
+
+    def __init__(self, client: Prisma, pool_size: int, warmup_connections: int) -> None:
+        self.client = client
+        self.pool_size = pool_size
+        self.warmup_connections = warmup_connections
+        self.ready = False
+        self.warmup_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    async def connect(self, warmup: bool) -> None:
+        """
+        Connects the client and, if requested, warms the pool up. The database is reported ready afterwards.
+
+        Args:
+            warmup (bool): Whether to warm the pool up before reporting ready.
+        """
+        await self.client.connect()
+        if warmup:
+            started = time.perf_counter()
+            try:
+                await self.warmup()
+                self.warmup_seconds = time.perf_counter() - started
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("Database warmup failed")
+        self.ready = True
+
+    async def warmup(self) -> None:
+        """
+        Pre-opens pooled connections and runs one representative query per model.
+        """
+        await asyncio.gather(
+            *(
+                self.client.query_raw("SELECT 1")
+                for _ in range(max(1, self.warmup_connections))
+            )
+        )
+        for name in WARMUP_MODELS:
+            await getattr(prisma.models, name).prisma().find_first()
+
+    async def disconnect(self) -> None:
+        """
+        Reports not ready and disconnects the client.
+        """
+        self.ready = False
+        if self.client.is_connected():
+            await self.client.disconnect()
+
+    async def readiness(self, timeout: float) -> Dict[str, Any]:
+        """
+        Checks that the pool can serve a query within the timeout.
+
+        Args:
+            timeout (float): Seconds to wait for a pooled connection and the query.
+
+        Returns:
+            Dict[str, Any]: The check result, with "ready" set to False when the client is not connected,
+                the warmup has not finished or the query failed.
+        """
+        status: Dict[str, Any] = {
+            "ready": False,
+            "connected": self.client.is_connected(),
+            "warmupSeconds": self.warmup_seconds,
+            "poolSize": self.pool_size or None,
+        }
+        if not (self.ready and status["connected"]):
+            status["error"] = self.last_error or "database is not connected yet"
+            return status
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.client.query_raw("SELECT 1"), timeout)
+        except Exception as e:
+            self.last_error = str(e) or type(e).__name__
+            status["error"] = self.last_error
+            return status
+        status["ready"] = True
+        status["latencyMs"] = round((time.perf_counter() - started) * 1000, 2)
+        return status
+
+
+def create_database() -> Database:
+    """
+    Creates the application's Database from the environment. The pool settings are applied to
+    DATABASE_URL if it is set in the environment; otherwise the query engine reads it from .env without
+    them. Loading .env into the environment is up to the entrypoint, e.g. uvicorn --env-file .env.
+
+    Returns:
+        Database: The database, not yet connected.
+    """
+    url = os.environ.get("DATABASE_URL")
+    datasource = (
+        {
+            "url": pooled_database_url(
+                url,
+                DB_POOL_SIZE,
+                DB_POOL_TIMEOUT_SECONDS,
+                DB_CONNECT_TIMEOUT_SECONDS,
+                DB_STATEMENT_TIMEOUT_SECONDS,
+            )
+        }
+        if url
+        else None
+    )
+    client = Prisma(
+        auto_register=True,
+        datasource=datasource,
+        connect_timeout=timedelta(seconds=DB_CONNECT_TIMEOUT_SECONDS or 10),
+    )
+    return Database(client, DB_POOL_SIZE, DB_WARMUP_CONNECTIONS or DB_POOL_SIZE or 1)
+
+
+database = create_database()
@@ -1,8 +1,22 @@
 import prisma
-import prisma.enums
 import prisma.models
+from project.compatibility_matrix import compatibility_matrix
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
+# Deletes the entry only if it was logged by an administrator, in one statement. The entry is returned as
+# it was before deletion, with "deleted" telling a permission refusal apart from a missing entry.
+DELETE_COMPATIBILITY_QUERY = """
+WITH entry AS (SELECT * FROM "HoseCompatibility" WHERE "id" = $1),
+deleted AS (
+    DELETE FROM "HoseCompatibility" AS c
+    USING "User" AS u
+    WHERE c."id" = $1 AND u."id" = c."userId" AND u."role" = 'ADMINISTRATOR'
+    RETURNING c."id"
+)
+SELECT entry.*, EXISTS (SELECT 1 FROM deleted) AS "deleted" FROM entry
+"""
+
 
 class DeleteCompatibilityResponse(BaseModel):
     """
@@ -16,6 +30,8 @@ async def deleteCompatibility(compatibilityId: str) -> DeleteCompatibilityRespon
     """
     Deletes a compatibility entry from the database using its ID. Ensures that only administrators can remove data to maintain data integrity. Response confirms deletion.
 
+    The entry is looked up, its author's role checked and the entry deleted in one statement.
+
     Args:
         compatibilityId (str): The unique identifier for the hose compatibility entry to be deleted.
 
@@ -27,21 +43,21 @@ async def deleteCompatibility(compatibilityId: str) -> DeleteCompatibilityRespon
         deleteCompatibility(compatibilityId)
         > DeleteCompatibilityResponse(message='Compatibility entry deleted successfully.')
     """
-    compatibility = await prisma.models.HoseCompatibility.prisma().find_unique(
-        where={"id": compatibilityId}
+    rows = await prisma.get_client().query_raw(
+        DELETE_COMPATIBILITY_QUERY, compatibilityId
     )
-    if compatibility is None:
+    if not rows:
         return DeleteCompatibilityResponse(
             message=f"No compatibility entry found with ID: {compatibilityId}"
         )
-    user = await prisma.models.User.prisma().find_unique(
-        where={"id": compatibility.userId}
-    )
-    if user is None or user.role != prisma.enums.UserRole.ADMINISTRATOR:
+    row = dict(rows[0])
+    if not row.pop("deleted"):
         return DeleteCompatibilityResponse(
             message="Insufficient permissions to delete this entry."
         )
-    await prisma.models.HoseCompatibility.prisma().delete(where={"id": compatibilityId})
+    compatibility = prisma.models.HoseCompatibility.model_validate(row)
+    await compatibility_matrix.record_deleted(compatibility)
+    product_catalog_cache.details.invalidate(compatibility.hoseId)
     return DeleteCompatibilityResponse(
         message="Compatibility entry deleted successfully."
     )
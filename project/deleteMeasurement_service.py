@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+from project.measurement_stats import measurement_stats
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
 
@@ -31,6 +33,8 @@ async def deleteMeasurement(measurementId: str) -> DeleteMeasurementResponse:
             where={"id": measurementId}
         )
         if measurement:
+            product_catalog_cache.details.invalidate(measurement.hoseId)
+            measurement_stats.invalidate(measurement.hoseId)
             response = DeleteMeasurementResponse(
                 success=True, message="Measurement deleted successfully."
             )
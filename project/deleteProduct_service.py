@@ -1,5 +1,10 @@
 import prisma
 import prisma.models
+from project.compatibility_matrix import compatibility_matrix
+from project.hose_index import hose_index
+from project.measurement_stats import measurement_stats
+from project.price_comparison import price_comparison_cache
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
 
@@ -27,6 +32,13 @@ async def deleteProduct(productId: str) -> DeleteProductResponse:
     """
     deleted = await prisma.models.Hose.prisma().delete(where={"id": productId})
     if deleted:
+        product_catalog_cache.invalidate_hose(
+            productId, (deleted.length, deleted.diameter)
+        )
+        hose_index.remove(productId)
+        compatibility_matrix.hose_deleted(productId)
+        measurement_stats.invalidate(productId)
+        price_comparison_cache.invalidate(productId)
         return DeleteProductResponse(message="Product deleted successfully.")
     else:
         return DeleteProductResponse(message="Failed to delete the product.")
@@ -1,5 +1,6 @@
 import prisma
 import prisma.models
+from project.tip_store import tip_store
 from pydantic import BaseModel
 
 
@@ -13,7 +14,7 @@ class DeleteTipResponse(BaseModel):
 
 async def deleteTip(tipId: str) -> DeleteTipResponse:
     """
-    Enables administrators to delete a care tip (Question entity) by tipId. It removes the tip from the Database Module and returns a success message with a 204 response code upon successful deletion.
+    Enables administrators to delete a care tip by tipId. It removes the tip from the Database Module and from the in-memory tip store, and returns a success message with a 204 response code upon successful deletion.
 
     Args:
         tipId (str): The unique identifier (UUID) for the care tip to be deleted.
@@ -28,8 +29,9 @@ async def deleteTip(tipId: str) -> DeleteTipResponse:
         except Exception as e:
             print(str(e))
     """
-    deleted_tip = await prisma.models.Question.prisma().delete(where={"id": tipId})
+    deleted_tip = await prisma.models.CareTip.prisma().delete(where={"id": tipId})
     if deleted_tip:
+        tip_store.record_deleted(tipId)
         return DeleteTipResponse()
     else:
         raise Exception("Failed to delete tip with ID: " + tipId)
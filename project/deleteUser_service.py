@@ -1,5 +1,9 @@
 import prisma
 import prisma.models
+from project.compatibility_matrix import compatibility_matrix
+from project.measurement_stats import measurement_stats
+from project.product_cache import product_catalog_cache
+from project.search_index import search_index
 from pydantic import BaseModel
 
 
@@ -27,7 +31,14 @@ async def deleteUser(userId: str) -> DeleteUserResponse:
         > DeleteUserResponse(success=True, message="User successfully deleted.")
     """
     try:
+        compatibility_logs = await prisma.models.HoseCompatibility.prisma().find_many(
+            where={"userId": userId}
+        )
         user = await prisma.models.User.prisma().delete(where={"id": userId})
+        search_index.remove_user(userId)
+        await compatibility_matrix.records_deleted(compatibility_logs)
+        measurement_stats.invalidate_all()
+        product_catalog_cache.details.clear()
         return DeleteUserResponse(success=True, message="User successfully deleted.")
     except Exception as e:
         return DeleteUserResponse(success=False, message=str(e))
@@ -0,0 +1,55 @@
+import json
+from typing import AsyncIterator
+
+import prisma
+import prisma.models
+from project.catalog_io import CSV_MEDIA_TYPE, catalog_rows, format_csv
+from project.streaming import DEFAULT_BATCH_SIZE, NDJSON_MEDIA_TYPE, iter_batches
+
+CATALOG_FORMATS = {"csv": CSV_MEDIA_TYPE, "ndjson": NDJSON_MEDIA_TYPE}
+
+
+async def _catalog_chunks(format: str, batch_size: int) -> AsyncIterator[bytes]:
+    header = True
+    async for hoses in iter_batches(
+        prisma.models.Hose.prisma(),
+        include={"PurchaseOptions": True},
+        batch_size=batch_size,
+    ):
+        rows = [row for hose in hoses for row in catalog_rows(hose)]
+        if format == "csv":
+            yield format_csv(rows, header=header).encode("utf-8")
+            header = False
+        else:
+            yield "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+    if header and format == "csv":
+        yield format_csv([], header=True).encode("utf-8")
+
+
+def exportCatalog(
+    format: str = "csv", batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Streams the whole product catalog in the format accepted by the catalog import: one row per purchase
+    option, or one row for a hose without any. Hoses are read in id-ordered batches with their purchase
+    options, so memory use is bounded by the batch size.
+
+    Args:
+        format (str): "csv" (with a header line) or "ndjson".
+        batch_size (int): Number of hoses read per query.
+
+    Returns:
+        AsyncIterator[bytes]: The encoded rows, one batch of hoses at a time.
+
+    Raises:
+        ValueError: Raised for an unknown format.
+
+    Example:
+        async for data in exportCatalog("csv"):
+            out.write(data)
+    """
+    if format not in CATALOG_FORMATS:
+        raise ValueError(
+            f"Unknown catalog format '{format}', expected one of {sorted(CATALOG_FORMATS)}"
+        )
+    return _catalog_chunks(format, batch_size)
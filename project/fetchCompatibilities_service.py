@@ -1,8 +1,9 @@
-import datetime
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
 
 import prisma
 import prisma.models
+from project.streaming import DEFAULT_BATCH_SIZE, iter_batches
 from pydantic import BaseModel
 
 
@@ -23,7 +24,7 @@ class HoseCompatibility(BaseModel):
     hoseId: str
     userId: str
     compatible: bool
-    checkedAt: datetime  # TODO(autogpt): Module cannot be used as a type. reportGeneralTypeIssues
+    checkedAt: datetime
     attachment: str
 
 
@@ -35,9 +36,30 @@ class GetCompatibilitiesResponse(BaseModel):
     compatibilities: List[HoseCompatibility]
 
 
+def compatibility_row(record: prisma.models.HoseCompatibility) -> Dict[str, Any]:
+    """
+    Builds the JSON-ready form of a HoseCompatibility directly from its database record, without creating
+    or validating a response model.
+
+    Args:
+        record (prisma.models.HoseCompatibility): The database record.
+
+    Returns:
+        Dict[str, Any]: The HoseCompatibility fields of the record.
+    """
+    return {
+        "id": record.id,
+        "hoseId": record.hoseId,
+        "userId": record.userId,
+        "compatible": record.compatible,
+        "checkedAt": record.checkedAt,
+        "attachment": record.attachment,
+    }
+
+
 async def fetchCompatibilities(
     request: GetCompatibilitiesRequest,
-) -> GetCompatibilitiesResponse:
+) -> Dict[str, Any]:
     """
     Retrieves all compatibility entries from the database. It queries the Database Module for a list of all existing compatibility rules.
     The response includes an array of compatibility data.
@@ -47,20 +69,30 @@ async def fetchCompatibilities(
         There are no input parameters required for this endpoint.
 
     Returns:
-        GetCompatibilitiesResponse: This model represents the response containing the list of all hose compatibilities.
-        It includes detailed information about each compatibility entry.
+        Dict[str, Any]: The GetCompatibilitiesResponse payload as JSON-ready data, built directly from the query rows.
     """
     compatibilities_records = await prisma.models.HoseCompatibility.prisma().find_many()
-    compatibilities = [
-        HoseCompatibility(
-            id=record.id,
-            hoseId=record.hose_id,
-            userId=record.user_id,
-            compatible=record.compatible,
-            checkedAt=record.checked_at,
-            attachment=record.attachment,
-        )
-        for record in compatibilities_records
-    ]  # TODO(autogpt): Cannot access member "hose_id" for type "HoseCompatibility"
-    #     Member "hose_id" is unknown. reportAttributeAccessIssue
-    return GetCompatibilitiesResponse(compatibilities=compatibilities)
+    return {
+        "compatibilities": [
+            compatibility_row(record) for record in compatibilities_records
+        ]
+    }
+
+
+async def streamCompatibilities(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields every compatibility entry one at a time, paging through the table in batches so that memory stays bounded for exports.
+
+    Args:
+        batch_size (int): Number of entries fetched per database round-trip.
+
+    Yields:
+        Dict[str, Any]: The next compatibility entry in id order, as JSON-ready HoseCompatibility fields.
+    """
+    async for batch in iter_batches(
+        prisma.models.HoseCompatibility.prisma(), batch_size=batch_size
+    ):
+        for record in batch:
+            yield compatibility_row(record)
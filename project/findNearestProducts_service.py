@@ -0,0 +1,59 @@
+from typing import List
+
+from project.hose_index import hose_index
+from pydantic import BaseModel
+
+
+class NearestProduct(BaseModel):
+    """
+    A hose close to the requested size, together with its distance from the target.
+    """
+
+    id: str
+    length: float
+    diameter: float
+    distance: float
+
+
+class NearestProductsResponse(BaseModel):
+    """
+    The hoses closest to the requested length and diameter, nearest first.
+    """
+
+    products: List[NearestProduct]
+
+
+async def findNearestProducts(
+    length: float, diameter: float, limit: int = 10
+) -> NearestProductsResponse:
+    """
+    Finds the hoses whose size is closest to a target length and diameter, using the in-process hose index
+    instead of scanning the Hose table. The index is loaded on first use if it was not loaded at startup, and
+    reloaded first if another worker has written hoses since it was.
+
+    Args:
+        length (float): The target hose length in meters.
+        diameter (float): The target hose diameter in centimeters.
+        limit (int): The maximum number of hoses to return.
+
+    Returns:
+        NearestProductsResponse: The hoses closest to the requested length and diameter, nearest first.
+
+    Example:
+        await findNearestProducts(15.0, 1.9, limit=3)
+        > NearestProductsResponse(products=[NearestProduct(id='abc', length=15.0, diameter=1.9, distance=0.0), ...])
+    """
+    await hose_index.refresh()
+    return NearestProductsResponse(
+        products=[
+            NearestProduct(
+                id=hose_id,
+                length=hose_length,
+                diameter=hose_diameter,
+                distance=distance,
+            )
+            for hose_id, hose_length, hose_diameter, distance in hose_index.nearest(
+                length, diameter, limit
+            )
+        ]
+    )
@@ -0,0 +1,184 @@
+import bisect
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from project.measurement_stats import (
+    DAY_SECONDS,
+    Distribution,
+    StatsSummary,
+    measurement_stats,
+    to_datetime,
+    trend_per_day,
+)
+from pydantic import BaseModel
+
+MAX_OUTLIERS = 100
+
+
+class DistributionStats(BaseModel):
+    """
+    The distribution of one measured dimension across all measurements. Empty when nothing has been measured.
+    """
+
+    count: int
+    mean: Optional[float] = None
+    stddev: Optional[float] = None
+    min: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+    max: Optional[float] = None
+
+
+class HoseMeasurementStats(BaseModel):
+    """
+    The measurements of one hose and how far its dimensions lie from the global distribution.
+    """
+
+    hoseId: str
+    measurements: int
+    length: float
+    diameter: float
+    firstMeasuredAt: datetime
+    lastMeasuredAt: datetime
+    lengthZScore: float
+    diameterZScore: float
+    outlier: bool
+
+
+class MeasuredHoseMixBucket(BaseModel):
+    """
+    The measurements taken on one day and the mean current dimensions of the hoses they were taken of. Measurements do not store dimensions of their own, so this shows which hoses were measured, not how measured values changed.
+    """
+
+    bucketStart: datetime
+    measurements: int
+    meanLength: float
+    meanDiameter: float
+
+
+class MeasurementStatsResponse(BaseModel):
+    """
+    Distributions of the measured hose dimensions, the hoses whose dimensions are outliers, and the daily mean dimensions of the hoses measured each day.
+    """
+
+    measurements: int
+    hoses: int
+    length: DistributionStats
+    diameter: DistributionStats
+    hose: Optional[HoseMeasurementStats] = None
+    outliers: List[HoseMeasurementStats]
+    measuredHoseMix: List[MeasuredHoseMixBucket]
+    measuredHoseMixLengthPerDay: Optional[float] = None
+    measuredHoseMixDiameterPerDay: Optional[float] = None
+
+
+def distribution_stats(distribution: Distribution) -> DistributionStats:
+    p50, p90, p99 = distribution.percentiles
+    return DistributionStats(
+        count=distribution.count,
+        mean=distribution.mean,
+        stddev=distribution.stddev,
+        min=distribution.minimum,
+        p50=p50,
+        p90=p90,
+        p99=p99,
+        max=distribution.maximum,
+    )
+
+
+def hose_stats(
+    summary: StatsSummary, index: int, outlier_z: float
+) -> HoseMeasurementStats:
+    aggregate = summary.hoses[index]
+    length_z = summary.lengthZ[index]
+    diameter_z = summary.diameterZ[index]
+    return HoseMeasurementStats(
+        hoseId=aggregate.hoseId,
+        measurements=aggregate.measurements,
+        length=aggregate.length,
+        diameter=aggregate.diameter,
+        firstMeasuredAt=to_datetime(aggregate.firstMeasuredAt),
+        lastMeasuredAt=to_datetime(aggregate.lastMeasuredAt),
+        lengthZScore=round(length_z, 4),
+        diameterZScore=round(diameter_z, 4),
+        outlier=max(abs(length_z), abs(diameter_z)) > outlier_z,
+    )
+
+
+async def getMeasurementStats(
+    hoseId: Optional[str] = None, days: int = 30, outlierZ: float = 3.0
+) -> MeasurementStatsResponse:
+    """
+    Computes statistics over all hose measurements without returning the rows: the count, mean, standard
+    deviation, percentiles and range of the measured lengths and diameters, the hoses whose dimensions lie
+    more than outlierZ standard deviations from the mean, and over the last days the mean current dimensions
+    of the hoses measured each day, with the slope of a line fitted through them. As measurements store no
+    dimensions of their own, that series follows the mix of hoses being measured rather than a drift of
+    measured values. Measurements are aggregated per hose and day in the
+    database and cached; writes re-aggregate only the hoses they touch.
+
+    Args:
+        hoseId (Optional[str]): Also returns the statistics of this hose.
+        days (int): The number of days, counted back from today, the daily series covers.
+        outlierZ (float): The z-score beyond which a hose is reported as an outlier.
+
+    Returns:
+        MeasurementStatsResponse: Distributions of the measured hose dimensions, the hoses whose dimensions are outliers, and the daily mean dimensions of the hoses measured each day.
+
+    Raises:
+        ValueError: Raised if the hose has no measurements.
+
+    Example:
+        await getMeasurementStats(days=7)
+        > MeasurementStatsResponse(measurements=10000, hoses=1000, length=DistributionStats(count=10000, mean=45.9, ...), ...)
+    """
+    summary = await measurement_stats.summary()
+    hose = None
+    if hoseId is not None:
+        index = summary.position(hoseId)
+        if index is None:
+            raise ValueError(f"No measurements found for hose {hoseId}")
+        hose = hose_stats(summary, index, outlierZ)
+    flagged = [
+        index
+        for index, (length_z, diameter_z) in enumerate(
+            zip(summary.lengthZ, summary.diameterZ)
+        )
+        if max(abs(length_z), abs(diameter_z)) > outlierZ
+    ]
+    flagged.sort(
+        key=lambda index: -max(
+            abs(summary.lengthZ[index]), abs(summary.diameterZ[index])
+        )
+    )
+    since = (time.time() // DAY_SECONDS - max(days, 1) + 1) * DAY_SECONDS
+    start = bisect.bisect_left(summary.dayStarts, since)
+    day_starts = summary.dayStarts[start:]
+    counts = summary.dayCounts[start:]
+    length_means = summary.dayLengthMeans[start:]
+    diameter_means = summary.dayDiameterMeans[start:]
+    return MeasurementStatsResponse(
+        measurements=summary.measurements,
+        hoses=len(summary.hoseIds),
+        length=distribution_stats(summary.length),
+        diameter=distribution_stats(summary.diameter),
+        hose=hose,
+        outliers=[
+            hose_stats(summary, index, outlierZ) for index in flagged[:MAX_OUTLIERS]
+        ],
+        measuredHoseMix=[
+            MeasuredHoseMixBucket(
+                bucketStart=to_datetime(day),
+                measurements=int(count),
+                meanLength=length_mean,
+                meanDiameter=diameter_mean,
+            )
+            for day, count, length_mean, diameter_mean in zip(
+                day_starts, counts, length_means, diameter_means
+            )
+        ],
+        measuredHoseMixLengthPerDay=trend_per_day(day_starts, counts, length_means),
+        measuredHoseMixDiameterPerDay=trend_per_day(day_starts, counts, diameter_means),
+    )
@@ -1,8 +1,11 @@
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 import prisma
 import prisma.models
+from project.config import PRODUCT_DETAIL_RELATION_LIMIT, SINGLE_FLIGHT_TIMEOUT_SECONDS
+from project.product_cache import product_catalog_cache
+from project.single_flight import SingleFlight
 from pydantic import BaseModel
 
 
@@ -30,9 +33,30 @@ class HoseCompatibility(BaseModel):
     attachment: str
 
 
+class RelationCounts(BaseModel):
+    """
+    Total number of related rows per relation, regardless of how many are embedded in the response.
+    """
+
+    HoseMeasurements: int
+    HoseCompatibilities: int
+    PurchaseOptions: int
+    UsageLogs: int
+
+
+class ProductStats(BaseModel):
+    """
+    Aggregate statistics of a product. compatibilityPassRate is the share of compatibility checks that passed, or None if the hose was never checked.
+    """
+
+    measurementCount: int
+    compatibilityChecks: int
+    compatibilityPassRate: Optional[float] = None
+
+
 class Hose(BaseModel):
     """
-    Information about the hose including its measurements, compatibilities, purchase options, and usage logs.
+    Information about the hose including its measurements, compatibilities, purchase options, and usage logs. Relation lists hold the most recent rows only, unless the relation was expanded; counts holds the totals.
     """
 
     id: str
@@ -42,6 +66,8 @@ class Hose(BaseModel):
     HoseCompatibilities: List[HoseCompatibility]
     PurchaseOptions: List[prisma.models.PurchaseOption]
     UsageLogs: List[prisma.models.UsageLog]
+    counts: RelationCounts
+    stats: ProductStats
 
 
 class ProductDetailsResponse(BaseModel):
@@ -52,13 +78,69 @@ class ProductDetailsResponse(BaseModel):
     product: Hose
 
 
-async def getProductDetails(productId: str) -> ProductDetailsResponse:
+EXPANDABLE_RELATIONS = {
+    "HoseMeasurements": ("HoseMeasurements", {"measuredAt": "desc"}),
+    "HoseCompatibilities": ("HoseCompatibilities", {"checkedAt": "desc"}),
+    "PurchaseOptions": ("PurchaseOptions", {"price": "asc"}),
+    "UsageLogs": ("UsageLog", {"viewedAt": "desc"}),
+}
+
+PRODUCT_AGGREGATES_QUERY = """
+SELECT
+    (SELECT COUNT(*) FROM "HoseMeasurement" WHERE "hoseId" = $1) AS "measurements",
+    (SELECT COUNT(*) FROM "HoseCompatibility" WHERE "hoseId" = $1) AS "compatibilities",
+    (SELECT COUNT(*) FROM "HoseCompatibility" WHERE "hoseId" = $1 AND "compatible") AS "compatible",
+    (SELECT COUNT(*) FROM "PurchaseOption" WHERE "hoseId" = $1) AS "purchaseOptions",
+    (SELECT COUNT(*) FROM "UsageLog" WHERE "hoseId" = $1) AS "usageLogs"
+"""
+
+
+def build_product_include(expand: List[str]) -> Dict[str, Any]:
+    """
+    Builds the Prisma include for a product: the most recent rows of every relation, or all rows of the expanded ones.
+
+    Args:
+        expand (List[str]): Relation names whose full lists should be loaded.
+
+    Returns:
+        Dict[str, Any]: The Prisma include argument.
+
+    Raises:
+        ValueError: Raised if an unknown relation is requested.
+    """
+    unknown = [name for name in expand if name not in EXPANDABLE_RELATIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown relation(s) {unknown}; expected any of {list(EXPANDABLE_RELATIONS)}"
+        )
+    include = {}
+    for name, (relation, order) in EXPANDABLE_RELATIONS.items():
+        include[relation] = {"order_by": order}
+        if name not in expand:
+            include[relation]["take"] = PRODUCT_DETAIL_RELATION_LIMIT
+    return include
+
+
+product_details_flight: SingleFlight[
+    Tuple[str, Tuple[str, ...]], ProductDetailsResponse
+] = SingleFlight("product_details", SINGLE_FLIGHT_TIMEOUT_SECONDS)
+
+
+async def getProductDetails(
+    productId: str, expand: Optional[List[str]] = None
+) -> ProductDetailsResponse:
     """
     Provides detailed information about a specific product identified by their unique product ID.
     This will aid in specific compatibility checks and feature information.
 
+    The product embeds only the latest PRODUCT_DETAIL_RELATION_LIMIT rows of each relation, together with the
+    total count per relation and aggregate statistics computed in a single SQL statement. Relations named in
+    expand are loaded in full. Unexpanded responses are served from product_catalog_cache, and concurrent
+    requests for the same product and expansion share one load through product_details_flight.
+
     Args:
     productId (str): The unique identifier for the product
+    expand (Optional[List[str]]): Relation names whose full lists should be returned.
 
     Returns:
     ProductDetailsResponse: Provides detailed information about a specific product, including compatibility and usage data.
@@ -67,15 +149,76 @@ async def getProductDetails(productId: str) -> ProductDetailsResponse:
     product_details = await getProductDetails("abcd-ef01-2345-ghij")
     print(product_details.product.length)  # Outputs: 15.0
     """
+    expand = expand or []
+    if not expand:
+        cached = product_catalog_cache.details.get(productId)
+        if cached is not None:
+            return cached
+    return await product_details_flight.do(
+        (productId, tuple(sorted(expand))),
+        lambda: load_product_details(productId, expand),
+    )
+
+
+async def load_product_details(
+    productId: str, expand: List[str]
+) -> ProductDetailsResponse:
+    """
+    Reads a product, its latest related rows and its aggregates from the database, and caches the
+    unexpanded response unless the product was invalidated while it was being read.
+
+    Args:
+        productId (str): The unique identifier for the product.
+        expand (List[str]): Relation names whose full lists should be returned.
+
+    Returns:
+        ProductDetailsResponse: Provides detailed information about a specific product, including compatibility and usage data.
+
+    Raises:
+        ValueError: Raised if the product does not exist or an unknown relation is requested.
+    """
+    generation = product_catalog_cache.details.generation()
     hose = await prisma.models.Hose.prisma().find_unique(
-        where={"id": productId},
-        include={
-            "HoseMeasurements": True,
-            "HoseCompatibilities": True,
-            "PurchaseOptions": True,
-            "prisma.models.UsageLog": True,
-        },
+        where={"id": productId}, include=build_product_include(expand)
     )
     if hose is None:
         raise ValueError(f"Product with ID {productId} not found")
-    return ProductDetailsResponse(product=hose)
+    aggregates = (
+        await prisma.get_client().query_raw(PRODUCT_AGGREGATES_QUERY, productId)
+    )[0]
+    compatibility_checks = int(aggregates["compatibilities"])
+    response = ProductDetailsResponse(
+        product=Hose(
+            id=hose.id,
+            length=hose.length,
+            diameter=hose.diameter,
+            HoseMeasurements=[
+                HoseMeasurement.model_validate(row, from_attributes=True)
+                for row in hose.HoseMeasurements or []
+            ],
+            HoseCompatibilities=[
+                HoseCompatibility.model_validate(row, from_attributes=True)
+                for row in hose.HoseCompatibilities or []
+            ],
+            PurchaseOptions=hose.PurchaseOptions or [],
+            UsageLogs=hose.UsageLog or [],
+            counts=RelationCounts(
+                HoseMeasurements=int(aggregates["measurements"]),
+                HoseCompatibilities=compatibility_checks,
+                PurchaseOptions=int(aggregates["purchaseOptions"]),
+                UsageLogs=int(aggregates["usageLogs"]),
+            ),
+            stats=ProductStats(
+                measurementCount=int(aggregates["measurements"]),
+                compatibilityChecks=compatibility_checks,
+                compatibilityPassRate=(
+                    int(aggregates["compatible"]) / compatibility_checks
+                    if compatibility_checks
+                    else None
+                ),
+            ),
+        )
+    )
+    if not expand:
+        product_catalog_cache.details.set(productId, response, generation)
+    return response
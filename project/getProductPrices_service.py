@@ -0,0 +1,77 @@
+from typing import List, Optional
+
+from project.price_comparison import price_comparison_cache
+from pydantic import BaseModel
+
+
+class CurrencyPriceStats(BaseModel):
+    """
+    Minimum, median and maximum price of a product's purchase options in one currency.
+    """
+
+    currency: str
+    count: int
+    minPrice: float
+    medianPrice: float
+    maxPrice: float
+
+
+class CheapestOffer(BaseModel):
+    """
+    The cheapest available purchase option of a product after currency normalization.
+    """
+
+    platform: str
+    price: float
+    currency: str
+    link: str
+    localPrice: Optional[float] = None
+    localCurrency: Optional[str] = None
+
+
+class ProductPricesResponse(BaseModel):
+    """
+    Price comparison summary of a product: per-currency statistics and its cheapest available offer.
+    """
+
+    productId: str
+    stats: List[CurrencyPriceStats]
+    cheapest: Optional[CheapestOffer] = None
+
+
+async def getProductPrices(
+    productId: str, user_location: Optional[str] = None
+) -> ProductPricesResponse:
+    """
+    Returns the precomputed price comparison summary of a product from the materialized price cache.
+
+    Args:
+        productId (str): The unique identifier of the product.
+        user_location (Optional[str]): A country or currency code used to convert the cheapest offer to the local currency.
+
+    Returns:
+        ProductPricesResponse: Price comparison summary of the product: per-currency statistics and its cheapest available offer.
+    """
+    prices = await price_comparison_cache.get(productId)
+    rates = price_comparison_cache.rates
+    local_currency = rates.currency_for(user_location)
+    cheapest = None
+    if prices.offers:
+        offer = prices.offers[0]
+        cheapest = CheapestOffer(
+            platform=offer.platform,
+            price=offer.price,
+            currency=offer.currency,
+            link=offer.link,
+            localPrice=(
+                rates.convert(offer.price, offer.currency, local_currency)
+                if local_currency
+                else None
+            ),
+            localCurrency=local_currency,
+        )
+    return ProductPricesResponse(
+        productId=productId,
+        stats=[CurrencyPriceStats(**stats._asdict()) for stats in prices.stats],
+        cheapest=cheapest,
+    )
@@ -1,7 +1,6 @@
 from typing import List, Optional
 
-import prisma
-import prisma.models
+from project.price_comparison import price_comparison_cache
 from pydantic import BaseModel
 
 
@@ -14,6 +13,8 @@ class PlatformInfo(BaseModel):
     price: float
     currency: str
     link: str
+    localPrice: Optional[float] = None
+    localCurrency: Optional[str] = None
 
 
 class GetPurchasePlatformsResponse(BaseModel):
@@ -28,25 +29,31 @@ async def getPurchasePlatforms(
     product_id: str, user_location: Optional[str]
 ) -> GetPurchasePlatformsResponse:
     """
-    Retrieves a list of available e-commerce platforms from which a user can purchase the specified product, including price comparisons. This endpoint consumes data from external e-commerce APIs, and the response will typically include platform name, price, and direct link to the purchase page.
+    Retrieves a list of available e-commerce platforms from which a user can purchase the specified product, including price comparisons. Platforms are ranked from cheapest to most expensive after normalizing currencies, and are served from the materialized price summary cache.
 
     Args:
         product_id (str): The unique identifier of the product for which the purchase information is requested.
-        user_location (Optional[str]): The user's location to provide region-specific pricing and availability.
+        user_location (Optional[str]): The user's location to provide region-specific pricing and availability. A country code (e.g. "DE") or currency code (e.g. "EUR"); when recognized, each platform also reports its price converted to the local currency.
 
     Returns:
         GetPurchasePlatformsResponse: Response model that provides a list of available e-commerce platforms with their corresponding price and purchase link for a specified product.
     """
-    platforms_data = await prisma.models.PurchaseOption.prisma().find_many(
-        where={"hoseId": product_id, "available": True}
-    )
+    prices = await price_comparison_cache.get(product_id)
+    rates = price_comparison_cache.rates
+    local_currency = rates.currency_for(user_location)
     platform_infos = [
         PlatformInfo(
-            name=platform.platform,
-            price=platform.price,
-            currency=platform.currency,
-            link=platform.link,
+            name=offer.platform,
+            price=offer.price,
+            currency=offer.currency,
+            link=offer.link,
+            localPrice=(
+                rates.convert(offer.price, offer.currency, local_currency)
+                if local_currency
+                else None
+            ),
+            localCurrency=local_currency,
         )
-        for platform in platforms_data
+        for offer in prices.offers
     ]
     return GetPurchasePlatformsResponse(platforms=platform_infos)
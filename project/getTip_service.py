@@ -1,7 +1,6 @@
 from typing import List
 
-import prisma
-import prisma.models
+from project.tip_store import tip_store
 from pydantic import BaseModel
 
 
@@ -17,24 +16,22 @@ class TipDetailsResponse(BaseModel):
 
 async def getTip(tipId: str) -> TipDetailsResponse:
     """
-    Fetches detailed information about a specific care tip identified by tipId. This endpoint extracts the tip details from the Database Module and is accessible by standard users and administrators, ensuring guests cannot access specific care tip details.
+    Fetches detailed information about a specific care tip identified by tipId. The tip is read from the in-memory tip store and is accessible by standard users and administrators, ensuring guests cannot access specific care tip details.
 
     Args:
         tipId (str): The unique identifier for the hose care tip.
 
     Returns:
         TipDetailsResponse: Detailed information about the hose care tip, including best practices for maintenance and use.
+
+    Raises:
+        ValueError: Raised if no tip exists with the provided tipId.
     """
-    usage_details = await prisma.models.UsageLog.prisma().find_unique(
-        where={"id": tipId}
-    )
-    if usage_details is None:
+    tip = (await tip_store.current()).by_id.get(tipId)
+    if tip is None:
         raise ValueError("No care tip detail found with the provided tipId.")
-    import json
-
-    tip_info = json.loads(usage_details.information)
     return TipDetailsResponse(
-        tipTitle=tip_info["title"],
-        tipDescription=tip_info["description"],
-        recommendedPractices=tip_info["practices"],
+        tipTitle=tip.title,
+        tipDescription=tip.description,
+        recommendedPractices=list(tip.practices),
     )
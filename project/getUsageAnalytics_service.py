@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import prisma
+from project.usage_rollup import GRANULARITIES
+from pydantic import BaseModel
+
+TOP_HOSES_QUERY = """
+SELECT "hoseId", SUM("views")::bigint AS "views"
+FROM "UsageRollup"
+WHERE "granularity" = $1 AND "bucketStart" >= $2::timestamp AND "bucketStart" < $3::timestamp
+GROUP BY "hoseId"
+ORDER BY "views" DESC, "hoseId"
+LIMIT $4
+"""
+
+USAGE_SERIES_QUERY = """
+SELECT "bucketStart", SUM("views")::bigint AS "views"
+FROM "UsageRollup"
+WHERE "granularity" = $1 AND "bucketStart" >= $2::timestamp AND "bucketStart" < $3::timestamp
+    AND ($4::text IS NULL OR "hoseId" = $4::text)
+GROUP BY "bucketStart"
+ORDER BY "bucketStart"
+"""
+
+DEFAULT_WINDOW = {"hour": timedelta(days=2), "day": timedelta(days=30)}
+
+MAX_TOP = 100
+
+
+class HoseViews(BaseModel):
+    """
+    Total views of one hose within the requested window.
+    """
+
+    hoseId: str
+    views: int
+
+
+class UsageBucket(BaseModel):
+    """
+    Views within one hour or day bucket.
+    """
+
+    bucketStart: datetime
+    views: int
+
+
+class UsageAnalyticsResponse(BaseModel):
+    """
+    Usage analytics answered from the rolled-up view counts: the most viewed hoses and a time series of views.
+    """
+
+    granularity: str
+    start: datetime
+    end: datetime
+    hoseId: Optional[str] = None
+    topHoses: List[HoseViews]
+    series: List[UsageBucket]
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+async def getUsageAnalytics(
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    hoseId: Optional[str] = None,
+    top: int = 10,
+) -> UsageAnalyticsResponse:
+    """
+    Answers top-N and time-series usage questions from the UsageRollup summary table instead of scanning
+    UsageLog. Counts only cover logs already processed by the rollup, which trails real time by the
+    configured lag.
+
+    Args:
+        granularity (str): The bucket size of the time series, "hour" or "day".
+        start (Optional[datetime]): Start of the window, inclusive. Defaults to 2 days (hour) or 30 days (day) before end.
+        end (Optional[datetime]): End of the window, exclusive. Defaults to now.
+        hoseId (Optional[str]): Restricts the time series to one hose. The top list always covers all hoses.
+        top (int): The number of most viewed hoses to return, at most 100.
+
+    Returns:
+        UsageAnalyticsResponse: Usage analytics answered from the rolled-up view counts: the most viewed hoses and a time series of views.
+
+    Raises:
+        ValueError: Raised for an unknown granularity or an empty window.
+
+    Example:
+        await getUsageAnalytics("hour", hoseId="b8c7...")
+        > UsageAnalyticsResponse(granularity="hour", ..., series=[UsageBucket(bucketStart=..., views=12), ...])
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(
+            f"Unknown granularity '{granularity}', expected one of {GRANULARITIES}"
+        )
+    end = _naive_utc(end) if end else datetime.utcnow()
+    start = _naive_utc(start) if start else end - DEFAULT_WINDOW[granularity]
+    if start >= end:
+        raise ValueError("start must be before end")
+    top = max(0, min(top, MAX_TOP))
+    client = prisma.get_client()
+    top_rows = (
+        await client.query_raw(
+            TOP_HOSES_QUERY, granularity, start.isoformat(), end.isoformat(), top
+        )
+        if top
+        else []
+    )
+    series_rows = await client.query_raw(
+        USAGE_SERIES_QUERY, granularity, start.isoformat(), end.isoformat(), hoseId
+    )
+    return UsageAnalyticsResponse(
+        granularity=granularity,
+        start=start,
+        end=end,
+        hoseId=hoseId,
+        topHoses=[
+            HoseViews(hoseId=row["hoseId"], views=int(row["views"])) for row in top_rows
+        ],
+        series=[
+            UsageBucket(bucketStart=row["bucketStart"], views=int(row["views"]))
+            for row in series_rows
+        ],
+    )
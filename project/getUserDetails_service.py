@@ -1,6 +1,9 @@
 import prisma
 import prisma.enums
 import prisma.models
+from project.batch_loader import user_loader
+from project.config import SINGLE_FLIGHT_TIMEOUT_SECONDS
+from project.single_flight import SingleFlight
 from pydantic import BaseModel
 
 
@@ -14,9 +17,15 @@ class UserDetailsResponse(BaseModel):
     role: prisma.enums.UserRole
 
 
+user_details_flight: SingleFlight[str, UserDetailsResponse] = SingleFlight(
+    "user_details", SINGLE_FLIGHT_TIMEOUT_SECONDS
+)
+
+
 async def getUserDetails(userId: str) -> UserDetailsResponse:
     """
     Fetches detailed information of a specific user by the user’s ID. This endpoint will return user details such as username, email, and role.
+    Concurrent requests for the same user share one database read through user_details_flight.
 
     Args:
         userId (str): Unique identifier of the user for whom the details are being fetched.
@@ -24,7 +33,23 @@ async def getUserDetails(userId: str) -> UserDetailsResponse:
     Returns:
         UserDetailsResponse: Provides the details of the user such as username, email, and role to authorized requesters.
     """
-    user = await prisma.models.User.prisma().find_unique(where={"id": userId})
+    return await user_details_flight.do(userId, lambda: load_user_details(userId))
+
+
+async def load_user_details(userId: str) -> UserDetailsResponse:
+    """
+    Reads a user from the database.
+
+    Args:
+        userId (str): Unique identifier of the user.
+
+    Returns:
+        UserDetailsResponse: The details of the user.
+
+    Raises:
+        ValueError: Raised if the user does not exist.
+    """
+    user = await user_loader.load(userId)
     if user is None:
         raise ValueError("User not found")
     username = getattr(user, "username", user.email.split("@")[0])
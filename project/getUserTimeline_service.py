@@ -0,0 +1,205 @@
+import asyncio
+import heapq
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import prisma
+import prisma.models
+from project.batch_loader import user_loader
+from project.pagination import decode_cursor, encode_cursor
+from pydantic import BaseModel
+
+MAX_PAGE_SIZE = 200
+
+
+class TimelineRelation(NamedTuple):
+    """
+    One relation merged into the timeline: its entry kind, the model actions, and the timestamp column
+    its (userId, timestamp) index is ordered on.
+    """
+
+    kind: str
+    actions: Callable[[], Any]
+    time_field: str
+
+
+TIMELINE_RELATIONS = (
+    TimelineRelation("usage", lambda: prisma.models.UsageLog.prisma(), "viewedAt"),
+    TimelineRelation("question", lambda: prisma.models.Question.prisma(), "createdAt"),
+    TimelineRelation(
+        "measurement", lambda: prisma.models.HoseMeasurement.prisma(), "measuredAt"
+    ),
+    TimelineRelation(
+        "compatibility", lambda: prisma.models.HoseCompatibility.prisma(), "checkedAt"
+    ),
+    TimelineRelation("answer", lambda: prisma.models.Answer.prisma(), "createdAt"),
+)
+
+TIMELINE_KINDS = tuple(relation.kind for relation in TIMELINE_RELATIONS)
+
+
+class TimelineEntry(BaseModel):
+    """
+    One event of a user's activity. Fields that do not apply to the entry's kind are null.
+    """
+
+    kind: str
+    id: str
+    occurredAt: datetime
+    hoseId: Optional[str] = None
+    questionId: Optional[str] = None
+    compatible: Optional[bool] = None
+    attachment: Optional[str] = None
+    information: Optional[str] = None
+    content: Optional[str] = None
+
+
+class UserTimelineResponse(BaseModel):
+    """
+    A page of a user's measurements, compatibility checks, product views, questions and answers, newest first. nextCursor is set when older entries exist.
+    """
+
+    userId: str
+    entries: List[TimelineEntry]
+    nextCursor: Optional[str] = None
+
+
+def timeline_entry(kind: str, time_field: str, record: Any) -> TimelineEntry:
+    """
+    Builds the timeline entry of a related record.
+
+    Args:
+        kind (str): The entry kind of the record's relation.
+        time_field (str): The timestamp column of the relation.
+        record (Any): The database record.
+
+    Returns:
+        TimelineEntry: The entry.
+    """
+    return TimelineEntry(
+        kind=kind,
+        id=record.id,
+        occurredAt=getattr(record, time_field),
+        hoseId=getattr(record, "hoseId", None),
+        questionId=(
+            record.id if kind == "question" else getattr(record, "questionId", None)
+        ),
+        compatible=getattr(record, "compatible", None),
+        attachment=getattr(record, "attachment", None),
+        information=getattr(record, "information", None),
+        content=getattr(record, "content", None),
+    )
+
+
+def older_than(
+    relation: TimelineRelation, position: Optional[Tuple[datetime, str, str]]
+) -> Dict[str, Any]:
+    """
+    Builds the Prisma where-clause selecting the relation's records that come after a timeline position
+    in (timestamp, kind, id) descending order.
+
+    Args:
+        relation (TimelineRelation): The relation.
+        position (Optional[Tuple[datetime, str, str]]): The timestamp, kind and id of the last entry of
+            the previous page, or None for the first page.
+
+    Returns:
+        Dict[str, Any]: A Prisma where-clause, empty when no position is given.
+    """
+    if position is None:
+        return {}
+    time, kind, record_id = position
+    field = relation.time_field
+    if relation.kind < kind:
+        return {field: {"lte": time}}
+    if relation.kind > kind:
+        return {field: {"lt": time}}
+    return {"OR": [{field: {"lt": time}}, {field: time, "id": {"lt": record_id}}]}
+
+
+async def getUserTimeline(
+    userId: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    kinds: Optional[List[str]] = None,
+) -> UserTimelineResponse:
+    """
+    Lists a user's activity across measurements, compatibility checks, product views, questions and answers
+    as one stream, newest first. Each relation is read with one query on its (userId, timestamp) index,
+    limited to the page size plus one and starting after the cursor; the five sorted results are then
+    merged k-way, so a page costs the same however long the user's history is.
+
+    Args:
+        userId (str): The user whose activity is listed.
+        limit (int): The maximum number of entries per page, at most 200.
+        cursor (Optional[str]): The nextCursor of the previous page, or None for the newest entries.
+        kinds (Optional[List[str]]): Restricts the timeline to these entry kinds: usage, question,
+            measurement, compatibility and answer. All kinds when empty.
+
+    Returns:
+        UserTimelineResponse: A page of a user's activity, newest first.
+
+    Raises:
+        ValueError: Raised for an unknown kind, a malformed cursor, or, on the first page, an unknown user.
+
+    Example:
+        await getUserTimeline("0e12f87a-f06e-4d7d-b212-5c5e65a0b163", limit=20)
+        > UserTimelineResponse(userId="0e12...", entries=[TimelineEntry(kind="usage", ...), ...], nextCursor="eyJ0Ijo...")
+    """
+    unknown = [kind for kind in kinds or [] if kind not in TIMELINE_KINDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown timeline kinds: {unknown}, expected {TIMELINE_KINDS}"
+        )
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    position = None
+    if cursor:
+        time, key = decode_cursor(cursor)
+        kind, _, record_id = key.partition(":")
+        position = (time, kind, record_id)
+    relations = [
+        relation
+        for relation in TIMELINE_RELATIONS
+        if not kinds or relation.kind in kinds
+    ]
+    queries = [
+        relation.actions().find_many(
+            where={"userId": userId, **older_than(relation, position)},
+            order=[{relation.time_field: "desc"}, {"id": "desc"}],
+            take=limit + 1,
+        )
+        for relation in relations
+    ]
+    if position is None:
+        queries.append(user_loader.load(userId))
+    results = await asyncio.gather(*queries)
+    if position is None and results.pop() is None:
+        raise ValueError("User not found")
+    streams = [
+        [
+            (
+                getattr(record, relation.time_field),
+                relation.kind,
+                record.id,
+                relation,
+                record,
+            )
+            for record in records
+        ]
+        for relation, records in zip(relations, results)
+    ]
+    merged = heapq.merge(*streams, key=lambda item: item[:3], reverse=True)
+    page = [item for _, item in zip(range(limit + 1), merged)]
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        time, kind, record_id, _, _ = page[-1]
+        next_cursor = encode_cursor(time, f"{kind}:{record_id}")
+    return UserTimelineResponse(
+        userId=userId,
+        entries=[
+            timeline_entry(relation.kind, relation.time_field, record)
+            for _, _, _, relation, record in page
+        ],
+        nextCursor=next_cursor,
+    )
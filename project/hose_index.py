@@ -0,0 +1,260 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+from typing import Dict, List, Optional, Tuple
+
+import prisma
+import prisma.models
+from project.config import HOSE_INDEX_ENABLED, HOSE_INDEX_REFRESH_SECONDS
+from project.http_cache import table_validators
+from project.streaming import iter_batches
+
+logger = logging.getLogger(__name__)
+
+# The index is versioned by the same tables as the /products entity tag, so that listProducts can tell
+# whether the index is current from the tag it already has.
+VERSION_TABLES = ("Hose", "PurchaseOption")
+
+
+class HoseRangeIndex:
+    """
+    In-process index over Hose(length, diameter). Hoses are kept in an array sorted by length, so a
+    length range is located with two binary searches and only the hoses inside it are checked against
+    the diameter bounds. Nearest-size queries walk outwards from the target length and stop as soon as
+    the length difference alone exceeds the k-th best distance found so far.
+
+    The index is a per-worker structure. Writes made through this process are applied at once; those made
+    by other workers are picked up by refresh(), which reloads the index when the write version of
+    VERSION_TABLES has moved since the last load, and which runs every HOSE_INDEX_REFRESH_SECONDS in the
+    background. version holds the entity tag of those tables as of the last load; callers that need exact
+    results only use the index while it matches the current one.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[float, float, str]] = []
+        self._by_id: Dict[str, Tuple[float, float, str]] = {}
+        self.loaded = False
+        self.version: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, hoses: List[Tuple[str, float, float]]) -> None:
+        """
+        Replaces the index contents with the given hoses.
+
+        Args:
+            hoses (List[Tuple[str, float, float]]): (id, length, diameter) of every hose.
+        """
+        self._by_id = {
+            hose_id: (length, diameter, hose_id) for hose_id, length, diameter in hoses
+        }
+        self._entries = sorted(self._by_id.values())
+        self.loaded = True
+
+    async def load_from_db(self, version: Optional[str] = None) -> None:
+        """
+        Loads every hose from the database into the index, reading the table in batches.
+
+        Args:
+            version (Optional[str]): The entity tag of VERSION_TABLES, read before the hoses. Read here
+                if not given.
+        """
+        if version is None:
+            version = (await table_validators(*VERSION_TABLES)).etag
+        hoses: List[Tuple[str, float, float]] = []
+        async for batch in iter_batches(prisma.models.Hose.prisma()):
+            hoses.extend((hose.id, hose.length, hose.diameter) for hose in batch)
+        self.load(hoses)
+        self.version = version
+
+    async def refresh(self) -> bool:
+        """
+        Loads the index if it has not been loaded yet, or reloads it if the write version of VERSION_TABLES
+        has moved since. Concurrent callers share one load.
+
+        Returns:
+            bool: True if the index was (re)loaded.
+        """
+        async with self._lock:
+            version = (await table_validators(*VERSION_TABLES)).etag
+            if self.loaded and version == self.version:
+                return False
+            await self.load_from_db(version)
+            return True
+
+    def is_current(self, version: Optional[str]) -> bool:
+        """
+        Tells whether the index was loaded at the given version of VERSION_TABLES, i.e. no other worker has
+        written a hose since.
+
+        Args:
+            version (Optional[str]): The current entity tag of VERSION_TABLES.
+
+        Returns:
+            bool: True if the index can be used in place of the table.
+        """
+        return self.loaded and version is not None and version == self.version
+
+    def upsert(self, hose_id: str, length: float, diameter: float) -> None:
+        """
+        Adds a hose to the index or moves it to its new dimensions. Does nothing until the index has been loaded.
+
+        Args:
+            hose_id (str): The hose id.
+            length (float): The hose length.
+            diameter (float): The hose diameter.
+        """
+        if not self.loaded:
+            return
+        self.remove(hose_id)
+        entry = (length, diameter, hose_id)
+        bisect.insort(self._entries, entry)
+        self._by_id[hose_id] = entry
+
+    def remove(self, hose_id: str) -> None:
+        """
+        Removes a hose from the index if present. Does nothing until the index has been loaded.
+
+        Args:
+            hose_id (str): The hose id.
+        """
+        if not self.loaded:
+            return
+        entry = self._by_id.pop(hose_id, None)
+        if entry is None:
+            return
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def range(
+        self,
+        diameter_min: Optional[float] = None,
+        diameter_max: Optional[float] = None,
+        length_min: Optional[float] = None,
+        length_max: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Returns the ids of hoses inside the given bounds, ordered by length then diameter.
+
+        Args:
+            diameter_min (Optional[float]): Inclusive lower diameter bound.
+            diameter_max (Optional[float]): Inclusive upper diameter bound.
+            length_min (Optional[float]): Inclusive lower length bound.
+            length_max (Optional[float]): Inclusive upper length bound.
+
+        Returns:
+            List[str]: The matching hose ids.
+        """
+        start = (
+            0
+            if length_min is None
+            else bisect.bisect_left(self._entries, (length_min, -math.inf, ""))
+        )
+        stop = (
+            len(self._entries)
+            if length_max is None
+            else bisect.bisect_right(self._entries, (length_max, math.inf, ""))
+        )
+        return [
+            hose_id
+            for _, diameter, hose_id in self._entries[start:stop]
+            if (diameter_min is None or diameter >= diameter_min)
+            and (diameter_max is None or diameter <= diameter_max)
+        ]
+
+    def nearest(
+        self, length: float, diameter: float, limit: int = 10
+    ) -> List[Tuple[str, float, float, float]]:
+        """
+        Finds the hoses closest to a target size by Euclidean distance over (length, diameter).
+
+        Args:
+            length (float): The target length.
+            diameter (float): The target diameter.
+            limit (int): The maximum number of hoses to return.
+
+        Returns:
+            List[Tuple[str, float, float, float]]: (id, length, diameter, distance) of the closest hoses,
+                nearest first.
+        """
+        if limit <= 0:
+            return []
+        best: List[Tuple[float, str, float, float]] = []
+        right = bisect.bisect_left(self._entries, (length, -math.inf, ""))
+        left = right - 1
+        while left >= 0 or right < len(self._entries):
+            left_gap = length - self._entries[left][0] if left >= 0 else math.inf
+            right_gap = (
+                self._entries[right][0] - length
+                if right < len(self._entries)
+                else math.inf
+            )
+            if len(best) == limit and min(left_gap, right_gap) > -best[0][0]:
+                break
+            if left_gap <= right_gap:
+                entry_length, entry_diameter, hose_id = self._entries[left]
+                left -= 1
+            else:
+                entry_length, entry_diameter, hose_id = self._entries[right]
+                right += 1
+            distance = math.hypot(entry_length - length, entry_diameter - diameter)
+            candidate = (-distance, hose_id, entry_length, entry_diameter)
+            if len(best) < limit:
+                heapq.heappush(best, candidate)
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, candidate)
+        return [
+            (hose_id, entry_length, entry_diameter, -negative_distance)
+            for negative_distance, hose_id, entry_length, entry_diameter in sorted(
+                best, reverse=True
+            )
+        ]
+
+    async def _run_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Hose index refresh failed")
+
+    def start(self, interval: float) -> None:
+        """
+        Starts refreshing the index in the background every interval seconds.
+
+        Args:
+            interval (float): Seconds between version checks.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run_periodically(interval), name="hose-index-refresh"
+            )
+
+    async def stop(self) -> None:
+        """
+        Cancels the background task, if any.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+hose_index = HoseRangeIndex()
+
+
+def start_hose_index_refresh() -> None:
+    """
+    Starts the periodic refresh if HOSE_INDEX_ENABLED is set and HOSE_INDEX_REFRESH_SECONDS is positive.
+    """
+    if HOSE_INDEX_ENABLED and HOSE_INDEX_REFRESH_SECONDS > 0:
+        hose_index.start(HOSE_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,199 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional
+
+import prisma
+from fastapi import Request
+from fastapi.responses import Response
+
+# Tables whose writes bump their count in TableVersion, through the triggers in migrations/table_versions.sql.
+# UsageLog is left out: every product view inserts into it, and nothing is built from the whole table.
+VERSIONED_TABLES = (
+    "Answer",
+    "CareTip",
+    "Hose",
+    "HoseCompatibility",
+    "HoseMeasurement",
+    "PurchaseOption",
+    "Question",
+    "User",
+)
+
+TABLE_VERSIONS_QUERY = """
+SELECT "name", sum("version")::text AS "version"
+FROM "TableVersion"
+WHERE "name" IN (SELECT jsonb_array_elements_text($1::jsonb))
+GROUP BY "name"
+"""
+
+# The versioned tables that have a version trigger, read from the catalog.
+VERSION_TRIGGERS_QUERY = """
+SELECT c.relname AS "name"
+FROM pg_trigger t
+JOIN pg_class c ON c.oid = t.tgrelid
+WHERE t.tgname = c.relname || '_bump_version'
+    AND c.relnamespace = current_schema()::regnamespace
+    AND c.relname IN (SELECT jsonb_array_elements_text($1::jsonb))
+"""
+
+
+class Validators(NamedTuple):
+    """
+    The validators of a representation: its entity tag and, if known, when it last changed.
+    """
+
+    etag: str
+    lastModified: Optional[datetime] = None
+
+    def variant(self, name: str) -> "Validators":
+        """
+        Derives the validators of another representation of the same data, e.g. its NDJSON stream, so that
+        a cached copy of one representation never validates the other.
+        """
+        return Validators(make_etag(self.etag, name), self.lastModified)
+
+
+def make_etag(*parts: str) -> str:
+    """
+    Builds a strong entity tag from the values that identify a version of a representation.
+
+    Args:
+        *parts (str): The identifying values, e.g. ids and update times.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    digest = hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+async def check_table_versions() -> None:
+    """
+    Checks that every versioned table has the trigger from migrations/table_versions.sql. Without it a
+    table's version never changes, and clients would be told their stale copies are current.
+
+    Raises:
+        RuntimeError: Raised if a trigger is missing.
+    """
+    rows = await prisma.get_client().query_raw(
+        VERSION_TRIGGERS_QUERY, json.dumps(VERSIONED_TABLES)
+    )
+    missing = sorted(set(VERSIONED_TABLES) - {row["name"] for row in rows})
+    if missing:
+        raise RuntimeError(
+            f"Tables without a version trigger: {missing}; apply migrations/table_versions.sql"
+        )
+
+
+async def table_validators(*tables: str) -> Validators:
+    """
+    Derives the entity tag of a representation built from whole tables from each table's write version:
+    the sum of the shard counters in TableVersion that a trigger bumps in the same transaction as every
+    write statement, on whichever worker or instance runs it. Reading it is one index range scan per
+    table, and because the bump commits with the write, a new entity tag becomes visible exactly when the
+    written rows do. No Last-Modified is derived, as a counter says nothing about when the data changed.
+
+    The validators must be read before the representation is built: a write landing in between then tags
+    the newer body with the older entity tag, which only costs the client one extra full response.
+
+    Args:
+        *tables (str): The tables the representation is built from, out of VERSIONED_TABLES.
+
+    Returns:
+        Validators: The entity tag.
+
+    Raises:
+        ValueError: Raised if a table has no version trigger.
+    """
+    unknown = [table for table in tables if table not in VERSIONED_TABLES]
+    if unknown:
+        raise ValueError(f"Tables without a write version: {unknown}")
+    rows = await prisma.get_client().query_raw(TABLE_VERSIONS_QUERY, json.dumps(tables))
+    versions = {row["name"]: row["version"] for row in rows}
+    return Validators(
+        make_etag(
+            *(part for table in tables for part in (table, versions.get(table, "0")))
+        )
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Checks a request's If-None-Match header against the current entity tag, using the weak comparison
+    RFC 9110 prescribes for GET.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        etag (str): The current entity tag, quoted.
+
+    Returns:
+        bool: True if the client's cached copy is current and a 304 can be sent.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for candidate in header.split(",")
+    )
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """
+    Evaluates a GET's preconditions. If-None-Match takes precedence; If-Modified-Since is only consulted
+    when the request carries no If-None-Match, at the one-second resolution of HTTP dates.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        validators (Validators): The validators of the current representation.
+
+    Returns:
+        bool: True if the client's cached copy is current and a 304 can be sent.
+    """
+    if "if-none-match" in request.headers:
+        return etag_matches(request, validators.etag)
+    header = request.headers.get("if-modified-since")
+    if not header or validators.lastModified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return validators.lastModified.replace(microsecond=0) <= since
+
+
+def validator_headers(validators: Validators) -> Dict[str, str]:
+    """
+    Builds the ETag and Last-Modified response headers. no-cache lets clients and shared caches store the
+    response but makes them revalidate it on every use; list endpoints choose between JSON and NDJSON by
+    the Accept header, so caches have to key on it.
+
+    Args:
+        validators (Validators): The validators of the representation.
+
+    Returns:
+        Dict[str, str]: The response headers.
+    """
+    headers = {"ETag": validators.etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if validators.lastModified is not None:
+        headers["Last-Modified"] = format_datetime(validators.lastModified, usegmt=True)
+    return headers
+
+
+def not_modified(validators: Validators) -> Response:
+    """
+    Builds the 304 Not Modified response for a conditional GET whose cached copy is current.
+
+    Args:
+        validators (Validators): The current validators, repeated so the client can refresh its cache entry.
+
+    Returns:
+        Response: The empty 304 response.
+    """
+    return Response(status_code=304, headers=validator_headers(validators))
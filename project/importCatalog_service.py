@@ -0,0 +1,207 @@
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import prisma
+import prisma.models
+from project.catalog_io import CatalogRow, MalformedCatalogLine, iter_catalog_rows
+from project.config import CATALOG_IMPORT_CHUNK_SIZE
+from project.hose_index import hose_index
+from project.measurement_stats import measurement_stats
+from project.price_comparison import price_comparison_cache
+from project.product_cache import product_catalog_cache
+from pydantic import BaseModel, ValidationError
+
+MAX_REPORTED_ERRORS = 100
+
+
+class CatalogImportError(BaseModel):
+    """
+    A catalog row that was not imported, identified by its row number (starting at 1, header excluded).
+    """
+
+    row: int
+    message: str
+
+
+class CatalogImportProgress(BaseModel):
+    """
+    Running totals of a catalog import, reported after every chunk and once more when the import is done.
+    """
+
+    rowsRead: int = 0
+    hosesCreated: int = 0
+    hosesUpdated: int = 0
+    purchaseOptionsWritten: int = 0
+    failed: int = 0
+    errors: List[CatalogImportError] = []
+    elapsedSeconds: float = 0.0
+    rowsPerSecond: float = 0.0
+    done: bool = False
+
+
+def _record_error(progress: CatalogImportProgress, row: int, message: str) -> None:
+    progress.failed += 1
+    if len(progress.errors) < MAX_REPORTED_ERRORS:
+        progress.errors.append(CatalogImportError(row=row, message=message))
+
+
+async def _write_chunk(
+    rows: List[Tuple[int, CatalogRow]], progress: CatalogImportProgress
+) -> None:
+    explicit_ids = list({row.hoseId for _, row in rows if row.hoseId})
+    existing = (
+        {
+            hose.id: hose
+            for hose in await prisma.models.Hose.prisma().find_many(
+                where={"id": {"in": explicit_ids}}
+            )
+        }
+        if explicit_ids
+        else {}
+    )
+    hoses: Dict[str, Tuple[float, float]] = {}
+    options: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for _, row in rows:
+        hose_id = row.hoseId or str(uuid.uuid4())
+        hoses[hose_id] = (row.length, row.diameter)
+        if row.platform:
+            options[(hose_id, row.platform)] = {
+                "hoseId": hose_id,
+                "platform": row.platform,
+                "price": row.price,
+                "currency": row.currency,
+                "available": row.available,
+                "link": row.link,
+            }
+    created = [
+        {"id": hose_id, "length": length, "diameter": diameter}
+        for hose_id, (length, diameter) in hoses.items()
+        if hose_id not in existing
+    ]
+    updated = {
+        hose_id: dimensions
+        for hose_id, dimensions in hoses.items()
+        if hose_id in existing
+        and dimensions != (existing[hose_id].length, existing[hose_id].diameter)
+    }
+    try:
+        async with prisma.get_client().batch_() as batch:
+            if created:
+                batch.hose.create_many(data=created)
+            for hose_id, (length, diameter) in updated.items():
+                batch.hose.update(
+                    where={"id": hose_id},
+                    data={"length": length, "diameter": diameter},
+                )
+            if options:
+                batch.purchaseoption.delete_many(
+                    where={
+                        "OR": [
+                            {"hoseId": hose_id, "platform": platform}
+                            for hose_id, platform in options
+                        ]
+                    }
+                )
+                batch.purchaseoption.create_many(data=list(options.values()))
+    except Exception as e:
+        for index, _ in rows:
+            _record_error(progress, index, f"Error writing chunk: {str(e)}")
+        return
+    progress.hosesCreated += len(created)
+    progress.hosesUpdated += len(updated)
+    progress.purchaseOptionsWritten += len(options)
+    product_catalog_cache.lists.clear()
+    for hose_id, (length, diameter) in hoses.items():
+        product_catalog_cache.details.invalidate(hose_id)
+        hose_index.upsert(hose_id, length, diameter)
+    measurement_stats.invalidate(*hoses)
+    for hose_id, _ in options:
+        price_comparison_cache.invalidate(hose_id)
+
+
+def streamCatalogImport(
+    chunks: AsyncIterator[bytes],
+    content_type: str,
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[CatalogImportProgress]:
+    """
+    Imports a product catalog while it is being received. Rows are validated and written in chunks; each chunk
+    is written in one transaction that creates new hoses with create_many, updates the dimensions of existing
+    hoses named by hoseId, and replaces their purchase options for the platforms present in the chunk.
+    Only one chunk is held in memory at a time.
+
+    Rows without a hoseId create a new hose each. Invalid rows, NDJSON lines that are not valid JSON, and rows of a chunk whose transaction failed are
+    counted as failed and reported (up to 100) without stopping the import. The content type is checked when
+    called, before the stream is read.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw CSV or NDJSON catalog stream.
+        content_type (str): text/csv or application/x-ndjson.
+        chunk_size (Optional[int]): Rows per transaction. Defaults to CATALOG_IMPORT_CHUNK_SIZE.
+
+    Returns:
+        AsyncIterator[CatalogImportProgress]: The running totals after each chunk, the last one with done set.
+
+    Raises:
+        ValueError: Raised for an unsupported content type.
+
+    Example:
+        async for progress in streamCatalogImport(request.stream(), "text/csv"):
+            print(progress.rowsRead)
+    """
+    rows = iter_catalog_rows(chunks, content_type)
+    return _import_rows(rows, chunk_size or CATALOG_IMPORT_CHUNK_SIZE)
+
+
+async def _import_rows(
+    rows: AsyncIterator[Union[Dict[str, Any], MalformedCatalogLine]], chunk_size: int
+) -> AsyncIterator[CatalogImportProgress]:
+    progress = CatalogImportProgress()
+    started = time.perf_counter()
+    pending: List[Tuple[int, CatalogRow]] = []
+
+    async def flush() -> CatalogImportProgress:
+        if pending:
+            await _write_chunk(pending, progress)
+            pending.clear()
+        progress.elapsedSeconds = round(time.perf_counter() - started, 3)
+        progress.rowsPerSecond = round(
+            progress.rowsRead / max(progress.elapsedSeconds, 1e-9), 1
+        )
+        return progress.model_copy(deep=True)
+
+    async for raw in rows:
+        progress.rowsRead += 1
+        if isinstance(raw, MalformedCatalogLine):
+            _record_error(
+                progress, progress.rowsRead, f"Line {raw.line}: {raw.message}"
+            )
+            continue
+        try:
+            pending.append((progress.rowsRead, CatalogRow.model_validate(raw)))
+        except ValidationError as e:
+            _record_error(progress, progress.rowsRead, str(e))
+        if len(pending) >= chunk_size:
+            yield await flush()
+    progress.done = True
+    yield await flush()
+
+
+async def importCatalog(
+    chunks: AsyncIterator[bytes], content_type: str
+) -> CatalogImportProgress:
+    """
+    Imports a product catalog and returns the final totals. See streamCatalogImport.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw CSV or NDJSON catalog stream.
+        content_type (str): text/csv or application/x-ndjson.
+
+    Returns:
+        CatalogImportProgress: Running totals of a catalog import, reported after every chunk and once more when the import is done.
+    """
+    progress = CatalogImportProgress()
+    async for progress in streamCatalogImport(chunks, content_type):
+        pass
+    return progress
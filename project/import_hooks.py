@@ -0,0 +1,181 @@
+import importlib
+import importlib.abc
+import importlib.util
+import sys
+import time
+import types
+from typing import Any, List, NamedTuple, Optional
+
+SERVICE_PACKAGE = "project."
+SERVICE_SUFFIX = "_service"
+# Subsystems only requests use. The ones the lifespan starts (database, hose index, tip store, search
+# index, usage rollup, HTTP cache versions, and the inquiry buffer with the batch loaders it uses) load
+# at startup either way, as does prisma.models, which the generated client imports.
+LAZY_SUBSYSTEMS = frozenset(
+    {
+        "project.password_hashing",
+        "project.price_comparison",
+        "project.product_cache",
+    }
+)
+
+
+def _find_spec_after(finder: Any, fullname: str, path: Any, target: Any) -> Any:
+    """
+    Resolves a module spec with the finders placed after finder on sys.meta_path.
+    """
+    try:
+        start = sys.meta_path.index(finder) + 1
+    except ValueError:
+        return None
+    for candidate in sys.meta_path[start:]:
+        find_spec = getattr(candidate, "find_spec", None)
+        if find_spec is None:
+            continue
+        spec = find_spec(fullname, path, target)
+        if spec is not None:
+            return spec
+    return None
+
+
+class LazyServiceFinder(importlib.abc.MetaPathFinder):
+    """
+    Wraps the loader of every project.*_service module and of the LAZY_SUBSYSTEMS in
+    importlib.util.LazyLoader, so that importing such a module only creates it and its code runs on
+    first attribute access.
+    """
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        service = fullname.startswith(SERVICE_PACKAGE) and fullname.endswith(
+            SERVICE_SUFFIX
+        )
+        if not (service or fullname in LAZY_SUBSYSTEMS):
+            return None
+        spec = _find_spec_after(self, fullname, path, target)
+        if spec is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        return spec
+
+
+def install_lazy_service_imports() -> None:
+    """
+    Installs LazyServiceFinder at the front of sys.meta_path. Installing it twice has no effect.
+    Service modules imported before this call stay eagerly loaded.
+    """
+    if not any(isinstance(finder, LazyServiceFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, LazyServiceFinder())
+
+
+def module_loaded(name: str) -> bool:
+    """
+    Tells whether a module has been imported and, if it was imported lazily, has already run. Checking
+    does not load the module.
+
+    Args:
+        name (str): The full module name.
+
+    Returns:
+        bool: True if the module's code has run.
+    """
+    module = sys.modules.get(name)
+    # LazyLoader modules keep a ModuleType subclass until their first attribute access.
+    return module is not None and type(module) is types.ModuleType
+
+
+class ImportTiming(NamedTuple):
+    """
+    Execution time of one module, excluding (self) and including (cumulative) the modules it imported.
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class _TimedLoader:
+    def __init__(self, loader: Any, profiler: "ImportProfiler") -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        profiler = self._profiler
+        frame = [time.perf_counter(), 0.0]
+        profiler._stack.append(frame)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            profiler._stack.pop()
+            cumulative = time.perf_counter() - frame[0]
+            if profiler._stack:
+                profiler._stack[-1][1] += cumulative
+            profiler.timings.append(
+                ImportTiming(
+                    module=module.__name__,
+                    self_us=int((cumulative - frame[1]) * 1e6),
+                    cumulative_us=int(cumulative * 1e6),
+                    depth=len(profiler._stack),
+                )
+            )
+            spec = getattr(module, "__spec__", None)
+            if spec is not None and spec.loader is self:
+                spec.loader = self._loader
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """
+    Times the execution of every module imported while it is installed, like `python -X importtime`
+    but available in-process and restricted to module execution.
+    """
+
+    def __init__(self) -> None:
+        self.timings: List[ImportTiming] = []
+        self._stack: List[List[float]] = []
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        spec = _find_spec_after(self, fullname, path, target)
+        if spec is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def __enter__(self) -> "ImportProfiler":
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        sys.meta_path.remove(self)
+
+    def report(self, top: Optional[int] = None, sort: str = "cumulative") -> str:
+        """
+        Formats the recorded timings as a table, slowest first.
+
+        Args:
+            top (Optional[int]): The number of rows to include, or None for all.
+            sort (str): "cumulative" or "self".
+
+        Returns:
+            str: The report.
+        """
+        key = (lambda t: t.self_us) if sort == "self" else (lambda t: t.cumulative_us)
+        rows = sorted(self.timings, key=key, reverse=True)[:top]
+        total = sum(t.cumulative_us for t in self.timings if t.depth == 0)
+        lines = [f"{'self [us]':>10} | {'cumulative':>10} | module"]
+        for timing in rows:
+            lines.append(
+                f"{timing.self_us:>10} | {timing.cumulative_us:>10} | "
+                f"{'  ' * timing.depth}{timing.module}"
+            )
+        lines.append(
+            f"{len(self.timings)} modules executed in {total / 1000:.1f} ms "
+            f"(top-level imports)"
+        )
+        return "\n".join(lines)
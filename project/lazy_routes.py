@@ -0,0 +1,83 @@
+import importlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from project.config import LAZY_ROUTES
+from starlette.routing import Match, Route, compile_path, get_name
+from starlette.types import Scope
+
+
+def resolve_dotted(path: str) -> Any:
+    """
+    Imports the attribute named by a dotted "package.module.attribute" path.
+
+    Args:
+        path (str): The dotted path.
+
+    Returns:
+        Any: The attribute.
+    """
+    module, _, attribute = path.rpartition(".")
+    return getattr(importlib.import_module(module), attribute)
+
+
+class ServiceRoute(APIRoute):
+    """
+    APIRoute whose response_model may be given as a dotted path, so that declaring a route does not
+    touch the service module defining its models.
+
+    With LAZY_ROUTES enabled, building the route (inspecting the endpoint signature and creating its
+    dependencies and response field, which loads the service module) is deferred until a request
+    first matches the route's path, or until anything else reads an attribute only the built route
+    has, such as the OpenAPI schema generation.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not LAZY_ROUTES:
+            self._deferred: Optional[Tuple[str, Callable[..., Any], Dict[str, Any]]] = (
+                None
+            )
+            self._build(path, endpoint, kwargs)
+            return
+        self._deferred = (path, endpoint, kwargs)
+        self.path = path
+        self.endpoint = endpoint
+        self.name = kwargs.get("name") or get_name(endpoint)
+        self.methods = {method.upper() for method in kwargs.get("methods") or ["GET"]}
+        self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+
+    def _build(
+        self, path: str, endpoint: Callable[..., Any], kwargs: Dict[str, Any]
+    ) -> None:
+        if isinstance(kwargs.get("response_model"), str):
+            kwargs = {
+                **kwargs,
+                "response_model": resolve_dotted(kwargs["response_model"]),
+            }
+        super().__init__(path, endpoint, **kwargs)
+
+    def resolve(self) -> None:
+        """
+        Builds a deferred route. Does nothing if the route is already built.
+        """
+        deferred = self.__dict__.get("_deferred")
+        if deferred is not None:
+            self._deferred = None
+            self._build(*deferred)
+
+    def __getattr__(self, name: str) -> Any:
+        if self.__dict__.get("_deferred") is None:
+            raise AttributeError(name)
+        self.resolve()
+        return getattr(self, name)
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if self._deferred is not None:
+            match, child_scope = Route.matches(self, scope)
+            if match == Match.NONE:
+                return match, {}
+            if match == Match.PARTIAL:
+                # Only a method mismatch; the route is built if it ends up answering 405.
+                return match, {**child_scope, "route": self}
+            self.resolve()
+        return super().matches(scope)
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List
+
+from project.compatibility_matrix import compatibility_matrix
+from pydantic import BaseModel
+
+
+class AttachmentCompatibility(BaseModel):
+    """
+    The latest compatibility verdict for one attachment checked against a hose.
+    """
+
+    attachment: str
+    compatible: bool
+    checkedAt: datetime
+    compatibilityId: str
+
+
+class HoseAttachmentsResponse(BaseModel):
+    """
+    Every attachment that has been checked against a hose, with its latest verdict.
+    """
+
+    hoseId: str
+    attachments: List[AttachmentCompatibility]
+
+
+async def listHoseAttachments(hoseId: str) -> HoseAttachmentsResponse:
+    """
+    Lists every attachment checked against a hose together with its latest compatibility verdict, served from the in-process compatibility matrix.
+
+    Args:
+        hoseId (str): The unique identifier of the hose.
+
+    Returns:
+        HoseAttachmentsResponse: Every attachment that has been checked against the hose, with its latest verdict.
+    """
+    await compatibility_matrix.ensure_loaded()
+    return HoseAttachmentsResponse(
+        hoseId=hoseId,
+        attachments=[
+            AttachmentCompatibility(
+                attachment=attachment,
+                compatible=verdict.compatible,
+                checkedAt=verdict.checkedAt,
+                compatibilityId=verdict.logId,
+            )
+            for attachment, verdict in sorted(
+                compatibility_matrix.attachments_for(hoseId).items()
+            )
+        ],
+    )
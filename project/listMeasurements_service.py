@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import List
+from typing import Any, AsyncIterator, Dict, List
 
 import prisma
 import prisma.models
+from project.streaming import DEFAULT_BATCH_SIZE, iter_batches
 from pydantic import BaseModel
 
 
@@ -33,7 +34,26 @@ class GetMeasurementsResponse(BaseModel):
     measurements: List[HoseMeasurement]
 
 
-async def listMeasurements(request: GetMeasurementsRequest) -> GetMeasurementsResponse:
+def measurement_row(measurement: prisma.models.HoseMeasurement) -> Dict[str, Any]:
+    """
+    Builds the JSON-ready form of a HoseMeasurement directly from its database record, without creating
+    or validating a response model.
+
+    Args:
+        measurement (prisma.models.HoseMeasurement): The database record.
+
+    Returns:
+        Dict[str, Any]: The HoseMeasurement fields of the record.
+    """
+    return {
+        "id": measurement.id,
+        "hoseId": measurement.hoseId,
+        "userId": measurement.userId,
+        "measuredAt": measurement.measuredAt,
+    }
+
+
+async def listMeasurements(request: GetMeasurementsRequest) -> Dict[str, Any]:
     """
     Retrieves a list of all hose measurements. This route queries the Database Module to fetch all measurement records and displays them, typically used in reporting or dashboard features. Returns an array of measurements.
 
@@ -41,18 +61,28 @@ async def listMeasurements(request: GetMeasurementsRequest) -> GetMeasurementsRe
         request (GetMeasurementsRequest): This model defines the input parameters, which are none for this GET endpoint. However, authentication like roles should be handled in the middleware or the layer managing the security.
 
     Returns:
-        GetMeasurementsResponse: This model defines the structure of the response which contains a list of hose measurements, detailing each measurement's properties.
-    """
-    measurements = await prisma.models.HoseMeasurement.prisma().find_many(
-        include={"Hose": True, "User": True}
-    )
-    hose_measurements = [
-        HoseMeasurement(
-            id=measurement.id,
-            hoseId=measurement.hoseId,
-            userId=measurement.userId,
-            measuredAt=measurement.measuredAt,
-        )
-        for measurement in measurements
-    ]
-    return GetMeasurementsResponse(measurements=hose_measurements)
+        Dict[str, Any]: The GetMeasurementsResponse payload as JSON-ready data, built directly from the query rows.
+    """
+    measurements = await prisma.models.HoseMeasurement.prisma().find_many()
+    return {
+        "measurements": [measurement_row(measurement) for measurement in measurements]
+    }
+
+
+async def streamMeasurements(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields every hose measurement one at a time, paging through the table in batches so that memory stays bounded for exports.
+
+    Args:
+        batch_size (int): Number of measurements fetched per database round-trip.
+
+    Yields:
+        Dict[str, Any]: The next measurement in id order, as JSON-ready HoseMeasurement fields.
+    """
+    async for batch in iter_batches(
+        prisma.models.HoseMeasurement.prisma(), batch_size=batch_size
+    ):
+        for measurement in batch:
+            yield measurement_row(measurement)
@@ -1,7 +1,11 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import prisma
 import prisma.models
+from project.config import HOSE_INDEX_ENABLED
+from project.hose_index import hose_index
+from project.product_cache import normalize_product_filter, product_catalog_cache
+from project.streaming import DEFAULT_BATCH_SIZE, iter_batches
 from pydantic import BaseModel
 
 
@@ -36,14 +40,14 @@ class ProductsListResponse(BaseModel):
     products: List[ProductDetail]
 
 
-async def listProducts(
+def build_product_filter(
     hose_diameter_min: Optional[float],
     hose_diameter_max: Optional[float],
     hose_length_min: Optional[float],
     hose_length_max: Optional[float],
-) -> ProductsListResponse:
+) -> Dict[str, Any]:
     """
-    Retrieves a list of all products, focusing primarily on the available hoses. Useful for both users and administrators for browsing products.
+    Translates the optional diameter and length bounds into a Prisma where-clause.
 
     Args:
         hose_diameter_min (Optional[float]): Minimum diameter of hose to filter the products.
@@ -52,7 +56,7 @@ async def listProducts(
         hose_length_max (Optional[float]): Maximum length of hose to filter the products.
 
     Returns:
-        ProductsListResponse: The response model providing a list of products, focusing on hoses with their purchase options.
+        Dict[str, Any]: The Prisma where-clause, empty when no bound is given.
     """
     query_conditions = {}
     if hose_diameter_min is not None:
@@ -65,27 +69,120 @@ async def listProducts(
     if hose_length_max is not None:
         query_conditions["length"] = query_conditions.get("length", {})
         query_conditions["length"]["lte"] = hose_length_max
+    return query_conditions
+
+
+def product_row(hose: prisma.models.Hose) -> Dict[str, Any]:
+    """
+    Builds the JSON-ready form of a ProductDetail directly from a Hose record loaded with its PurchaseOptions.
+    Prisma has already typed the record, so no response models are created or validated.
+
+    Args:
+        hose (prisma.models.Hose): The database record, including PurchaseOptions.
+
+    Returns:
+        Dict[str, Any]: The ProductDetail fields of the hose.
+    """
+    return {
+        "id": hose.id,
+        "length": hose.length,
+        "diameter": hose.diameter,
+        "purchaseOptions": [
+            {
+                "platform": option.platform,
+                "price": option.price,
+                "currency": option.currency,
+                "available": option.available,
+                "link": option.link,
+            }
+            for option in hose.PurchaseOptions or []
+        ],
+    }
+
+
+async def listProducts(
+    hose_diameter_min: Optional[float],
+    hose_diameter_max: Optional[float],
+    hose_length_min: Optional[float],
+    hose_length_max: Optional[float],
+    version: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Retrieves a list of all products, focusing primarily on the available hoses. Useful for both users and administrators for browsing products.
+
+    Args:
+        hose_diameter_min (Optional[float]): Minimum diameter of hose to filter the products.
+        hose_diameter_max (Optional[float]): Maximum diameter of hose to filter the products.
+        hose_length_min (Optional[float]): Minimum length of hose to filter the products.
+        hose_length_max (Optional[float]): Maximum length of hose to filter the products.
+        version (Optional[str]): The current version of the Hose and PurchaseOption tables, e.g. their entity
+            tag. A cached response built from another version is treated as a miss, so writes made by other
+            workers are not served from this worker's cache.
+
+    Returns:
+        Dict[str, Any]: The ProductsListResponse payload as JSON-ready data, built directly from the query rows.
+        Responses are served from product_catalog_cache when a fresh entry exists for the same filter. When
+        HOSE_INDEX_ENABLED is set and the in-process hose_index is current for version, the bounds are resolved
+        against it and hoses are fetched by id; while it is behind writes of other workers, or without a
+        version, the bounds are queried in the database.
+    """
+    cache_key = normalize_product_filter(
+        hose_diameter_min, hose_diameter_max, hose_length_min, hose_length_max
+    )
+    cached = product_catalog_cache.lists.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    if HOSE_INDEX_ENABLED and hose_index.is_current(version):
+        query_conditions = {
+            "id": {
+                "in": hose_index.range(
+                    hose_diameter_min,
+                    hose_diameter_max,
+                    hose_length_min,
+                    hose_length_max,
+                )
+            }
+        }
+    else:
+        query_conditions = build_product_filter(
+            hose_diameter_min, hose_diameter_max, hose_length_min, hose_length_max
+        )
     hoses = await prisma.models.Hose.prisma().find_many(
         where=query_conditions, include={"PurchaseOptions": True}
     )
-    products_list = []
-    for hose in hoses:
-        purchase_options = [
-            PurchaseOptionDetail(
-                platform=option.platform,
-                price=option.price,
-                currency=option.currency,
-                available=option.available,
-                link=option.link,
-            )
-            for option in hose.PurchaseOptions
-        ]
-        product_detail = ProductDetail(
-            id=hose.id,
-            length=hose.length,
-            diameter=hose.diameter,
-            purchaseOptions=purchase_options,
-        )
-        products_list.append(product_detail)
-    response = ProductsListResponse(products=products_list)
+    response = {"products": [product_row(hose) for hose in hoses]}
+    product_catalog_cache.lists.set(cache_key, (version, response))
     return response
+
+
+async def streamProducts(
+    hose_diameter_min: Optional[float],
+    hose_diameter_max: Optional[float],
+    hose_length_min: Optional[float],
+    hose_length_max: Optional[float],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields every matching product one at a time, paging through the hoses in batches so that memory stays bounded for exports.
+
+    Args:
+        hose_diameter_min (Optional[float]): Minimum diameter of hose to filter the products.
+        hose_diameter_max (Optional[float]): Maximum diameter of hose to filter the products.
+        hose_length_min (Optional[float]): Minimum length of hose to filter the products.
+        hose_length_max (Optional[float]): Maximum length of hose to filter the products.
+        batch_size (int): Number of hoses fetched per database round-trip.
+
+    Yields:
+        Dict[str, Any]: The next matching product in id order, as JSON-ready ProductDetail fields.
+    """
+    query_conditions = build_product_filter(
+        hose_diameter_min, hose_diameter_max, hose_length_min, hose_length_max
+    )
+    async for batch in iter_batches(
+        prisma.models.Hose.prisma(),
+        where=query_conditions,
+        include={"PurchaseOptions": True},
+        batch_size=batch_size,
+    ):
+        for hose in batch:
+            yield product_row(hose)
@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
+from project.tip_store import CareTipEntry, tip_store
 from pydantic import BaseModel
 
 
@@ -20,6 +21,7 @@ class Tip(BaseModel):
     id: str
     title: str
     description: str
+    hoseIds: List[str]
     createdAt: datetime
 
 
@@ -31,34 +33,34 @@ class GetTipsResponse(BaseModel):
     tips: List[Tip]
 
 
-async def listTips(request: GetTipsRequest) -> GetTipsResponse:
+def to_tip(entry: CareTipEntry) -> Tip:
+    return Tip(
+        id=entry.id,
+        title=entry.title,
+        description=entry.description,
+        hoseIds=list(entry.hoseIds),
+        createdAt=entry.createdAt,
+    )
+
+
+async def listTips(
+    request: GetTipsRequest, hoseId: Optional[str] = None
+) -> GetTipsResponse:
     """
-    This route retrieves a list of all care tips from the Database Module. It returns an array of tips, each object containing tip details. The route can be accessed by anyone, including guests, as it's public.
+    This route retrieves a list of all care tips, in creation order, from the in-memory tip store. It returns an array of tips, each object containing tip details. The route can be accessed by anyone, including guests, as it's public.
 
     Args:
         request (GetTipsRequest): This model represents the request for fetching all hose care tips. No specific input parameters are required, aligning with the public accessibility of the route.
+        hoseId (Optional[str]): Only return the tips that apply to this hose.
 
     Returns:
         GetTipsResponse: This model encapsulates the response from retrieving hose care tips, outputting a list of tips.
 
     Examples:
         request = GetTipsRequest()
-        listTips(request)
-        > GetTipsResponse(tips=[Tip(id='1', title='Proper Hose Storage', description='Store your hoses in a cool, dry place.', createdAt=datetime.now())])
+        await listTips(request)
+        > GetTipsResponse(tips=[Tip(id='...', title='Proper Hose Storage', description='Store your hoses in a cool, dry place.', hoseIds=[], createdAt=...)])
     """
-    tips_data = [
-        {
-            "id": "1",
-            "title": "Proper Hose Storage",
-            "description": "Store your hoses in a cool, dry place.",
-            "createdAt": datetime.now(),
-        },
-        {
-            "id": "2",
-            "title": "Avoid Sunlight",
-            "description": "Keep hoses away from direct sunlight to avoid degradation.",
-            "createdAt": datetime.now(),
-        },
-    ]
-    tips = [Tip(**tip) for tip in tips_data]
-    return GetTipsResponse(tips=tips)
+    snapshot = await tip_store.current()
+    tips = snapshot.tips if hoseId is None else snapshot.for_hose(hoseId)
+    return GetTipsResponse(tips=[to_tip(tip) for tip in tips])
@@ -1,18 +1,44 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import prisma
 import prisma.enums
 import prisma.models
-from pydantic import BaseModel
+from project.pagination import encode_cursor, keyset_order, keyset_where
+from project.streaming import DEFAULT_BATCH_SIZE, iter_batches
+from pydantic import BaseModel, Field
+
+# Each relation that can be included, with the timestamp its newest rows are picked by.
+USER_RELATIONS = {
+    "HoseMeasurements": "measuredAt",
+    "HoseCompatibilityLogs": "checkedAt",
+    "UsageLogs": "viewedAt",
+    "Questions": "createdAt",
+    "Answer": "createdAt",
+}
+
+# The table behind each relation whose writes are versioned, to tag cached responses by.
+VERSIONED_RELATION_TABLES = {
+    "HoseMeasurements": "HoseMeasurement",
+    "HoseCompatibilityLogs": "HoseCompatibility",
+    "Questions": "Question",
+    "Answer": "Answer",
+}
+
+MAX_PAGE_SIZE = 500
+
+MAX_RELATION_LIMIT = 100
 
 
 class GetUsersRequest(BaseModel):
     """
-    Request model for retrieving all users. No inputs required for this endpoint as it just retrieves all users.
+    Request model for retrieving users one page at a time. Pages are ordered by creation time and id, and relations are only loaded when listed in include.
     """
 
-    pass
+    limit: int = Field(default=50, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    include: List[str] = Field(default_factory=list)
+    relation_limit: int = Field(default=20, ge=1, le=MAX_RELATION_LIMIT)
 
 
 class HoseMeasurement(BaseModel):
@@ -51,46 +77,129 @@ class User(BaseModel):
     updatedAt: datetime
     lastLogin: Optional[datetime] = None
     role: prisma.enums.UserRole
-    HoseMeasurements: List[HoseMeasurement]
-    HoseCompatibilityLogs: List[HoseCompatibility]
-    UsageLogs: List[prisma.models.UsageLog]
-    Questions: List[prisma.models.Question]
-    prisma.models.Answer: List[
-        prisma.models.Answer
-    ]  # TODO(autogpt): Type annotation not supported for this statement. reportInvalidTypeForm
+    HoseMeasurements: Optional[List[HoseMeasurement]] = None
+    HoseCompatibilityLogs: Optional[List[HoseCompatibility]] = None
+    UsageLogs: Optional[List[prisma.models.UsageLog]] = None
+    Questions: Optional[List[prisma.models.Question]] = None
+    Answer: Optional[List[prisma.models.Answer]] = None
 
 
 class GetUsersResponse(BaseModel):
     """
-    Response model for retrieving all users. Contains a list of user objects detailing each user's information.
+    Response model for retrieving a page of users. next_cursor is set when more users are available and should be passed back as the cursor of the next request.
     """
 
     users: List[User]
+    next_cursor: Optional[str] = None
+
+
+def build_user_include(include: List[str], relation_limit: int) -> Dict[str, Any]:
+    """
+    Translates the requested relation names into a Prisma include with a per-relation cap. Each relation is
+    ordered newest first by its timestamp, so the cap keeps the most recent rows.
+
+    Args:
+        include (List[str]): Relation names requested by the caller.
+        relation_limit (int): Maximum number of rows loaded per relation and user.
+
+    Returns:
+        Dict[str, Any]: The Prisma include argument.
+
+    Raises:
+        ValueError: Raised if an unknown relation is requested.
+    """
+    unknown = [name for name in include if name not in USER_RELATIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown relation(s) {unknown}; expected any of {list(USER_RELATIONS)}"
+        )
+    return {
+        name: {
+            "take": relation_limit,
+            "order_by": [{USER_RELATIONS[name]: "desc"}, {"id": "desc"}],
+        }
+        for name in dict.fromkeys(include)
+    }
+
+
+def user_list_tables(include: List[str]) -> Optional[List[str]]:
+    """
+    Names the tables a user list with the given relations is built from, for deriving its cache validators.
+
+    Args:
+        include (List[str]): Relation names requested by the caller.
+
+    Returns:
+        Optional[List[str]]: The tables, or None if a relation's writes are not versioned.
+    """
+    tables = ["User"]
+    for name in dict.fromkeys(include):
+        if name not in VERSIONED_RELATION_TABLES:
+            return None
+        tables.append(VERSIONED_RELATION_TABLES[name])
+    return tables
 
 
 async def listUsers(request: GetUsersRequest) -> GetUsersResponse:
     """
-    Retrieves a list of all users, returning an array of user data including all elements related to the user.
-    Useful for admins to oversee the user base.
+    Retrieves a page of users ordered by (createdAt, id). Related records are only loaded for the relations
+    named in request.include and are capped at the request.relation_limit most recent rows each, so memory use
+    stays flat regardless of how many users or related rows exist.
 
     Args:
-        request (GetUsersRequest): Request model for retrieving all users. No inputs required for this endpoint as it just retrieves all users.
+        request (GetUsersRequest): Page size, cursor from the previous page, and the relations to include.
 
     Returns:
-        GetUsersResponse: Response model for retrieving all users. Contains a list of user objects detailing each user's information.
+        GetUsersResponse: The users on this page and the cursor of the next page, if any.
 
     Example:
-        request = GetUsersRequest()
+        request = GetUsersRequest(limit=2, include=["Questions"])
         response = await listUsers(request)
-        > GetUsersResponse(users=[User(id='1', email='example@example.com', ...), User(id='2', email='example2@example.com', ...)])
+        > GetUsersResponse(users=[User(id='1', email='example@example.com', ...), User(id='2', ...)], next_cursor='eyJ0Ijo...')
     """
     users = await prisma.models.User.prisma().find_many(
-        include={
-            "HoseMeasurements": True,
-            "HoseCompatibilityLogs": True,
-            "UsageLogs": True,
-            "Questions": True,
-            "Answers": True,
-        }
+        where=keyset_where(request.cursor),
+        order=keyset_order(),
+        take=request.limit + 1,
+        include=build_user_include(request.include, request.relation_limit) or None,
     )
-    return GetUsersResponse(users=users)
+    next_cursor = None
+    if len(users) > request.limit:
+        users = users[: request.limit]
+        last = users[-1]
+        next_cursor = encode_cursor(last.createdAt, last.id)
+    return GetUsersResponse(
+        users=[User.model_validate(user, from_attributes=True) for user in users],
+        next_cursor=next_cursor,
+    )
+
+
+def streamUsers(
+    include: List[str], relation_limit: int, batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[User]:
+    """
+    Streams every user one at a time, paging through the table in batches so that memory stays bounded for exports.
+    The relations are checked when called, before the first user is read.
+
+    Args:
+        include (List[str]): Relation names to load with each user.
+        relation_limit (int): Maximum number of rows loaded per relation and user.
+        batch_size (int): Number of users fetched per database round-trip.
+
+    Returns:
+        AsyncIterator[User]: The users in id order.
+
+    Raises:
+        ValueError: Raised if an unknown relation is requested.
+    """
+    return _user_stream(build_user_include(include, relation_limit) or None, batch_size)
+
+
+async def _user_stream(
+    relations: Optional[Dict[str, Any]], batch_size: int
+) -> AsyncIterator[User]:
+    async for batch in iter_batches(
+        prisma.models.User.prisma(), include=relations, batch_size=batch_size
+    ):
+        for user in batch:
+            yield User.model_validate(user, from_attributes=True)
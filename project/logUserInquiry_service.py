@@ -1,8 +1,18 @@
-from datetime import datetime
-from typing import Optional
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
 import prisma
 import prisma.models
+from project.batch_loader import user_loader
+from project.config import (
+    INQUIRY_FLUSH_BATCH_SIZE,
+    INQUIRY_FLUSH_INTERVAL_SECONDS,
+    INQUIRY_QUEUE_MAX_SIZE,
+    INQUIRY_QUEUE_PUT_TIMEOUT_SECONDS,
+)
+from project.search_index import search_index
+from project.write_behind import WriteBehindBuffer
 from pydantic import BaseModel
 
 
@@ -16,12 +26,41 @@ class UserInquiryResponse(BaseModel):
     inquiryId: Optional[str] = None
 
 
+def index_inquiries(rows: List[Dict[str, Any]]) -> None:
+    """
+    Adds inquiries written to the Question table to the search index.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows as written.
+    """
+    for row in rows:
+        search_index.index_question(
+            row["id"], row["content"], row["userId"], row["createdAt"]
+        )
+
+
+inquiry_buffer = WriteBehindBuffer(
+    "inquiries",
+    lambda: prisma.models.Question.prisma(),
+    max_size=INQUIRY_QUEUE_MAX_SIZE,
+    batch_size=INQUIRY_FLUSH_BATCH_SIZE,
+    flush_interval=INQUIRY_FLUSH_INTERVAL_SECONDS,
+    put_timeout=INQUIRY_QUEUE_PUT_TIMEOUT_SECONDS,
+    on_written=index_inquiries,
+)
+
+
 async def logUserInquiry(
     userId: str, inquiryDetails: str, timestamp: Optional[datetime] = None
 ) -> UserInquiryResponse:
     """
     Logs user inquiries regarding product preferences and purchase history to the Database Module for future analytics and personalized user experiences. The body of the request should include user ID, inquiry details, and possibly the timestamp. This is protected to ensure data integrity and confidentiality.
 
+    While the write-behind inquiry_buffer is running, the inquiry is acknowledged as soon as the user is found and
+    the inquiry is queued, with a pre-generated id, and written to the database in a later batch. The user lookup
+    is batched with the other lookups of the same event-loop tick. If the buffer stays full the inquiry is
+    rejected rather than delaying the request. Without a running buffer the inquiry is written directly.
+
     Args:
         userId (str): The unique identifier of the user making the inquiry.
         inquiryDetails (str): Detailed description of the user's inquiry regarding their product preferences or purchase history.
@@ -31,15 +70,29 @@ async def logUserInquiry(
         UserInquiryResponse: This model provides feedback that the user's inquiry has been logged successfully. It includes the status of the request and any error or success messages.
     """
     if not timestamp:
-        timestamp = datetime.now()
+        timestamp = datetime.now(timezone.utc)
+    data = {
+        "id": str(uuid.uuid4()),
+        "content": inquiryDetails,
+        "userId": userId,
+        "createdAt": timestamp,
+        "updatedAt": timestamp,
+    }
+    if inquiry_buffer.running:
+        if await user_loader.load(userId) is None:
+            return UserInquiryResponse(success=False, message="User not found")
+        if not await inquiry_buffer.submit(data):
+            return UserInquiryResponse(
+                success=False,
+                message="Inquiry logging is overloaded, please retry later.",
+            )
+        return UserInquiryResponse(
+            success=True, message="Inquiry accepted for logging.", inquiryId=data["id"]
+        )
     try:
-        inquiry = await prisma.models.Question.prisma().create(
-            data={
-                "content": inquiryDetails,
-                "userId": userId,
-                "createdAt": timestamp,
-                "updatedAt": timestamp,
-            }
+        inquiry = await prisma.models.Question.prisma().create(data=data)
+        search_index.index_question(
+            inquiry.id, inquiry.content, inquiry.userId, inquiry.createdAt
         )
         return UserInquiryResponse(
             success=True, message="Inquiry logged successfully.", inquiryId=inquiry.id
@@ -0,0 +1,329 @@
+import asyncio
+import bisect
+import json
+import math
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import prisma
+from project.config import MEASUREMENT_STATS_TTL_SECONDS
+
+DAY_SECONDS = 86400.0
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+# One row per (hose, day): the hose's current dimensions and that day's measurement count and time range.
+HOSE_DAYS_QUERY = """
+SELECT m."hoseId", h."length", h."diameter",
+    extract(epoch FROM date_trunc('day', m."measuredAt"))::float8 AS "day",
+    count(*)::int AS "measurements",
+    extract(epoch FROM min(m."measuredAt"))::float8 AS "first",
+    extract(epoch FROM max(m."measuredAt"))::float8 AS "last"
+FROM "HoseMeasurement" m
+JOIN "Hose" h ON h."id" = m."hoseId"
+{where}
+GROUP BY m."hoseId", h."length", h."diameter", "day"
+"""
+
+ALL_HOSE_DAYS_QUERY = HOSE_DAYS_QUERY.format(where="")
+
+SOME_HOSE_DAYS_QUERY = HOSE_DAYS_QUERY.format(
+    where="""WHERE m."hoseId" IN (SELECT jsonb_array_elements_text($1::jsonb))"""
+)
+
+
+class HoseAggregate(NamedTuple):
+    """
+    The measurements of one hose, reduced to a count per day. The measured length and diameter live on
+    the Hose row, so every measurement of a hose carries the hose's current dimensions.
+    """
+
+    hoseId: str
+    length: float
+    diameter: float
+    measurements: int
+    firstMeasuredAt: float
+    lastMeasuredAt: float
+    days: Dict[float, int]
+
+
+class Distribution(NamedTuple):
+    """
+    Count, moments and percentiles of one measured dimension across all measurements.
+    """
+
+    count: int
+    mean: Optional[float]
+    stddev: Optional[float]
+    minimum: Optional[float]
+    percentiles: Tuple[Optional[float], ...]
+    maximum: Optional[float]
+
+
+class StatsSummary(NamedTuple):
+    """
+    The aggregates every /measurements/stats response is cut from: global distributions, per-hose
+    z-scores in column form, and the per-day series of the measured hoses' mean dimensions.
+    """
+
+    hoses: Tuple[HoseAggregate, ...]
+    hoseIds: Tuple[str, ...]
+    measurements: int
+    length: Distribution
+    diameter: Distribution
+    lengthZ: array
+    diameterZ: array
+    dayStarts: Tuple[float, ...]
+    dayCounts: array
+    dayLengthMeans: array
+    dayDiameterMeans: array
+
+    def position(self, hose_id: str) -> Optional[int]:
+        """
+        Finds a hose in the per-hose columns.
+
+        Args:
+            hose_id (str): The hose id.
+
+        Returns:
+            Optional[int]: The column index of the hose, or None if it has no measurements.
+        """
+        index = bisect.bisect_left(self.hoseIds, hose_id)
+        if index < len(self.hoseIds) and self.hoseIds[index] == hose_id:
+            return index
+        return None
+
+
+def weighted_distribution(values: array, weights: array) -> Distribution:
+    """
+    Computes the count, mean, population standard deviation, percentiles and range of values that occur
+    weights[i] times each, in a few passes over the columns and one sort, without expanding them.
+
+    Args:
+        values (array): The distinct values.
+        weights (array): How often each value occurs.
+
+    Returns:
+        Distribution: The distribution.
+    """
+    total = int(math.fsum(weights))
+    if not total:
+        return Distribution(0, None, None, None, (None,) * len(PERCENTILES), None)
+    mean = math.fsum(map(float.__mul__, values, weights)) / total
+    variance = (
+        math.fsum(w * (v - mean) ** 2 for v, w in zip(values, weights) if w) / total
+    )
+    order = sorted(
+        (i for i in range(len(values)) if weights[i]), key=values.__getitem__
+    )
+    percentiles: List[Optional[float]] = []
+    targets = iter(PERCENTILES)
+    target = next(targets)
+    seen = 0.0
+    for i in order:
+        seen += weights[i]
+        while target is not None and seen >= target * total:
+            percentiles.append(values[i])
+            target = next(targets, None)
+    return Distribution(
+        total,
+        mean,
+        math.sqrt(variance),
+        values[order[0]],
+        tuple(percentiles),
+        values[order[-1]],
+    )
+
+
+def z_scores(values: array, distribution: Distribution) -> array:
+    """
+    Computes how many standard deviations each value lies from the mean.
+
+    Args:
+        values (array): The values.
+        distribution (Distribution): The distribution they are scored against.
+
+    Returns:
+        array: The z-scores, 0 where the distribution has no spread.
+    """
+    if not distribution.stddev:
+        return array("d", [0.0]) * len(values)
+    mean, stddev = distribution.mean, distribution.stddev
+    return array("d", ((value - mean) / stddev for value in values))
+
+
+def trend_per_day(
+    day_starts: Sequence[float], counts: Sequence[float], means: Sequence[float]
+) -> Optional[float]:
+    """
+    Fits a line through the daily means by least squares, weighting each day by its number of
+    measurements, and returns its slope.
+
+    Args:
+        day_starts (Sequence[float]): The start of each day, in epoch seconds.
+        counts (Sequence[float]): The number of measurements on each day.
+        means (Sequence[float]): The mean value of each day.
+
+    Returns:
+        Optional[float]: The change of the mean per day, or None with fewer than two days.
+    """
+    total = math.fsum(counts)
+    if len(day_starts) < 2 or not total:
+        return None
+    days = [start / DAY_SECONDS for start in day_starts]
+    mean_day = math.fsum(map(float.__mul__, days, counts)) / total
+    mean_value = math.fsum(map(float.__mul__, means, counts)) / total
+    spread = math.fsum(w * (d - mean_day) ** 2 for d, w in zip(days, counts))
+    if not spread:
+        return None
+    covariance = math.fsum(
+        w * (d - mean_day) * (m - mean_value) for d, m, w in zip(days, means, counts)
+    )
+    return covariance / spread
+
+
+def summarize(aggregates: Iterable[HoseAggregate]) -> StatsSummary:
+    """
+    Reduces the per-hose aggregates to the global summary. Dimensions are held as columns with one entry
+    per hose, weighted by its number of measurements, so the cost grows with the number of hoses and days
+    rather than the number of measurements.
+
+    Args:
+        aggregates (Iterable[HoseAggregate]): The aggregates of every measured hose.
+
+    Returns:
+        StatsSummary: The summary.
+    """
+    hoses = tuple(sorted(aggregates, key=lambda aggregate: aggregate.hoseId))
+    weights = array("d", (aggregate.measurements for aggregate in hoses))
+    lengths = array("d", (aggregate.length for aggregate in hoses))
+    diameters = array("d", (aggregate.diameter for aggregate in hoses))
+    length = weighted_distribution(lengths, weights)
+    diameter = weighted_distribution(diameters, weights)
+    day_counts: Dict[float, int] = {}
+    day_lengths: Dict[float, float] = {}
+    day_diameters: Dict[float, float] = {}
+    for aggregate in hoses:
+        for day, count in aggregate.days.items():
+            day_counts[day] = day_counts.get(day, 0) + count
+            day_lengths[day] = day_lengths.get(day, 0.0) + count * aggregate.length
+            day_diameters[day] = (
+                day_diameters.get(day, 0.0) + count * aggregate.diameter
+            )
+    day_starts = tuple(sorted(day_counts))
+    return StatsSummary(
+        hoses=hoses,
+        hoseIds=tuple(aggregate.hoseId for aggregate in hoses),
+        measurements=length.count,
+        length=length,
+        diameter=diameter,
+        lengthZ=z_scores(lengths, length),
+        diameterZ=z_scores(diameters, diameter),
+        dayStarts=day_starts,
+        dayCounts=array("d", (day_counts[day] for day in day_starts)),
+        dayLengthMeans=array(
+            "d", (day_lengths[day] / day_counts[day] for day in day_starts)
+        ),
+        dayDiameterMeans=array(
+            "d", (day_diameters[day] / day_counts[day] for day in day_starts)
+        ),
+    )
+
+
+def to_datetime(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class MeasurementStatsEngine:
+    """
+    Keeps the measurements of every hose aggregated per day, built in one grouped query, and derives
+    the global statistics from those aggregates. Writes mark their hose stale; the next read re-aggregates
+    only the stale hoses, in one query, and rebuilds the summary from the cached aggregates of the rest.
+    Everything is rebuilt from scratch once it is older than the time-to-live, which bounds how long
+    writes made by other workers go unseen.
+
+    The aggregates are a per-worker structure.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._hoses: Dict[str, HoseAggregate] = {}
+        self._summary: Optional[StatsSummary] = None
+        self._stale: Set[str] = set()
+        self._built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self, *hose_ids: str) -> None:
+        """
+        Marks hoses whose measurements or dimensions changed.
+
+        Args:
+            *hose_ids (str): The ids of the hoses.
+        """
+        self._stale.update(hose_ids)
+        if hose_ids:
+            self._summary = None
+
+    def invalidate_all(self) -> None:
+        """
+        Drops every aggregate, e.g. after a delete that cascaded across many hoses.
+        """
+        self._built_at = None
+        self._summary = None
+
+    @staticmethod
+    def _fold(rows: List[dict]) -> Dict[str, HoseAggregate]:
+        grouped: Dict[str, List[dict]] = {}
+        for row in rows:
+            grouped.setdefault(row["hoseId"], []).append(row)
+        aggregates = {}
+        for hose_id, days in grouped.items():
+            aggregates[hose_id] = HoseAggregate(
+                hoseId=hose_id,
+                length=float(days[0]["length"]),
+                diameter=float(days[0]["diameter"]),
+                measurements=sum(int(day["measurements"]) for day in days),
+                firstMeasuredAt=min(float(day["first"]) for day in days),
+                lastMeasuredAt=max(float(day["last"]) for day in days),
+                days={float(day["day"]): int(day["measurements"]) for day in days},
+            )
+        return aggregates
+
+    async def _refresh(self) -> None:
+        client = prisma.get_client()
+        expired = (
+            self._built_at is None
+            or time.monotonic() - self._built_at >= self.ttl_seconds
+        )
+        if expired:
+            self._stale = set()
+            self._hoses = self._fold(await client.query_raw(ALL_HOSE_DAYS_QUERY))
+            self._built_at = time.monotonic()
+            self._summary = None
+        elif self._stale:
+            stale, self._stale = self._stale, set()
+            fresh = self._fold(
+                await client.query_raw(SOME_HOSE_DAYS_QUERY, json.dumps(sorted(stale)))
+            )
+            for hose_id in stale:
+                self._hoses.pop(hose_id, None)
+            self._hoses.update(fresh)
+            self._summary = None
+        if self._summary is None:
+            self._summary = summarize(self._hoses.values())
+
+    async def summary(self) -> StatsSummary:
+        """
+        Returns the current summary, re-aggregating whatever is stale first.
+
+        Returns:
+            StatsSummary: The summary.
+        """
+        async with self._lock:
+            await self._refresh()
+            return self._summary
+
+
+measurement_stats = MeasurementStatsEngine(MEASUREMENT_STATS_TTL_SECONDS)
@@ -0,0 +1,310 @@
+import bisect
+import contextvars
+import functools
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    A cumulative Prometheus-style histogram with fixed upper bounds.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Records one observation.
+
+        Args:
+            value (float): The observed value.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """
+    Database activity attributed to the request currently being served.
+    """
+
+    __slots__ = ("db_queries", "db_rows")
+
+    def __init__(self) -> None:
+        self.db_queries = 0
+        self.db_rows = 0
+
+
+current_request: contextvars.ContextVar[Optional[RequestMetrics]] = (
+    contextvars.ContextVar("current_request", default=None)
+)
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    In-process store for the HTTP and database metrics, rendered in the Prometheus text exposition format.
+    Additional gauges can be contributed by registering collectors.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = defaultdict(dict)
+        self.counters: Dict[str, Dict[Labels, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.help: Dict[str, str] = {}
+        self.collectors: List[Callable[[], Dict[str, Dict[Labels, float]]]] = []
+
+    def observe(self, name: str, labels: Labels, value: float, help: str) -> None:
+        """
+        Records an observation in a labelled histogram.
+
+        Args:
+            name (str): The metric name.
+            labels (Labels): The label pairs.
+            value (float): The observed value.
+            help (str): The metric description.
+        """
+        self.help.setdefault(name, help)
+        histogram = self.histograms[name].get(labels)
+        if histogram is None:
+            histogram = self.histograms[name][labels] = Histogram()
+        histogram.observe(value)
+
+    def inc(self, name: str, labels: Labels, value: float, help: str) -> None:
+        """
+        Increments a labelled counter.
+
+        Args:
+            name (str): The metric name.
+            labels (Labels): The label pairs.
+            value (float): The increment.
+            help (str): The metric description.
+        """
+        self.help.setdefault(name, help)
+        self.counters[name][labels] += value
+
+    def register_collector(
+        self, collector: Callable[[], Dict[str, Dict[Labels, float]]]
+    ) -> None:
+        """
+        Adds a callable whose gauges are included in every rendering.
+
+        Args:
+            collector (Callable[[], Dict[str, Dict[Labels, float]]]): Returns gauge values keyed by metric
+                name and label pairs.
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines: List[str] = []
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f"# HELP {name} {self.help.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = _format_labels(labels, f'le="{bound}"')
+                    lines.append(f"{name}_bucket{le} {cumulative}")
+                le = _format_labels(labels, 'le="+Inf"')
+                lines.append(f"{name}_bucket{le} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, series in sorted(self.counters.items()):
+            lines.append(f"# HELP {name} {self.help.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        for collector in self.collectors:
+            for name, series in sorted(collector().items()):
+                lines.append(f"# TYPE {name} gauge")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _count_rows(response: Any) -> int:
+    result = (
+        response.get("data", {}).get("result") if isinstance(response, dict) else None
+    )
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return int(result["count"]) if "count" in result else 1
+    return 0
+
+
+def _record_query(labels: Labels, started: float, response: Any, failed: bool) -> None:
+    registry.observe(
+        "hose_db_query_duration_seconds",
+        labels,
+        time.perf_counter() - started,
+        "Latency of Prisma queries by model and method.",
+    )
+    if failed:
+        registry.inc(
+            "hose_db_query_errors_total",
+            labels,
+            1,
+            "Prisma queries that raised, by model and method.",
+        )
+    request = current_request.get()
+    if request is not None:
+        request.db_queries += 1
+        if not failed:
+            request.db_rows += _count_rows(response)
+
+
+def _instrument(function: Callable[..., Any], labels_of: Callable[..., Labels]) -> Any:
+    @functools.wraps(function)
+    async def instrumented(self, *args, **kwargs):
+        labels = labels_of(self, kwargs)
+        started = time.perf_counter()
+        response = None
+        failed = True
+        try:
+            response = await function(self, *args, **kwargs)
+            failed = False
+            return response
+        finally:
+            _record_query(labels, started, response, failed)
+
+    instrumented.__metrics_hook__ = True
+    return instrumented
+
+
+def _execute_labels(client: Any, kwargs: Dict[str, Any]) -> Labels:
+    return (
+        ("model", getattr(kwargs.get("model"), "__name__", "raw")),
+        ("method", str(kwargs.get("method", "unknown"))),
+    )
+
+
+def _batch_labels(batch: Any, kwargs: Dict[str, Any]) -> Labels:
+    return (("model", "batch"), ("method", "commit"))
+
+
+def install_prisma_query_hook(
+    client_class: type, batch_class: Optional[type] = None
+) -> None:
+    """
+    Wraps the Prisma client's internal _execute method, through which every generated model action is
+    sent to the query engine, and the commit of batch_() transactions, which bypasses it, to record
+    query latency per model and method, count failed queries, and attribute query and row counts to
+    the request being served. A committed batch counts as one query, without rows. Queries run inside
+    tx() go through _execute and are recorded; the begin and commit of the transaction are not.
+    Installing the hook twice has no effect.
+
+    Args:
+        client_class (type): The generated Prisma client class.
+        batch_class (Optional[type]): The generated Batch class, or None to leave batches unrecorded.
+    """
+    if not getattr(client_class._execute, "__metrics_hook__", False):
+        client_class._execute = _instrument(client_class._execute, _execute_labels)
+    if batch_class is not None and not getattr(
+        batch_class.commit, "__metrics_hook__", False
+    ):
+        batch_class.commit = _instrument(batch_class.commit, _batch_labels)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording, per route template and method, request latency, the number of database
+    queries issued, the rows they returned and the response body size.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = RequestMetrics()
+        token = current_request.set(request)
+        status = {"code": 500, "bytes": 0}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                status["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            route = scope.get("route")
+            labels = (
+                ("method", scope["method"]),
+                ("route", getattr(route, "path", "<unmatched>")),
+            )
+            registry.observe(
+                "hose_http_request_duration_seconds",
+                labels + (("status", str(status["code"])),),
+                elapsed,
+                "HTTP request latency by route, method and status.",
+            )
+            registry.inc(
+                "hose_http_db_queries_total",
+                labels,
+                request.db_queries,
+                "Database queries issued while serving requests.",
+            )
+            registry.inc(
+                "hose_http_db_rows_total",
+                labels,
+                request.db_rows,
+                "Rows returned by database queries issued while serving requests.",
+            )
+            registry.inc(
+                "hose_http_response_bytes_total",
+                labels,
+                status["bytes"],
+                "Response body bytes sent.",
+            )
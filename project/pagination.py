@@ -0,0 +1,132 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def encode_cursor(created_at: datetime, record_id: str) -> str:
+    """
+    Encodes a keyset position as an opaque, URL-safe cursor string.
+
+    Args:
+        created_at (datetime): The ordering timestamp of the last record on the page.
+        record_id (str): The id of the last record on the page, used as a tie-breaker.
+
+    Returns:
+        str: The opaque cursor to hand back to the client.
+    """
+    payload = json.dumps({"t": created_at.isoformat(), "id": record_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decodes a cursor produced by encode_cursor back into its keyset position.
+
+    Args:
+        cursor (str): The opaque cursor received from the client.
+
+    Returns:
+        Tuple[datetime, str]: The ordering timestamp and record id encoded in the cursor.
+
+    Raises:
+        ValueError: Raised if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), str(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_after(
+    after_time: datetime, after_id: str, time_field: str = "createdAt"
+) -> Dict[str, Any]:
+    """
+    Builds the Prisma where-clause selecting records strictly after a keyset position in
+    (time_field, id) ascending order.
+
+    Args:
+        after_time (datetime): The ordering timestamp of the position.
+        after_id (str): The record id of the position.
+        time_field (str): The timestamp column the keyset is ordered on.
+
+    Returns:
+        Dict[str, Any]: A Prisma where-clause.
+    """
+    return {
+        "OR": [
+            {time_field: {"gt": after_time}},
+            {time_field: after_time, "id": {"gt": after_id}},
+        ]
+    }
+
+
+def keyset_where(
+    cursor: Optional[str], time_field: str = "createdAt"
+) -> Dict[str, Any]:
+    """
+    Builds the Prisma where-clause selecting records strictly after the cursor position
+    in (time_field, id) ascending order.
+
+    Args:
+        cursor (Optional[str]): The cursor of the previous page, or None for the first page.
+        time_field (str): The timestamp column the keyset is ordered on.
+
+    Returns:
+        Dict[str, Any]: A Prisma where-clause, empty when no cursor is given.
+    """
+    if not cursor:
+        return {}
+    after_time, after_id = decode_cursor(cursor)
+    return keyset_after(after_time, after_id, time_field)
+
+
+def keyset_order(time_field: str = "createdAt") -> List[Dict[str, str]]:
+    """
+    Returns the Prisma order-by matching keyset_where.
+
+    Args:
+        time_field (str): The timestamp column the keyset is ordered on.
+
+    Returns:
+        List[Dict[str, str]]: A Prisma order_by list.
+    """
+    return [{time_field: "asc"}, {"id": "asc"}]
+
+
+def encode_rank_cursor(score: float, record_id: str) -> str:
+    """
+    Encodes a position in a relevance-ranked result list as an opaque, URL-safe cursor string.
+
+    Args:
+        score (float): The relevance score of the last result on the page.
+        record_id (str): The id of the last result on the page, used as a tie-breaker.
+
+    Returns:
+        str: The opaque cursor to hand back to the client.
+    """
+    payload = json.dumps({"s": score, "id": record_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decodes a cursor produced by encode_rank_cursor back into its ranked position.
+
+    Args:
+        cursor (str): The opaque cursor received from the client.
+
+    Returns:
+        Tuple[float, str]: The relevance score and result id encoded in the cursor.
+
+    Raises:
+        ValueError: Raised if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(payload["s"]), str(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
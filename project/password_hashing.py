@@ -0,0 +1,130 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+import bcrypt
+from project.config import BCRYPT_ROUNDS, PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS
+
+T = TypeVar("T")
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a bounded worker pool so that the event loop is never
+    blocked by the key derivation. At most `workers` operations run at once; further callers wait
+    on a semaphore and are counted as queued.
+    """
+
+    def __init__(
+        self, rounds: int, workers: int, executor_kind: str = "thread"
+    ) -> None:
+        if executor_kind not in ("thread", "process"):
+            raise ValueError(
+                f"Unknown password hash executor '{executor_kind}', expected 'thread' or 'process'"
+            )
+        self.rounds = rounds
+        self.workers = max(1, workers)
+        self.executor_kind = executor_kind
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.wait_seconds_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        queued_at = time.perf_counter()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.wait_seconds_total += time.perf_counter() - queued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Hashes a password with bcrypt using the configured cost factor.
+
+        Args:
+            password (str): The plain-text password.
+
+        Returns:
+            str: The bcrypt hash, suitable for storing in User.password.
+        """
+        hashed = await self._run(_hash, password.encode("utf-8"), self.rounds)
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """
+        Checks a plain-text password against a stored bcrypt hash.
+
+        Args:
+            password (str): The plain-text password.
+            hashed (str): The stored bcrypt hash.
+
+        Returns:
+            bool: True if the password matches.
+        """
+        return await self._run(_check, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the current queue depth and throughput counters of the pool.
+
+        Returns:
+            Dict[str, float]: The counters, keyed by name.
+        """
+        return {
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "wait_seconds_total": self.wait_seconds_total,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Shuts the worker pool down. A new pool is created lazily if the hasher is used again.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasher(
+    BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_EXECUTOR
+)
@@ -0,0 +1,100 @@
+from typing import List, Optional
+
+from project.price_comparison import price_comparison_cache
+from pydantic import BaseModel, Field
+
+
+class BasketItem(BaseModel):
+    """
+    A product and the quantity of it in the basket.
+    """
+
+    productId: str
+    quantity: int = Field(default=1, ge=1)
+
+
+class BasketRequest(BaseModel):
+    """
+    A basket of products to price. The target currency is taken from currency, then from user_location, and defaults to the base currency of the rate table.
+    """
+
+    items: List[BasketItem]
+    currency: Optional[str] = None
+    user_location: Optional[str] = None
+
+
+class BasketLine(BaseModel):
+    """
+    The cheapest available offer for one basket item and its line total in the basket currency.
+    """
+
+    productId: str
+    quantity: int
+    platform: str
+    link: str
+    unitPrice: float
+    lineTotal: float
+
+
+class BasketResponse(BaseModel):
+    """
+    The priced basket. Products without an available offer in a convertible currency are listed in unavailable and excluded from the total.
+    """
+
+    currency: str
+    total: float
+    lines: List[BasketLine]
+    unavailable: List[str]
+
+
+async def priceBasket(request: BasketRequest) -> BasketResponse:
+    """
+    Prices a whole basket by picking the cheapest available offer of every product. All price summaries come from the materialized price cache, and those not cached are loaded together in a single query.
+
+    Args:
+        request (BasketRequest): The products, quantities and target currency.
+
+    Returns:
+        BasketResponse: The priced basket.
+
+    Example:
+        await priceBasket(BasketRequest(items=[BasketItem(productId="h1", quantity=2)], user_location="DE"))
+        > BasketResponse(currency='EUR', total=39.8, lines=[BasketLine(productId='h1', quantity=2, ...)], unavailable=[])
+    """
+    rates = price_comparison_cache.rates
+    currency = (request.currency or "").upper() or rates.currency_for(
+        request.user_location, rates.base
+    )
+    if currency not in rates.rates:
+        raise ValueError(f"Unsupported currency: {currency}")
+    summaries = await price_comparison_cache.get_many(
+        [item.productId for item in request.items]
+    )
+    lines: List[BasketLine] = []
+    unavailable: List[str] = []
+    for item in request.items:
+        offers = summaries[item.productId].offers
+        unit_price = (
+            rates.convert(offers[0].price, offers[0].currency, currency)
+            if offers
+            else None
+        )
+        if unit_price is None:
+            unavailable.append(item.productId)
+            continue
+        lines.append(
+            BasketLine(
+                productId=item.productId,
+                quantity=item.quantity,
+                platform=offers[0].platform,
+                link=offers[0].link,
+                unitPrice=round(unit_price, 2),
+                lineTotal=round(unit_price * item.quantity, 2),
+            )
+        )
+    return BasketResponse(
+        currency=currency,
+        total=round(sum(line.lineTotal for line in lines), 2),
+        lines=lines,
+        unavailable=unavailable,
+    )
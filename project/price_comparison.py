@@ -0,0 +1,239 @@
+import json
+import statistics
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import prisma
+import prisma.models
+from project.cache import TTLCache
+from project.config import (
+    CURRENCY_RATES_PATH,
+    PRICE_CACHE_MAX_ENTRIES,
+    PRICE_CACHE_TTL_SECONDS,
+)
+
+
+class RateTable:
+    """
+    Exchange rates relative to a base currency, plus a mapping from user locations (country codes) to
+    their local currency. Loaded from a local JSON file so that no external service is queried per request.
+    """
+
+    def __init__(
+        self, base: str, rates: Dict[str, float], locations: Dict[str, str]
+    ) -> None:
+        self.base = base.upper()
+        self.rates = {currency.upper(): rate for currency, rate in rates.items()}
+        self.locations = {
+            location.upper(): currency.upper()
+            for location, currency in locations.items()
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "RateTable":
+        """
+        Reads a rate table from a JSON file with "base", "rates" and "locations" keys.
+
+        Args:
+            path (str): The path of the JSON file.
+
+        Returns:
+            RateTable: The loaded table.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["base"], data["rates"], data.get("locations", {}))
+
+    def currency_for(
+        self, user_location: Optional[str], default: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Resolves the currency to present prices in for a user location. The location may be a country
+        code from the table or a currency code directly.
+
+        Args:
+            user_location (Optional[str]): The user's location, e.g. "DE" or "EUR".
+            default (Optional[str]): The currency used when the location is unknown.
+
+        Returns:
+            Optional[str]: The currency code, or default.
+        """
+        if not user_location:
+            return default
+        key = user_location.strip().upper()
+        if key in self.locations:
+            return self.locations[key]
+        if key in self.rates:
+            return key
+        return default
+
+    def convert(self, amount: float, source: str, target: str) -> Optional[float]:
+        """
+        Converts an amount between currencies through the base currency.
+
+        Args:
+            amount (float): The amount in the source currency.
+            source (str): The source currency code.
+            target (str): The target currency code.
+
+        Returns:
+            Optional[float]: The converted amount, or None if either currency is not in the table.
+        """
+        source_rate = self.rates.get(source.upper())
+        target_rate = self.rates.get(target.upper())
+        if source_rate is None or target_rate is None:
+            return None
+        return amount / source_rate * target_rate
+
+
+class CurrencyStats(NamedTuple):
+    """
+    Price distribution of a hose's purchase options in one currency.
+    """
+
+    currency: str
+    count: int
+    minPrice: float
+    medianPrice: float
+    maxPrice: float
+
+
+class Offer(NamedTuple):
+    """
+    An available purchase option, with its price normalized to the base currency for ranking.
+    """
+
+    platform: str
+    price: float
+    currency: str
+    link: str
+    basePrice: Optional[float]
+
+
+class HosePrices(NamedTuple):
+    """
+    Precomputed price summary of one hose: per-currency statistics and its available offers ranked
+    from cheapest to most expensive in the base currency. Offers in unknown currencies rank last.
+    """
+
+    hoseId: str
+    stats: List[CurrencyStats]
+    offers: List[Offer]
+
+
+def summarize(
+    hose_id: str, options: Iterable[prisma.models.PurchaseOption], rates: RateTable
+) -> HosePrices:
+    """
+    Builds the price summary of a hose from its purchase options.
+
+    Args:
+        hose_id (str): The hose id.
+        options (Iterable[prisma.models.PurchaseOption]): Every purchase option of the hose.
+        rates (RateTable): The rate table used to normalize prices.
+
+    Returns:
+        HosePrices: The precomputed summary.
+    """
+    by_currency: Dict[str, List[float]] = defaultdict(list)
+    offers: List[Offer] = []
+    for option in options:
+        currency = option.currency.upper()
+        by_currency[currency].append(option.price)
+        if option.available:
+            offers.append(
+                Offer(
+                    platform=option.platform,
+                    price=option.price,
+                    currency=currency,
+                    link=option.link,
+                    basePrice=rates.convert(option.price, currency, rates.base),
+                )
+            )
+    offers.sort(
+        key=lambda offer: (offer.basePrice is None, offer.basePrice or 0.0, offer.price)
+    )
+    stats = [
+        CurrencyStats(
+            currency=currency,
+            count=len(prices),
+            minPrice=min(prices),
+            medianPrice=statistics.median(prices),
+            maxPrice=max(prices),
+        )
+        for currency, prices in sorted(by_currency.items())
+    ]
+    return HosePrices(hoseId=hose_id, stats=stats, offers=offers)
+
+
+class PriceComparisonCache:
+    """
+    Materialized per-hose price summaries. Summaries missing from the cache are computed together from a
+    single PurchaseOption query, so pricing any number of products costs at most one round-trip.
+    """
+
+    def __init__(self, rates: RateTable, max_entries: int, ttl_seconds: float) -> None:
+        self.rates = rates
+        self.summaries: TTLCache[str, HosePrices] = TTLCache(
+            "price_summaries", max_entries, ttl_seconds
+        )
+
+    async def get_many(self, hose_ids: List[str]) -> Dict[str, HosePrices]:
+        """
+        Returns the price summaries of the given hoses, loading missing ones in one query.
+
+        Args:
+            hose_ids (List[str]): The hose ids.
+
+        Returns:
+            Dict[str, HosePrices]: The summaries keyed by hose id. Hoses without purchase options get an
+                empty summary.
+        """
+        found: Dict[str, HosePrices] = {}
+        missing: List[str] = []
+        for hose_id in dict.fromkeys(hose_ids):
+            cached = self.summaries.get(hose_id)
+            if cached is None:
+                missing.append(hose_id)
+            else:
+                found[hose_id] = cached
+        if missing:
+            options = await prisma.models.PurchaseOption.prisma().find_many(
+                where={"hoseId": {"in": missing}}
+            )
+            grouped: Dict[str, List[prisma.models.PurchaseOption]] = defaultdict(list)
+            for option in options:
+                grouped[option.hoseId].append(option)
+            for hose_id in missing:
+                summary = summarize(hose_id, grouped[hose_id], self.rates)
+                self.summaries.set(hose_id, summary)
+                found[hose_id] = summary
+        return found
+
+    async def get(self, hose_id: str) -> HosePrices:
+        """
+        Returns the price summary of one hose.
+
+        Args:
+            hose_id (str): The hose id.
+
+        Returns:
+            HosePrices: The summary.
+        """
+        return (await self.get_many([hose_id]))[hose_id]
+
+    def invalidate(self, hose_id: str) -> None:
+        """
+        Drops the summary of a hose whose purchase options changed.
+
+        Args:
+            hose_id (str): The hose id.
+        """
+        self.summaries.invalidate(hose_id)
+
+
+price_comparison_cache = PriceComparisonCache(
+    RateTable.load(CURRENCY_RATES_PATH),
+    PRICE_CACHE_MAX_ENTRIES,
+    PRICE_CACHE_TTL_SECONDS,
+)
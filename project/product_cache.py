@@ -0,0 +1,117 @@
+from typing import Any, Dict, Optional, Tuple
+
+from project.cache import TTLCache
+from project.config import PRODUCT_CACHE_MAX_ENTRIES, PRODUCT_CACHE_TTL_SECONDS
+
+ProductFilter = Tuple[
+    Optional[float], Optional[float], Optional[float], Optional[float]
+]
+
+
+def normalize_product_filter(
+    hose_diameter_min: Optional[float],
+    hose_diameter_max: Optional[float],
+    hose_length_min: Optional[float],
+    hose_length_max: Optional[float],
+) -> ProductFilter:
+    """
+    Normalizes the /products filter bounds into a hashable cache key, so that e.g. 5 and 5.0 share an entry.
+
+    Args:
+        hose_diameter_min (Optional[float]): Minimum diameter of hose to filter the products.
+        hose_diameter_max (Optional[float]): Maximum diameter of hose to filter the products.
+        hose_length_min (Optional[float]): Minimum length of hose to filter the products.
+        hose_length_max (Optional[float]): Maximum length of hose to filter the products.
+
+    Returns:
+        ProductFilter: The normalized (diameter_min, diameter_max, length_min, length_max) tuple.
+    """
+    return tuple(
+        None if bound is None else float(bound)
+        for bound in (
+            hose_diameter_min,
+            hose_diameter_max,
+            hose_length_min,
+            hose_length_max,
+        )
+    )
+
+
+def filter_contains(key: ProductFilter, length: float, diameter: float) -> bool:
+    """
+    Checks whether a hose with the given dimensions falls inside a /products filter.
+
+    Args:
+        key (ProductFilter): The normalized filter.
+        length (float): The hose length.
+        diameter (float): The hose diameter.
+
+    Returns:
+        bool: True if the hose matches every bound of the filter.
+    """
+    diameter_min, diameter_max, length_min, length_max = key
+    return (
+        (diameter_min is None or diameter >= diameter_min)
+        and (diameter_max is None or diameter <= diameter_max)
+        and (length_min is None or length >= length_min)
+        and (length_max is None or length <= length_max)
+    )
+
+
+class ProductCatalogCache:
+    """
+    Read-through cache for the product catalog. Filtered product lists are keyed by their normalized
+    filter and product details by hose id. Writes invalidate only the entries the changed hose can appear in.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.lists: TTLCache[ProductFilter, Any] = TTLCache(
+            "product_lists", max_entries, ttl_seconds
+        )
+        self.details: TTLCache[str, Any] = TTLCache(
+            "product_details", max_entries, ttl_seconds
+        )
+
+    def invalidate_hose(self, hose_id: str, *dimensions: Tuple[float, float]) -> None:
+        """
+        Drops every cached entry that can contain the given hose.
+
+        Args:
+            hose_id (str): The id of the created, updated or deleted hose.
+            *dimensions (Tuple[float, float]): The (length, diameter) of the hose before and/or after the
+                write. When none are given, every cached list is dropped.
+        """
+        self.details.invalidate(hose_id)
+        if not dimensions:
+            self.lists.clear()
+            return
+        self.lists.invalidate_where(
+            lambda key: any(
+                filter_contains(key, length, diameter)
+                for length, diameter in dimensions
+            )
+        )
+
+    def clear(self) -> None:
+        """
+        Drops every cached list and detail entry.
+        """
+        self.lists.clear()
+        self.details.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the counters of both underlying caches.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The counters, keyed by cache name.
+        """
+        return {
+            self.lists.name: self.lists.stats(),
+            self.details.name: self.details.stats(),
+        }
+
+
+product_catalog_cache = ProductCatalogCache(
+    PRODUCT_CACHE_MAX_ENTRIES, PRODUCT_CACHE_TTL_SECONDS
+)
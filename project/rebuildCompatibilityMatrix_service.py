@@ -0,0 +1,21 @@
+from project.compatibility_matrix import compatibility_matrix
+from pydantic import BaseModel
+
+
+class RebuildCompatibilityMatrixResponse(BaseModel):
+    """
+    Confirms that the compatibility matrix was rebuilt and reports its size.
+    """
+
+    pairs: int
+
+
+async def rebuildCompatibilityMatrix() -> RebuildCompatibilityMatrixResponse:
+    """
+    Rebuilds the in-process compatibility matrix from the full HoseCompatibility log. Intended for administrators after bulk changes made outside the API.
+
+    Returns:
+        RebuildCompatibilityMatrixResponse: Confirms that the compatibility matrix was rebuilt and reports its size.
+    """
+    pairs = await compatibility_matrix.rebuild()
+    return RebuildCompatibilityMatrixResponse(pairs=pairs)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+
+from project.usage_rollup import usage_rollup
+from pydantic import BaseModel
+
+
+class RunUsageRollupResponse(BaseModel):
+    """
+    Reports how many usage logs an on-demand rollup run processed.
+    """
+
+    processed: int
+    buckets: int
+    watermark: Optional[datetime] = None
+
+
+async def runUsageRollup() -> RunUsageRollupResponse:
+    """
+    Rolls up every usage log recorded since the last run into the hourly and daily view counts. Intended for administrators and for deployments that do not run the rollup periodically.
+
+    Returns:
+        RunUsageRollupResponse: Reports how many usage logs an on-demand rollup run processed.
+    """
+    result = await usage_rollup.run()
+    return RunUsageRollupResponse(**result._asdict())
@@ -0,0 +1,140 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import prisma
+import prisma.models
+from project.pagination import decode_rank_cursor, encode_rank_cursor
+from project.search_index import search_index, tokenize
+from pydantic import BaseModel
+
+MAX_LIMIT = 100
+
+SNIPPET_LENGTH = 160
+
+
+class QuestionSearchHit(BaseModel):
+    """
+    A question or answer matching the query, with an excerpt of its content around the first matching term.
+    """
+
+    kind: str
+    id: str
+    questionId: str
+    userId: str
+    createdAt: datetime
+    snippet: str
+    score: float
+
+
+class SearchQuestionsResponse(BaseModel):
+    """
+    One page of questions and answers matching the query, most relevant first. nextCursor continues after the last result's score, so pages fetched while questions and answers are being written are best-effort.
+    """
+
+    query: str
+    results: List[QuestionSearchHit]
+    total: int
+    nextCursor: Optional[str] = None
+
+
+def snippet(content: str, terms: List[str]) -> str:
+    """
+    Cuts an excerpt of SNIPPET_LENGTH characters out of the content, starting shortly before the first
+    occurrence of any query term.
+
+    Args:
+        content (str): The full text.
+        terms (List[str]): The query terms.
+
+    Returns:
+        str: The excerpt, with an ellipsis where the content was cut.
+    """
+    if len(content) <= SNIPPET_LENGTH:
+        return content
+    match = re.search(
+        r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b",
+        content,
+        re.IGNORECASE,
+    )
+    start = 0 if match is None else max(0, match.start() - SNIPPET_LENGTH // 4)
+    start = min(start, len(content) - SNIPPET_LENGTH)
+    excerpt = content[start : start + SNIPPET_LENGTH].strip()
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + SNIPPET_LENGTH < len(content) else ""
+    return f"{prefix}{excerpt}{suffix}"
+
+
+async def searchQuestions(
+    q: str, limit: int = 20, cursor: Optional[str] = None
+) -> SearchQuestionsResponse:
+    """
+    Searches the content of all questions and answers. Matches are ranked by BM25 relevance from the
+    in-process search index, and only the rows on the requested page are read from the database, by id.
+    Hits whose row has been deleted are dropped from the page and from the index.
+
+    The cursor holds the score and key of the last hit of the page. Every indexed write changes the
+    document count, average length and term frequencies BM25 scores with, so a cursor taken before a write
+    can repeat or skip hits near the page boundary: pages are best-effort while the index changes. The
+    index is per worker, so an offset into one worker's ranking would be no steadier.
+
+    Args:
+        q (str): The free-text query. Words are matched case-insensitively; stopwords are ignored.
+        limit (int): The maximum number of results per page, at most 100.
+        cursor (Optional[str]): The nextCursor of the previous page, or None for the first page.
+
+    Returns:
+        SearchQuestionsResponse: One page of questions and answers matching the query, most relevant first.
+
+    Raises:
+        ValueError: Raised if the cursor is malformed.
+
+    Example:
+        await searchQuestions("leaking coupling", limit=10)
+        > SearchQuestionsResponse(query="leaking coupling", results=[QuestionSearchHit(kind="question", ...)], total=42, nextCursor="eyJz...")
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    after = decode_rank_cursor(cursor) if cursor else None
+    terms = tokenize(q)
+    if not terms:
+        return SearchQuestionsResponse(query=q, results=[], total=0)
+    await search_index.ensure_loaded()
+    found = search_index.index.search(q, limit + 1, after)
+    page = found.hits[:limit]
+    ids: Dict[str, List[str]] = {"question": [], "answer": []}
+    for hit in page:
+        ids[hit.document.kind].append(hit.document.id)
+    contents: Dict[str, str] = {}
+    if ids["question"]:
+        for record in await prisma.models.Question.prisma().find_many(
+            where={"id": {"in": ids["question"]}}
+        ):
+            contents[f"question:{record.id}"] = record.content
+    if ids["answer"]:
+        for record in await prisma.models.Answer.prisma().find_many(
+            where={"id": {"in": ids["answer"]}}
+        ):
+            contents[f"answer:{record.id}"] = record.content
+    results = []
+    for hit in page:
+        content = contents.get(hit.key)
+        if content is None:
+            search_index.remove(hit.key)
+            continue
+        results.append(
+            QuestionSearchHit(
+                kind=hit.document.kind,
+                id=hit.document.id,
+                questionId=hit.document.questionId,
+                userId=hit.document.userId,
+                createdAt=hit.document.createdAt,
+                snippet=snippet(content, terms),
+                score=round(hit.score, 6),
+            )
+        )
+    next_cursor = None
+    if len(found.hits) > limit:
+        next_cursor = encode_rank_cursor(page[-1].score, page[-1].key)
+    return SearchQuestionsResponse(
+        query=q, results=results, total=found.total, nextCursor=next_cursor
+    )
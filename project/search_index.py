@@ -0,0 +1,487 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import prisma
+import prisma.models
+from project.config import SEARCH_INDEX_REFRESH_SECONDS
+from project.streaming import iter_batches
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+MIN_TOKEN_LENGTH = 2
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i if in is it its my "
+    "no not of on or so than that the their there this to was what when where which who "
+    "why will with you your".split()
+)
+
+# BM25 term-frequency saturation and document-length normalisation.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+REFRESH_BATCH_SIZE = 1000
+
+# How many seq values behind the newest row seen a refresh starts reading, so that rows whose transaction
+# committed after a row with a higher seq had already been read are still picked up.
+REFRESH_OVERLAP = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lower-cased index terms, dropping single characters and stopwords.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        List[str]: The terms, in order of appearance and with repeats.
+    """
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS
+    ]
+
+
+class IndexedDocument(NamedTuple):
+    """
+    A question or answer as held by the index. The content itself is not kept; results are read back
+    from the database by id.
+    """
+
+    kind: str
+    id: str
+    questionId: str
+    userId: str
+    createdAt: datetime
+    length: int
+    terms: Tuple[str, ...]
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.id}"
+
+
+class SearchHit(NamedTuple):
+    """
+    One ranked match of a query.
+    """
+
+    key: str
+    score: float
+    document: IndexedDocument
+
+
+class SearchResults(NamedTuple):
+    """
+    A page of ranked matches and the number of documents matching the query in total.
+    """
+
+    hits: List[SearchHit]
+    total: int
+
+
+class InvertedIndex:
+    """
+    Maps every term to the documents containing it and how often, and ranks the documents matching a
+    query with BM25. A query only visits the postings of its own terms, never the documents that do not
+    contain them.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._documents: Dict[str, IndexedDocument] = {}
+        self._by_question: Dict[str, Set[str]] = {}
+        self._by_user: Dict[str, Set[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._documents
+
+    @property
+    def terms(self) -> int:
+        return len(self._postings)
+
+    def add(
+        self,
+        kind: str,
+        record_id: str,
+        content: str,
+        question_id: str,
+        user_id: str,
+        created_at: datetime,
+    ) -> IndexedDocument:
+        """
+        Indexes a document, replacing any previous version of it.
+
+        Args:
+            kind (str): "question" or "answer".
+            record_id (str): The id of the Question or Answer row.
+            content (str): The text to index.
+            question_id (str): The question the document belongs to, its own id for a question.
+            user_id (str): The author of the document.
+            created_at (datetime): When the document was written.
+
+        Returns:
+            IndexedDocument: The indexed document.
+        """
+        tokens = tokenize(content)
+        frequencies: Dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        document = IndexedDocument(
+            kind,
+            record_id,
+            question_id,
+            user_id,
+            created_at,
+            len(tokens),
+            tuple(frequencies),
+        )
+        key = document.key
+        self.remove(key)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[key] = frequency
+        self._documents[key] = document
+        self._by_question.setdefault(question_id, set()).add(key)
+        self._by_user.setdefault(user_id, set()).add(key)
+        self._total_length += document.length
+        return document
+
+    def remove(self, key: str) -> None:
+        """
+        Removes a document, if indexed.
+
+        Args:
+            key (str): The document key, e.g. "question:<id>".
+        """
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for term in document.terms:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+        for groups, group in (
+            (self._by_question, document.questionId),
+            (self._by_user, document.userId),
+        ):
+            keys = groups[group]
+            keys.discard(key)
+            if not keys:
+                del groups[group]
+        self._total_length -= document.length
+
+    def remove_question(self, question_id: str) -> None:
+        """
+        Removes a question together with its answers, as the database cascade does.
+
+        Args:
+            question_id (str): The question id.
+        """
+        for key in list(self._by_question.get(question_id, ())):
+            self.remove(key)
+
+    def remove_user(self, user_id: str) -> None:
+        """
+        Removes everything a user wrote, and the answers to their questions, as the database cascade does.
+
+        Args:
+            user_id (str): The user id.
+        """
+        for key in list(self._by_user.get(user_id, ())):
+            document = self._documents.get(key)
+            if document is None:
+                continue
+            if document.kind == "question":
+                self.remove_question(document.id)
+            else:
+                self.remove(key)
+
+    def search(
+        self, query: str, limit: int, after: Optional[Tuple[float, str]] = None
+    ) -> SearchResults:
+        """
+        Ranks the documents matching any term of the query by BM25, highest score first and by key on
+        ties, and returns the best limit of them after a ranked position.
+
+        Args:
+            query (str): The free-text query.
+            limit (int): The maximum number of hits to return.
+            after (Optional[Tuple[float, str]]): The score and key of the last hit of the previous page.
+
+        Returns:
+            SearchResults: The hits and the total number of matching documents.
+        """
+        documents = len(self._documents)
+        if not documents:
+            return SearchResults([], 0)
+        average_length = self._total_length / documents or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            matches = len(postings)
+            idf = math.log(1 + (documents - matches + 0.5) / (matches + 0.5))
+            for key, frequency in postings.items():
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * self._documents[key].length / average_length
+                )
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (BM25_K1 + 1) / (
+                    frequency + norm
+                )
+        ranked = ((-score, key) for key, score in scores.items())
+        if after is not None:
+            position = (-after[0], after[1])
+            ranked = (rank for rank in ranked if rank > position)
+        return SearchResults(
+            [
+                SearchHit(key, -negated, self._documents[key])
+                for negated, key in heapq.nsmallest(limit, ranked)
+            ],
+            len(scores),
+        )
+
+
+class SearchIndex:
+    """
+    Full-text index over the content of every Question and Answer. It is built lazily on first use by
+    streaming both tables, then kept current incrementally: writes made through this process are applied
+    as they happen, and a periodic refresh picks up rows other workers inserted, in the order of the seq
+    the database assigns on insert. Ordering by createdAt would miss rows inserted late with an earlier
+    createdAt, such as buffered inquiries or backdated timestamps. Rows deleted elsewhere are dropped when
+    a search reads a hit back from the database and finds it gone.
+
+    Writes made while the index is being rebuilt are replayed on the new index before it is swapped in.
+    The index is a per-worker structure.
+    """
+
+    def __init__(self) -> None:
+        self.index = InvertedIndex()
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self._pending: Optional[List[Callable[[InvertedIndex], Any]]] = None
+        self._watermarks: Dict[str, Optional[int]] = {
+            "question": None,
+            "answer": None,
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    def _write(self, operation: Callable[[InvertedIndex], Any]) -> None:
+        operation(self.index)
+        if self._pending is not None:
+            self._pending.append(operation)
+
+    def index_question(
+        self, question_id: str, content: str, user_id: str, created_at: datetime
+    ) -> None:
+        """
+        Indexes a created or updated question.
+
+        Args:
+            question_id (str): The question id.
+            content (str): The question text.
+            user_id (str): The author.
+            created_at (datetime): When the question was asked.
+        """
+        self._write(
+            lambda index: index.add(
+                "question", question_id, content, question_id, user_id, created_at
+            )
+        )
+
+    def index_answer(
+        self,
+        answer_id: str,
+        content: str,
+        question_id: str,
+        user_id: str,
+        created_at: datetime,
+    ) -> None:
+        """
+        Indexes a created or updated answer.
+
+        Args:
+            answer_id (str): The answer id.
+            content (str): The answer text.
+            question_id (str): The question answered.
+            user_id (str): The author.
+            created_at (datetime): When the answer was given.
+        """
+        self._write(
+            lambda index: index.add(
+                "answer", answer_id, content, question_id, user_id, created_at
+            )
+        )
+
+    def remove(self, key: str) -> None:
+        """
+        Removes a document whose row no longer exists.
+
+        Args:
+            key (str): The document key, e.g. "answer:<id>".
+        """
+        self._write(lambda index: index.remove(key))
+
+    def remove_user(self, user_id: str) -> None:
+        """
+        Removes everything that was deleted along with a user.
+
+        Args:
+            user_id (str): The deleted user's id.
+        """
+        self._write(lambda index: index.remove_user(user_id))
+
+    @staticmethod
+    def _apply(index: InvertedIndex, kind: str, record: Any) -> int:
+        index.add(
+            kind,
+            record.id,
+            record.content,
+            record.id if kind == "question" else record.questionId,
+            record.userId,
+            record.createdAt,
+        )
+        return record.seq
+
+    @staticmethod
+    def _actions(kind: str) -> Any:
+        if kind == "question":
+            return prisma.models.Question.prisma()
+        return prisma.models.Answer.prisma()
+
+    async def rebuild(self) -> int:
+        """
+        Rebuilds the index from scratch by streaming both tables in batches.
+
+        Returns:
+            int: The number of indexed documents.
+        """
+        async with self._lock:
+            return await self._rebuild()
+
+    async def _rebuild(self) -> int:
+        self._pending = []
+        try:
+            fresh = InvertedIndex()
+            watermarks: Dict[str, Optional[int]] = {}
+            for kind in self._watermarks:
+                newest: Optional[int] = None
+                async for batch in iter_batches(self._actions(kind)):
+                    for record in batch:
+                        seq = self._apply(fresh, kind, record)
+                        newest = max(newest or seq, seq)
+                watermarks[kind] = newest
+            for operation in self._pending:
+                operation(fresh)
+        finally:
+            self._pending = None
+        self.index = fresh
+        self._watermarks = watermarks
+        self.loaded = True
+        return len(fresh)
+
+    async def ensure_loaded(self) -> None:
+        """
+        Builds the index if it has not been built yet. Concurrent first callers share one build.
+        """
+        if self.loaded:
+            return
+        async with self._lock:
+            if not self.loaded:
+                await self._rebuild()
+
+    async def refresh(self) -> int:
+        """
+        Indexes the rows inserted since the newest row seen so far, by any worker. The last REFRESH_OVERLAP
+        seq values before it are read again, and the rows among them not indexed yet are added.
+
+        Returns:
+            int: The number of rows indexed.
+        """
+        indexed = 0
+        async with self._lock:
+            if not self.loaded:
+                return await self._rebuild()
+            for kind, newest in self._watermarks.items():
+                after = max((newest or 0) - REFRESH_OVERLAP, 0)
+                while True:
+                    records = await self._actions(kind).find_many(
+                        where={"seq": {"gt": after}},
+                        order={"seq": "asc"},
+                        take=REFRESH_BATCH_SIZE,
+                    )
+                    for record in records:
+                        if f"{kind}:{record.id}" not in self.index:
+                            self._apply(self.index, kind, record)
+                            indexed += 1
+                        after = record.seq
+                    if len(records) < REFRESH_BATCH_SIZE:
+                        break
+                self._watermarks[kind] = max(newest or 0, after) or None
+        return indexed
+
+    async def _run_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Search index refresh failed")
+
+    def start(self, interval: float) -> None:
+        """
+        Starts refreshing the index in the background every interval seconds.
+
+        Args:
+            interval (float): Seconds between refreshes.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run_periodically(interval), name="search-index-refresh"
+            )
+
+    async def stop(self) -> None:
+        """
+        Cancels the background task, if any.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the size of the index.
+
+        Returns:
+            Dict[str, float]: The number of documents and distinct terms.
+        """
+        return {"documents": len(self.index), "terms": self.index.terms}
+
+
+search_index = SearchIndex()
+
+
+def start_search_index_refresh() -> None:
+    """
+    Starts the periodic refresh if SEARCH_INDEX_REFRESH_SECONDS is positive.
+    """
+    if SEARCH_INDEX_REFRESH_SECONDS > 0:
+        search_index.start(SEARCH_INDEX_REFRESH_SECONDS)
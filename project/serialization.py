@@ -0,0 +1,17 @@
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered in one pass by pydantic's compiled serializer, which accepts plain dicts and
+    lists as well as models. Returning it from an endpoint bypasses FastAPI's response_model handling, so
+    list endpoints can build their payload as dicts straight from typed Prisma records instead of creating
+    a validated response model per row that FastAPI then serializes again. The route's response_model
+    still documents the payload in the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -5,8 +7,10 @@ from typing import List, Optional
 
 import prisma
 import prisma.enums
+import project.checkCompatibility_service
 import project.createCompatibility_service
 import project.createMeasurement_service
+import project.createMeasurementsBatch_service
 import project.createProduct_service
 import project.createTip_service
 import project.createUser_service
@@ -15,48 +19,192 @@ import project.deleteMeasurement_service
 import project.deleteProduct_service
 import project.deleteTip_service
 import project.deleteUser_service
+import project.exportCatalog_service
 import project.fetchCompatibilities_service
+import project.findNearestProducts_service
 import project.getCompatibility_service
 import project.getMeasurement_service
+import project.getMeasurementStats_service
 import project.getProductDetails_service
+import project.getProductPrices_service
 import project.getPurchasePlatforms_service
 import project.getTip_service
+import project.getUsageAnalytics_service
 import project.getUserDetails_service
+import project.getUserTimeline_service
+import project.importCatalog_service
+import project.listHoseAttachments_service
 import project.listMeasurements_service
 import project.listProducts_service
 import project.listTips_service
 import project.listUsers_service
 import project.logUserInquiry_service
+import project.password_hashing
+import project.price_comparison
+import project.priceBasket_service
+import project.product_cache
+import project.rebuildCompatibilityMatrix_service
+import project.runUsageRollup_service
+import project.searchQuestions_service
 import project.updateCompatibility_service
 import project.updateMeasurement_service
 import project.updateProduct_service
 import project.updateTip_service
 import project.updateUser_service
-from fastapi import FastAPI
+from fastapi import FastAPI, Query, Request
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import Response
-from prisma import Prisma
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from prisma import Batch, Prisma
+from project.batch_loader import hose_loader, user_loader
+from project.compatibility_matrix import (
+    compatibility_matrix,
+    start_compatibility_matrix_refresh,
+)
+from project.config import (
+    DB_READINESS_TIMEOUT_SECONDS,
+    DB_WARMUP_ENABLED,
+    HOSE_INDEX_ENABLED,
+)
+from project.database import database
+from project.hose_index import hose_index, start_hose_index_refresh
+from project.http_cache import (
+    check_table_versions,
+    is_not_modified,
+    not_modified,
+    table_validators,
+    validator_headers,
+)
+from project.import_hooks import module_loaded
+from project.lazy_routes import ServiceRoute
+from project.metrics import MetricsMiddleware, install_prisma_query_hook, registry
+from project.search_index import search_index, start_search_index_refresh
+from project.serialization import FastJSONResponse
+from project.streaming import (
+    NDJSON_MEDIA_TYPE,
+    ndjson_response,
+    parse_json_rows,
+    wants_ndjson,
+)
+from project.tip_store import start_tip_store_refresh, tip_store
+from project.usage_rollup import start_usage_rollup, usage_rollup
 
 logger = logging.getLogger(__name__)
 
-db_client = Prisma(auto_register=True)
+install_prisma_query_hook(Prisma, Batch)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await db_client.connect()
+    await database.connect(DB_WARMUP_ENABLED)
+    await check_table_versions()
+    if HOSE_INDEX_ENABLED:
+        await hose_index.refresh()
+    project.logUserInquiry_service.inquiry_buffer.start()
+    start_usage_rollup()
+    await tip_store.load()
+    start_tip_store_refresh()
+    start_hose_index_refresh()
+    start_compatibility_matrix_refresh()
+    start_search_index_refresh()
     yield
-    await db_client.disconnect()
+    await search_index.stop()
+    await tip_store.stop()
+    await hose_index.stop()
+    await compatibility_matrix.stop()
+    await usage_rollup.stop()
+    await project.logUserInquiry_service.inquiry_buffer.stop()
+    await database.disconnect()
+    if module_loaded("project.password_hashing"):
+        project.password_hashing.password_hasher.shutdown()
 
 
 app = FastAPI(
     title="hose", lifespan=lifespan, description="a really weird length of hose?"
 )
+app.router.route_class = ServiceRoute
+
+app.add_middleware(MetricsMiddleware)
+
+
+def collect_cache_gauges() -> dict:
+    """
+    Exposes the in-process cache, password hashing pool, write-behind buffer, search index, request coalescing and batch loader counters as gauges on /metrics. Subsystems that LAZY_ROUTES has not loaded yet are left out rather than loaded by the scrape.
+    """
+    gauges = {}
+    caches = []
+    if module_loaded("project.product_cache"):
+        product_catalog_cache = project.product_cache.product_catalog_cache
+        caches += [product_catalog_cache.lists, product_catalog_cache.details]
+    if module_loaded("project.price_comparison"):
+        caches.append(project.price_comparison.price_comparison_cache.summaries)
+    for cache in caches:
+        for stat, value in cache.stats().items():
+            gauges.setdefault(f"hose_cache_{stat}", {})[
+                (("cache", cache.name),)
+            ] = value
+    if module_loaded("project.password_hashing"):
+        for stat, value in project.password_hashing.password_hasher.stats().items():
+            gauges[f"hose_password_hash_{stat}"] = {(): value}
+    inquiry_buffer = project.logUserInquiry_service.inquiry_buffer
+    for stat, value in inquiry_buffer.stats().items():
+        gauges.setdefault(f"hose_write_behind_{stat}", {})[
+            (("buffer", inquiry_buffer.name),)
+        ] = value
+    for stat, value in search_index.stats().items():
+        gauges[f"hose_search_index_{stat}"] = {(): value}
+    flights = []
+    if module_loaded("project.getProductDetails_service"):
+        flights.append(project.getProductDetails_service.product_details_flight)
+    if module_loaded("project.getUserDetails_service"):
+        flights.append(project.getUserDetails_service.user_details_flight)
+    for flight in flights:
+        for stat, value in flight.stats().items():
+            gauges.setdefault(f"hose_single_flight_{stat}", {})[
+                (("flight", flight.name),)
+            ] = value
+    for loader in (user_loader, hose_loader):
+        for stat, value in loader.stats().items():
+            gauges.setdefault(f"hose_batch_loader_{stat}", {})[
+                (("loader", loader.name),)
+            ] = value
+    return gauges
+
+
+registry.register_collector(collect_cache_gauges)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def api_get_metrics() -> Response:
+    """
+    Exposes per-route latency histograms, database query and row counts, response sizes and cache counters in the Prometheus text format.
+    """
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health/ready", include_in_schema=False)
+async def api_get_readiness() -> Response:
+    """
+    Reports whether the database pool is connected, warmed up and answering queries. Responds with 503 until it is, so load balancers only route traffic to ready workers.
+    """
+    status = await database.readiness(DB_READINESS_TIMEOUT_SECONDS)
+    return JSONResponse(content=status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/cache/stats")
+async def api_get_cacheStats() -> dict:
+    """
+    Reports hit, miss, eviction and invalidation counters of the in-process caches.
+    """
+    summaries = project.price_comparison.price_comparison_cache.summaries
+    return {
+        **project.product_cache.product_catalog_cache.stats(),
+        summaries.name: summaries.stats(),
+    }
 
 
 @app.delete(
     "/measurements/{measurementId}",
-    response_model=project.deleteMeasurement_service.DeleteMeasurementResponse,
+    response_model="project.deleteMeasurement_service.DeleteMeasurementResponse",
 )
 async def api_delete_deleteMeasurement(
     measurementId: str,
@@ -78,7 +226,9 @@ async def api_delete_deleteMeasurement(
         )
 
 
-@app.delete("/tips/{tipId}", response_model=project.deleteTip_service.DeleteTipResponse)
+@app.delete(
+    "/tips/{tipId}", response_model="project.deleteTip_service.DeleteTipResponse"
+)
 async def api_delete_deleteTip(
     tipId: str,
 ) -> project.deleteTip_service.DeleteTipResponse | Response:
@@ -99,8 +249,33 @@ async def api_delete_deleteTip(
         )
 
 
+@app.get(
+    "/questions/search",
+    response_model="project.searchQuestions_service.SearchQuestionsResponse",
+)
+async def api_get_searchQuestions(
+    q: str, limit: int = 20, cursor: Optional[str] = None
+) -> project.searchQuestions_service.SearchQuestionsResponse | Response:
+    """
+    Full-text search over the content of all questions and answers. Results are ranked by relevance and paginated with the opaque nextCursor of the previous page; each carries an excerpt of the matching text. Pages are best-effort: questions and answers written between two page requests change the scores, so a later page can repeat or skip a result near its boundary.
+    """
+    try:
+        res = await project.searchQuestions_service.searchQuestions(q, limit, cursor)
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
 @app.post(
-    "/user-inquiries", response_model=project.logUserInquiry_service.UserInquiryResponse
+    "/user-inquiries",
+    response_model="project.logUserInquiry_service.UserInquiryResponse",
 )
 async def api_post_logUserInquiry(
     userId: str, inquiryDetails: str, timestamp: Optional[datetime]
@@ -126,7 +301,7 @@ async def api_post_logUserInquiry(
 
 @app.delete(
     "/products/{productId}",
-    response_model=project.deleteProduct_service.DeleteProductResponse,
+    response_model="project.deleteProduct_service.DeleteProductResponse",
 )
 async def api_delete_deleteProduct(
     productId: str,
@@ -150,7 +325,7 @@ async def api_delete_deleteProduct(
 
 @app.put(
     "/products/{productId}",
-    response_model=project.updateProduct_service.ProductUpdateResponse,
+    response_model="project.updateProduct_service.ProductUpdateResponse",
 )
 async def api_put_updateProduct(
     productId: str, productDetails: project.updateProduct_service.ProductDetails
@@ -174,9 +349,87 @@ async def api_put_updateProduct(
         )
 
 
+@app.get(
+    "/compatibilities/check",
+    response_model="project.checkCompatibility_service.CompatibilityCheckResponse",
+)
+async def api_get_checkCompatibility(
+    hoseId: str,
+    attachment: str,
+) -> project.checkCompatibility_service.CompatibilityCheckResponse | Response:
+    """
+    Answers whether a hose is compatible with an attachment using the latest recorded check for the pair. Served from the in-process compatibility matrix without scanning the compatibility log.
+    """
+    try:
+        res = await project.checkCompatibility_service.checkCompatibility(
+            hoseId, attachment
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.post(
+    "/compatibilities/matrix:rebuild",
+    response_model="project.rebuildCompatibilityMatrix_service.RebuildCompatibilityMatrixResponse",
+)
+async def api_post_rebuildCompatibilityMatrix() -> (
+    project.rebuildCompatibilityMatrix_service.RebuildCompatibilityMatrixResponse
+    | Response
+):
+    """
+    Rebuilds the in-process compatibility matrix from the full compatibility log. Intended for administrators after bulk changes made outside the API.
+    """
+    try:
+        res = (
+            await project.rebuildCompatibilityMatrix_service.rebuildCompatibilityMatrix()
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get(
+    "/products/{productId}/attachments",
+    response_model="project.listHoseAttachments_service.HoseAttachmentsResponse",
+)
+async def api_get_listHoseAttachments(
+    productId: str,
+) -> project.listHoseAttachments_service.HoseAttachmentsResponse | Response:
+    """
+    Lists every attachment that has been checked against a hose, with the latest compatibility verdict for each. Served from the in-process compatibility matrix.
+    """
+    try:
+        res = await project.listHoseAttachments_service.listHoseAttachments(productId)
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
 @app.get(
     "/compatibilities/{compatibilityId}",
-    response_model=project.getCompatibility_service.CompatibilityResponse,
+    response_model="project.getCompatibility_service.CompatibilityResponse",
 )
 async def api_get_getCompatibility(
     compatibilityId: str,
@@ -200,7 +453,7 @@ async def api_get_getCompatibility(
 
 @app.post(
     "/compatibilities",
-    response_model=project.createCompatibility_service.CompatibilityCreationResponse,
+    response_model="project.createCompatibility_service.CompatibilityCreationResponse",
 )
 async def api_post_createCompatibility(
     hoseId: str, userId: str, compatible: bool, attachment: str
@@ -226,17 +479,30 @@ async def api_post_createCompatibility(
 
 @app.get(
     "/measurements",
-    response_model=project.listMeasurements_service.GetMeasurementsResponse,
+    response_model="project.listMeasurements_service.GetMeasurementsResponse",
 )
 async def api_get_listMeasurements(
     request: project.listMeasurements_service.GetMeasurementsRequest,
+    http_request: Request,
+    stream: bool = False,
 ) -> project.listMeasurements_service.GetMeasurementsResponse | Response:
     """
-    Retrieves a list of all hose measurements. This route queries the Database Module to fetch all measurement records and displays them, typically used in reporting or dashboard features. Returns an array of measurements.
+    Retrieves a list of all hose measurements. This route queries the Database Module to fetch all measurement records and displays them, typically used in reporting or dashboard features. Returns an array of measurements, or streams them as NDJSON when requested via ?stream=1 or an application/x-ndjson Accept header. Responses carry an ETag derived from the write versions of the tables they are built from; a request whose If-None-Match matches gets an empty 304 before any rows are read.
     """
     try:
+        validators = await table_validators("HoseMeasurement")
+        ndjson = wants_ndjson(http_request, stream)
+        if ndjson:
+            validators = validators.variant(NDJSON_MEDIA_TYPE)
+        if is_not_modified(http_request, validators):
+            return not_modified(validators)
+        if ndjson:
+            return ndjson_response(
+                project.listMeasurements_service.streamMeasurements(),
+                headers=validator_headers(validators),
+            )
         res = await project.listMeasurements_service.listMeasurements(request)
-        return res
+        return FastJSONResponse(res, headers=validator_headers(validators))
     except Exception as e:
         logger.exception("Error processing request")
         res = dict()
@@ -250,7 +516,7 @@ async def api_get_listMeasurements(
 
 @app.put(
     "/measurements/{measurementId}",
-    response_model=project.updateMeasurement_service.UpdateMeasurementResponse,
+    response_model="project.updateMeasurement_service.UpdateMeasurementResponse",
 )
 async def api_put_updateMeasurement(
     measurementId: str, length: float, diameter: float
@@ -274,7 +540,7 @@ async def api_put_updateMeasurement(
         )
 
 
-@app.post("/users", response_model=project.createUser_service.CreateUserResponseModel)
+@app.post("/users", response_model="project.createUser_service.CreateUserResponseModel")
 async def api_post_createUser(
     email: str, password: str, role: prisma.enums.UserRole
 ) -> project.createUser_service.CreateUserResponseModel | Response:
@@ -297,7 +563,7 @@ async def api_post_createUser(
 
 @app.put(
     "/compatibilities/{compatibilityId}",
-    response_model=project.updateCompatibility_service.UpdateCompatibilityResponse,
+    response_model="project.updateCompatibility_service.UpdateCompatibilityResponse",
 )
 async def api_put_updateCompatibility(
     compatibilityId: str,
@@ -324,7 +590,7 @@ async def api_put_updateCompatibility(
         )
 
 
-@app.put("/tips/{tipId}", response_model=project.updateTip_service.UpdateTipResponse)
+@app.put("/tips/{tipId}", response_model="project.updateTip_service.UpdateTipResponse")
 async def api_put_updateTip(
     tipId: str, tipTitle: str, tipContent: str, applicableProducts: List[str]
 ) -> project.updateTip_service.UpdateTipResponse | Response:
@@ -349,7 +615,7 @@ async def api_put_updateTip(
 
 @app.post(
     "/measurements",
-    response_model=project.createMeasurement_service.MeasurementCreationResponse,
+    response_model="project.createMeasurement_service.MeasurementCreationResponse",
 )
 async def api_post_createMeasurement(
     hoseId: str, length: float, diameter: float, userId: str
@@ -373,8 +639,37 @@ async def api_post_createMeasurement(
         )
 
 
+@app.post(
+    "/measurements:batch",
+    response_model="project.createMeasurementsBatch_service.MeasurementBatchResponse",
+)
+async def api_post_createMeasurementsBatch(
+    http_request: Request,
+) -> project.createMeasurementsBatch_service.MeasurementBatchResponse | Response:
+    """
+    Creates many measurement records at once from a JSON array or an application/x-ndjson body. Referenced users and hoses are validated in bulk and rows are inserted in chunks. The response reports the outcome of every item by its position in the body.
+    """
+    try:
+        rows = parse_json_rows(
+            await http_request.body(), http_request.headers.get("content-type", "")
+        )
+        res = await project.createMeasurementsBatch_service.createMeasurementsBatch(
+            rows
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
 @app.delete(
-    "/users/{userId}", response_model=project.deleteUser_service.DeleteUserResponse
+    "/users/{userId}", response_model="project.deleteUser_service.DeleteUserResponse"
 )
 async def api_delete_deleteUser(
     userId: str,
@@ -398,7 +693,7 @@ async def api_delete_deleteUser(
 
 @app.get(
     "/purchase-platforms",
-    response_model=project.getPurchasePlatforms_service.GetPurchasePlatformsResponse,
+    response_model="project.getPurchasePlatforms_service.GetPurchasePlatformsResponse",
 )
 async def api_get_getPurchasePlatforms(
     product_id: str, user_location: Optional[str]
@@ -422,16 +717,126 @@ async def api_get_getPurchasePlatforms(
         )
 
 
-@app.get("/tips", response_model=project.listTips_service.GetTipsResponse)
+@app.get(
+    "/products/{productId}/prices",
+    response_model="project.getProductPrices_service.ProductPricesResponse",
+)
+async def api_get_getProductPrices(
+    productId: str,
+    user_location: Optional[str] = None,
+) -> project.getProductPrices_service.ProductPricesResponse | Response:
+    """
+    Returns the price comparison summary of a product: minimum, median and maximum price per currency and the cheapest available offer, optionally converted to the user's local currency. Served from the materialized price cache.
+    """
+    try:
+        res = await project.getProductPrices_service.getProductPrices(
+            productId, user_location
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.post(
+    "/purchase-platforms/basket",
+    response_model="project.priceBasket_service.BasketResponse",
+)
+async def api_post_priceBasket(
+    request: project.priceBasket_service.BasketRequest,
+) -> project.priceBasket_service.BasketResponse | Response:
+    """
+    Prices a basket of products in one call by picking the cheapest available offer of each product and converting it to the basket currency. Products without an available offer are reported separately.
+    """
+    try:
+        res = await project.priceBasket_service.priceBasket(request)
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get(
+    "/analytics/usage",
+    response_model="project.getUsageAnalytics_service.UsageAnalyticsResponse",
+)
+async def api_get_getUsageAnalytics(
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    hoseId: Optional[str] = None,
+    top: int = 10,
+) -> project.getUsageAnalytics_service.UsageAnalyticsResponse | Response:
+    """
+    Returns the most viewed hoses and a time series of views per hour or day within a window, answered from the usage rollup tables instead of the raw usage logs.
+    """
+    try:
+        res = await project.getUsageAnalytics_service.getUsageAnalytics(
+            granularity, start, end, hoseId, top
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.post(
+    "/analytics/usage:rollup",
+    response_model="project.runUsageRollup_service.RunUsageRollupResponse",
+)
+async def api_post_runUsageRollup() -> (
+    project.runUsageRollup_service.RunUsageRollupResponse | Response
+):
+    """
+    Rolls up the usage logs recorded since the last run into hourly and daily view counts. Intended for administrators and for deployments that do not run the rollup periodically.
+    """
+    try:
+        res = await project.runUsageRollup_service.runUsageRollup()
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get("/tips", response_model="project.listTips_service.GetTipsResponse")
 async def api_get_listTips(
     request: project.listTips_service.GetTipsRequest,
+    http_request: Request,
+    hoseId: Optional[str] = None,
 ) -> project.listTips_service.GetTipsResponse | Response:
     """
-    This route retrieves a list of all care tips from the Database Module. It returns an array of tips, each object containing tip details. The route can be accessed by anyone, including guests, as it's public.
+    This route retrieves a list of all care tips from the in-memory tip store, optionally only those that apply to one hose. It returns an array of tips, each object containing tip details, tagged with an ETag; a request whose If-None-Match matches gets an empty 304. The route can be accessed by anyone, including guests, as it's public.
     """
     try:
-        res = await project.listTips_service.listTips(request)
-        return res
+        snapshot = await tip_store.current()
+        if is_not_modified(http_request, snapshot.validators):
+            return not_modified(snapshot.validators)
+        res = await project.listTips_service.listTips(request, hoseId)
+        return FastJSONResponse(res, headers=validator_headers(snapshot.validators))
     except Exception as e:
         logger.exception("Error processing request")
         res = dict()
@@ -443,16 +848,20 @@ async def api_get_listTips(
         )
 
 
-@app.get("/tips/{tipId}", response_model=project.getTip_service.TipDetailsResponse)
+@app.get("/tips/{tipId}", response_model="project.getTip_service.TipDetailsResponse")
 async def api_get_getTip(
     tipId: str,
+    http_request: Request,
 ) -> project.getTip_service.TipDetailsResponse | Response:
     """
-    Fetches detailed information about a specific care tip identified by tipId. This endpoint extracts the tip details from the Database Module and is accessible by standard users and administrators, ensuring guests cannot access specific care tip details.
+    Fetches detailed information about a specific care tip identified by tipId. This endpoint reads the tip from the in-memory tip store, tags it with an ETag that changes whenever the tip is updated, and answers a matching If-None-Match with an empty 304. It is accessible by standard users and administrators, ensuring guests cannot access specific care tip details.
     """
     try:
+        tip = (await tip_store.current()).by_id.get(tipId)
+        if tip is not None and is_not_modified(http_request, tip.validators):
+            return not_modified(tip.validators)
         res = await project.getTip_service.getTip(tipId)
-        return res
+        return FastJSONResponse(res, headers=validator_headers(tip.validators))
     except Exception as e:
         logger.exception("Error processing request")
         res = dict()
@@ -464,19 +873,128 @@ async def api_get_getTip(
         )
 
 
-@app.get("/products", response_model=project.listProducts_service.ProductsListResponse)
+@app.get(
+    "/products", response_model="project.listProducts_service.ProductsListResponse"
+)
 async def api_get_listProducts(
     hose_diameter_min: Optional[float],
     hose_diameter_max: Optional[float],
     hose_length_min: Optional[float],
     hose_length_max: Optional[float],
+    http_request: Request,
+    stream: bool = False,
 ) -> project.listProducts_service.ProductsListResponse | Response:
     """
-    Retrieves a list of all products, focusing primarily on the available hoses. Useful for both users and administrators for browsing products.
+    Retrieves a list of all products, focusing primarily on the available hoses. Useful for both users and administrators for browsing products. Streams the products as NDJSON when requested via ?stream=1 or an application/x-ndjson Accept header. Responses carry an ETag derived from the write versions of the tables they are built from; a request whose If-None-Match matches gets an empty 304 before any rows are read.
     """
     try:
+        validators = await table_validators("Hose", "PurchaseOption")
+        ndjson = wants_ndjson(http_request, stream)
+        if ndjson:
+            validators = validators.variant(NDJSON_MEDIA_TYPE)
+        if is_not_modified(http_request, validators):
+            return not_modified(validators)
+        if ndjson:
+            return ndjson_response(
+                project.listProducts_service.streamProducts(
+                    hose_diameter_min,
+                    hose_diameter_max,
+                    hose_length_min,
+                    hose_length_max,
+                ),
+                headers=validator_headers(validators),
+            )
         res = await project.listProducts_service.listProducts(
-            hose_diameter_min, hose_diameter_max, hose_length_min, hose_length_max
+            hose_diameter_min,
+            hose_diameter_max,
+            hose_length_min,
+            hose_length_max,
+            validators.etag,
+        )
+        return FastJSONResponse(res, headers=validator_headers(validators))
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.post(
+    "/products:import",
+    response_model="project.importCatalog_service.CatalogImportProgress",
+)
+async def api_post_importCatalog(
+    http_request: Request,
+    stream: bool = False,
+) -> project.importCatalog_service.CatalogImportProgress | Response:
+    """
+    Imports a product catalog of hoses and purchase options from a text/csv or application/x-ndjson body while it is being uploaded. Rows are validated and upserted in chunks, one transaction per chunk. Streams a progress line after every chunk when requested via ?stream=1 or an application/x-ndjson Accept header, otherwise returns the final totals.
+    """
+    try:
+        content_type = http_request.headers.get("content-type", "")
+        if wants_ndjson(http_request, stream):
+            progress = project.importCatalog_service.streamCatalogImport(
+                http_request.stream(), content_type
+            )
+            return ndjson_response(progress)
+        res = await project.importCatalog_service.importCatalog(
+            http_request.stream(), content_type
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get("/products:export")
+async def api_get_exportCatalog(http_request: Request, format: str = "csv") -> Response:
+    """
+    Streams the whole product catalog as CSV or NDJSON, one row per purchase option, in the format accepted by POST /products:import. Tagged with an ETag of the catalog tables; a matching If-None-Match gets an empty 304.
+    """
+    try:
+        chunks = project.exportCatalog_service.exportCatalog(format)
+        validators = (await table_validators("Hose", "PurchaseOption")).variant(format)
+        if is_not_modified(http_request, validators):
+            return not_modified(validators)
+        return StreamingResponse(
+            chunks,
+            headers=validator_headers(validators),
+            media_type=project.exportCatalog_service.CATALOG_FORMATS[format],
+        )
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get(
+    "/measurements/stats",
+    response_model="project.getMeasurementStats_service.MeasurementStatsResponse",
+)
+async def api_get_getMeasurementStats(
+    hoseId: Optional[str] = None, days: int = 30, outlierZ: float = 3.0
+) -> project.getMeasurementStats_service.MeasurementStatsResponse | Response:
+    """
+    Returns the count, mean, standard deviation, percentiles and range of the measured hose lengths and diameters, the hoses whose dimensions are outliers, and the daily mean dimensions of the hoses measured each day, optionally with the statistics of one hose. Computed from per-hose aggregates cached in the service rather than by returning the measurement rows.
+    """
+    try:
+        res = await project.getMeasurementStats_service.getMeasurementStats(
+            hoseId, days, outlierZ
         )
         return res
     except Exception as e:
@@ -492,7 +1010,7 @@ async def api_get_listProducts(
 
 @app.get(
     "/measurements/{measurementId}",
-    response_model=project.getMeasurement_service.MeasurementDetailsResponse,
+    response_model="project.getMeasurement_service.MeasurementDetailsResponse",
 )
 async def api_get_getMeasurement(
     measurementId: str,
@@ -516,7 +1034,7 @@ async def api_get_getMeasurement(
 
 @app.delete(
     "/compatibilities/{compatibilityId}",
-    response_model=project.deleteCompatibility_service.DeleteCompatibilityResponse,
+    response_model="project.deleteCompatibility_service.DeleteCompatibilityResponse",
 )
 async def api_delete_deleteCompatibility(
     compatibilityId: str,
@@ -540,7 +1058,9 @@ async def api_delete_deleteCompatibility(
         )
 
 
-@app.post("/products", response_model=project.createProduct_service.CreateHoseResponse)
+@app.post(
+    "/products", response_model="project.createProduct_service.CreateHoseResponse"
+)
 async def api_post_createProduct(
     length: float, diameter: float, features: List[str]
 ) -> project.createProduct_service.CreateHoseResponse | Response:
@@ -563,18 +1083,47 @@ async def api_post_createProduct(
         )
 
 
+@app.get(
+    "/products/nearest",
+    response_model="project.findNearestProducts_service.NearestProductsResponse",
+)
+async def api_get_findNearestProducts(
+    length: float, diameter: float, limit: int = 10
+) -> project.findNearestProducts_service.NearestProductsResponse | Response:
+    """
+    Finds the hoses closest in size to the given length and diameter, nearest first. Answered from the in-process hose index rather than a table scan.
+    """
+    try:
+        res = await project.findNearestProducts_service.findNearestProducts(
+            length, diameter, limit
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
 @app.get(
     "/products/{productId}",
-    response_model=project.getProductDetails_service.ProductDetailsResponse,
+    response_model="project.getProductDetails_service.ProductDetailsResponse",
 )
 async def api_get_getProductDetails(
     productId: str,
+    expand: List[str] = Query(default=[]),
 ) -> project.getProductDetails_service.ProductDetailsResponse | Response:
     """
-    Provides detailed information about specific products identified by their unique product ID. This will aid in specific compatibility checks and feature information.
+    Provides detailed information about specific products identified by their unique product ID. This will aid in specific compatibility checks and feature information. Only the most recent rows of each relation are embedded, with totals and aggregate statistics; relations named in expand are returned in full.
     """
     try:
-        res = await project.getProductDetails_service.getProductDetails(productId)
+        res = await project.getProductDetails_service.getProductDetails(
+            productId, expand
+        )
         return res
     except Exception as e:
         logger.exception("Error processing request")
@@ -588,7 +1137,8 @@ async def api_get_getProductDetails(
 
 
 @app.get(
-    "/users/{userId}", response_model=project.getUserDetails_service.UserDetailsResponse
+    "/users/{userId}",
+    response_model="project.getUserDetails_service.UserDetailsResponse",
 )
 async def api_get_getUserDetails(
     userId: str,
@@ -612,17 +1162,30 @@ async def api_get_getUserDetails(
 
 @app.get(
     "/compatibilities",
-    response_model=project.fetchCompatibilities_service.GetCompatibilitiesResponse,
+    response_model="project.fetchCompatibilities_service.GetCompatibilitiesResponse",
 )
 async def api_get_fetchCompatibilities(
     request: project.fetchCompatibilities_service.GetCompatibilitiesRequest,
+    http_request: Request,
+    stream: bool = False,
 ) -> project.fetchCompatibilities_service.GetCompatibilitiesResponse | Response:
     """
-    Retrieves all compatibility entries from the database. It queries the Database Module for a list of all existing compatibility rules. The response includes an array of compatibility data.
+    Retrieves all compatibility entries from the database. It queries the Database Module for a list of all existing compatibility rules. The response includes an array of compatibility data, or streams it as NDJSON when requested via ?stream=1 or an application/x-ndjson Accept header. Responses carry an ETag derived from the write versions of the tables they are built from; a request whose If-None-Match matches gets an empty 304 before any rows are read.
     """
     try:
+        validators = await table_validators("HoseCompatibility")
+        ndjson = wants_ndjson(http_request, stream)
+        if ndjson:
+            validators = validators.variant(NDJSON_MEDIA_TYPE)
+        if is_not_modified(http_request, validators):
+            return not_modified(validators)
+        if ndjson:
+            return ndjson_response(
+                project.fetchCompatibilities_service.streamCompatibilities(),
+                headers=validator_headers(validators),
+            )
         res = await project.fetchCompatibilities_service.fetchCompatibilities(request)
-        return res
+        return FastJSONResponse(res, headers=validator_headers(validators))
     except Exception as e:
         logger.exception("Error processing request")
         res = dict()
@@ -634,16 +1197,19 @@ async def api_get_fetchCompatibilities(
         )
 
 
-@app.post("/tips", response_model=project.createTip_service.TipResponseModel)
+@app.post("/tips", response_model="project.createTip_service.TipResponseModel")
 async def api_post_createTip(
-    description: str, hoseTypeId: str, additionalTips: List[str]
+    description: str,
+    hoseTypeId: str,
+    additionalTips: List[str],
+    title: Optional[str] = None,
 ) -> project.createTip_service.TipResponseModel | Response:
     """
     This route allows administrators to create a new care tip. It accepts a JSON body with tip details, stores it in the Database Module, and returns the created tip object with a 201 response code.
     """
     try:
         res = await project.createTip_service.createTip(
-            description, hoseTypeId, additionalTips
+            description, hoseTypeId, additionalTips, title
         )
         return res
     except Exception as e:
@@ -657,16 +1223,67 @@ async def api_post_createTip(
         )
 
 
-@app.get("/users", response_model=project.listUsers_service.GetUsersResponse)
+@app.get(
+    "/users/{userId}/timeline",
+    response_model="project.getUserTimeline_service.UserTimelineResponse",
+)
+async def api_get_getUserTimeline(
+    userId: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    kinds: List[str] = Query(default=[]),
+) -> project.getUserTimeline_service.UserTimelineResponse | Response:
+    """
+    Lists a user's measurements, compatibility checks, product views, questions and answers as one stream, newest first, one page at a time. Pass the nextCursor of a page to get the entries before it; kinds restricts the stream to some of the relations.
+    """
+    try:
+        res = await project.getUserTimeline_service.getUserTimeline(
+            userId, limit, cursor, kinds
+        )
+        return res
+    except Exception as e:
+        logger.exception("Error processing request")
+        res = dict()
+        res["error"] = str(e)
+        return Response(
+            content=jsonable_encoder(res),
+            status_code=500,
+            media_type="application/json",
+        )
+
+
+@app.get("/users", response_model="project.listUsers_service.GetUsersResponse")
 async def api_get_listUsers(
-    request: project.listUsers_service.GetUsersRequest,
+    http_request: Request,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include: List[str] = Query(default=[]),
+    relation_limit: int = 20,
+    stream: bool = False,
 ) -> project.listUsers_service.GetUsersResponse | Response:
     """
-    Retrieves a list of all users, returning an array of user data. Useful for admins to oversee user base.
+    Retrieves a page of users, returning an array of user data and the cursor of the next page. Related records are only loaded for the relations named in include. Streams all users as NDJSON when requested via ?stream=1 or an application/x-ndjson Accept header. Useful for admins to oversee user base. Responses carry an ETag derived from the write versions of the tables they are built from, unless the usage logs are included; a request whose If-None-Match matches gets an empty 304 before any rows are read.
     """
     try:
+        request = project.listUsers_service.GetUsersRequest(
+            limit=limit, cursor=cursor, include=include, relation_limit=relation_limit
+        )
+        tables = project.listUsers_service.user_list_tables(include)
+        validators = await table_validators(*tables) if tables else None
+        ndjson = wants_ndjson(http_request, stream)
+        if validators is not None:
+            if ndjson:
+                validators = validators.variant(NDJSON_MEDIA_TYPE)
+            if is_not_modified(http_request, validators):
+                return not_modified(validators)
+        headers = validator_headers(validators) if validators else None
+        if ndjson:
+            users = project.listUsers_service.streamUsers(
+                request.include, request.relation_limit
+            )
+            return ndjson_response(users, headers=headers)
         res = await project.listUsers_service.listUsers(request)
-        return res
+        return FastJSONResponse(res, headers=headers)
     except Exception as e:
         logger.exception("Error processing request")
         res = dict()
@@ -679,7 +1296,7 @@ async def api_get_listUsers(
 
 
 @app.put(
-    "/users/{userId}", response_model=project.updateUser_service.UpdateUserResponse
+    "/users/{userId}", response_model="project.updateUser_service.UpdateUserResponse"
 )
 async def api_put_updateUser(
     userId: str, email: str, name: str, role: Optional[str]
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesces concurrent identical reads: the first caller for a key starts the load, and callers that
+    arrive while it is in flight await the same task and share its result or exception, so database load
+    grows with the number of distinct keys rather than with the request rate. The key is forgotten as soon
+    as the load finishes; nothing is cached beyond that.
+
+    Each caller waits at most timeout seconds. A caller that times out or is cancelled stops waiting, but
+    the shared load keeps running for the others. A caller joining a load that started before a write may
+    get the pre-write result, as it would had it arrived a moment earlier. Meant for single event-loop use.
+    """
+
+    def __init__(self, name: str, timeout: float) -> None:
+        self.name = name
+        self.timeout = timeout
+        self._in_flight: Dict[K, asyncio.Task] = {}
+        self.loads = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    async def do(
+        self,
+        key: K,
+        load: Callable[[], Awaitable[V]],
+        timeout: Optional[float] = None,
+    ) -> V:
+        """
+        Returns the result of load() for key, joining the load already in flight for it if there is one.
+
+        Args:
+            key (K): Identifies the read; calls with equal keys share one load.
+            load (Callable[[], Awaitable[V]]): Starts the read. Only called if no load for key is in flight.
+            timeout (Optional[float]): Seconds to wait for the result, defaulting to the instance's timeout.
+
+        Returns:
+            V: The result of the shared load.
+
+        Raises:
+            asyncio.TimeoutError: Raised if the result is not ready within the timeout.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.loads += 1
+        else:
+            self.coalesced += 1
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(task), self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def _finish(self, key: K, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the number of keys in flight and the load, coalescing, timeout and failure counters.
+
+        Returns:
+            Dict[str, float]: The counters, keyed by name.
+        """
+        return {
+            "in_flight": len(self._in_flight),
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
@@ -0,0 +1,107 @@
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pydantic_core
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    """
+    Decides whether a list endpoint should stream NDJSON instead of building a JSON document.
+
+    Args:
+        request (Request): The incoming HTTP request, inspected for an NDJSON Accept header.
+        stream (bool): The value of the ?stream= query flag.
+
+    Returns:
+        bool: True if the caller asked for NDJSON.
+    """
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def parse_json_rows(body: bytes, content_type: str) -> List[Any]:
+    """
+    Parses a request body holding either a JSON array or NDJSON (one JSON value per line).
+
+    Args:
+        body (bytes): The raw request body.
+        content_type (str): The request Content-Type header.
+
+    Returns:
+        List[Any]: The decoded rows, in order.
+
+    Raises:
+        ValueError: Raised if the body is not valid JSON/NDJSON or a JSON body is not an array.
+    """
+    if NDJSON_MEDIA_TYPE in content_type:
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    rows = json.loads(body or b"[]")
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON array or an application/x-ndjson body")
+    return rows
+
+
+async def iter_batches(
+    actions: Any,
+    where: Optional[Dict[str, Any]] = None,
+    include: Optional[Dict[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[List[Any]]:
+    """
+    Pages through a table in id order, yielding one batch of records at a time so that only
+    batch_size rows are held in memory at once.
+
+    Args:
+        actions (Any): The Prisma model actions, e.g. prisma.models.Hose.prisma().
+        where (Optional[Dict[str, Any]]): Additional filter applied to every batch.
+        include (Optional[Dict[str, Any]]): Relations to load with each record.
+        batch_size (int): Number of records fetched per query.
+
+    Yields:
+        List[Any]: The next non-empty batch of records.
+    """
+    last_id: Optional[str] = None
+    while True:
+        batch_where = dict(where or {})
+        if last_id is not None:
+            batch_where["id"] = {"gt": last_id}
+        records = await actions.find_many(
+            where=batch_where,
+            include=include,
+            order={"id": "asc"},
+            take=batch_size,
+        )
+        if not records:
+            return
+        yield records
+        if len(records) < batch_size:
+            return
+        last_id = records[-1].id
+
+
+async def _encode_rows(rows: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield pydantic_core.to_json(row) + b"\n"
+
+
+def ndjson_response(
+    rows: AsyncIterator[Any], headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """
+    Wraps an async iterator of response rows into a streaming NDJSON response, one JSON object per line.
+
+    Args:
+        rows (AsyncIterator[Any]): The rows to serialize, models or JSON-ready dicts, produced lazily.
+        headers (Optional[Dict[str, str]]): Extra response headers, e.g. cache validators.
+
+    Returns:
+        StreamingResponse: The response streaming the rows as they are produced.
+    """
+    return StreamingResponse(
+        _encode_rows(rows), headers=headers, media_type=NDJSON_MEDIA_TYPE
+    )
@@ -0,0 +1,252 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+import prisma
+import prisma.models
+from project.config import TIP_STORE_REFRESH_SECONDS
+from project.http_cache import Validators, make_etag
+from project.streaming import iter_batches
+
+logger = logging.getLogger(__name__)
+
+
+class CareTipEntry(NamedTuple):
+    """
+    An immutable copy of a CareTip row, with the entity tag of its current version.
+    """
+
+    id: str
+    title: str
+    description: str
+    practices: Tuple[str, ...]
+    hoseIds: Tuple[str, ...]
+    createdAt: datetime
+    updatedAt: datetime
+    etag: str
+
+    @property
+    def validators(self) -> Validators:
+        return Validators(self.etag, self.updatedAt)
+
+
+def to_entry(record: prisma.models.CareTip) -> CareTipEntry:
+    """
+    Copies a CareTip record into an immutable store entry.
+
+    Args:
+        record (prisma.models.CareTip): The database record.
+
+    Returns:
+        CareTipEntry: The entry, tagged from its id and updatedAt.
+    """
+    return CareTipEntry(
+        id=record.id,
+        title=record.title,
+        description=record.description,
+        practices=tuple(record.practices),
+        hoseIds=tuple(record.hoseIds),
+        createdAt=record.createdAt,
+        updatedAt=record.updatedAt,
+        etag=make_etag(record.id, record.updatedAt.isoformat()),
+    )
+
+
+class TipSnapshot(NamedTuple):
+    """
+    One immutable version of the care tips: every tip in creation order, by id, and by the hose ids
+    it applies to. The entity tag changes whenever any tip is created, updated or deleted, and
+    lastModified is when this process built the snapshot, so that deletes move it forward too.
+    """
+
+    tips: Tuple[CareTipEntry, ...]
+    by_id: Mapping[str, CareTipEntry]
+    by_hose: Mapping[str, Tuple[CareTipEntry, ...]]
+    etag: str
+    lastModified: datetime
+
+    @property
+    def validators(self) -> Validators:
+        return Validators(self.etag, self.lastModified)
+
+    def for_hose(self, hose_id: str) -> Tuple[CareTipEntry, ...]:
+        """
+        Returns the tips that apply to a hose, in creation order.
+
+        Args:
+            hose_id (str): The hose id.
+
+        Returns:
+            Tuple[CareTipEntry, ...]: The tips, empty if there are none.
+        """
+        return self.by_hose.get(hose_id, ())
+
+
+def build_snapshot(entries: Iterable[CareTipEntry]) -> TipSnapshot:
+    """
+    Builds a snapshot, and its indexes, from a set of tips.
+
+    Args:
+        entries (Iterable[CareTipEntry]): The tips, in any order.
+
+    Returns:
+        TipSnapshot: The snapshot.
+    """
+    tips = tuple(sorted(entries, key=lambda tip: (tip.createdAt, tip.id)))
+    by_hose: Dict[str, Tuple[CareTipEntry, ...]] = {}
+    for tip in tips:
+        for hose_id in tip.hoseIds:
+            by_hose[hose_id] = by_hose.get(hose_id, ()) + (tip,)
+    return TipSnapshot(
+        tips=tips,
+        by_id=MappingProxyType({tip.id: tip for tip in tips}),
+        by_hose=MappingProxyType(by_hose),
+        etag=make_etag("tips", *(tip.etag for tip in tips)),
+        lastModified=max(
+            [datetime.now(timezone.utc), *(tip.updatedAt for tip in tips)]
+        ),
+    )
+
+
+class TipStore:
+    """
+    Serves the care tips from an in-memory snapshot, so reads never touch the database. A write
+    builds a new snapshot from the current one and swaps it in with a single assignment; readers
+    holding the old snapshot keep a consistent view. Writes are applied synchronously, so two writes
+    cannot interleave on the event loop. Writes made while the store is loading are replayed on top
+    of the loaded snapshot.
+
+    The snapshot is a per-worker structure: writes made through this process are applied at once, and
+    a periodic reload picks up those made by other workers. Until then they are missing from this
+    worker's reads and entity tags.
+    """
+
+    def __init__(self) -> None:
+        self.snapshot: TipSnapshot = build_snapshot(())
+        self.loaded = False
+        self._pending: Optional[Dict[str, Optional[CareTipEntry]]] = None
+        self._loading: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self) -> int:
+        """
+        Reads every care tip from the database and swaps in a fresh snapshot. Callers arriving while a
+        load is in flight share it.
+
+        Returns:
+            int: The number of tips loaded.
+        """
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._load())
+            self._loading.add_done_callback(self._load_done)
+        return await asyncio.shield(self._loading)
+
+    def _load_done(self, task: asyncio.Task) -> None:
+        if self._loading is task:
+            self._loading = None
+
+    async def _load(self) -> int:
+        self._pending = {}
+        try:
+            entries: Dict[str, Optional[CareTipEntry]] = {}
+            async for batch in iter_batches(prisma.models.CareTip.prisma()):
+                entries.update((record.id, to_entry(record)) for record in batch)
+            entries.update(self._pending)
+        finally:
+            self._pending = None
+        snapshot = build_snapshot(
+            entry for entry in entries.values() if entry is not None
+        )
+        if snapshot.etag != self.snapshot.etag:
+            self.snapshot = snapshot
+        self.loaded = True
+        return len(self.snapshot.tips)
+
+    async def current(self) -> TipSnapshot:
+        """
+        Returns the current snapshot, loading the store on first use.
+
+        Returns:
+            TipSnapshot: The snapshot.
+        """
+        if not self.loaded:
+            await self.load()
+        return self.snapshot
+
+    def _swap(self, tip_id: str, entry: Optional[CareTipEntry]) -> None:
+        if self._pending is not None:
+            self._pending[tip_id] = entry
+        tips = {tip.id: tip for tip in self.snapshot.tips}
+        if entry is None:
+            tips.pop(tip_id, None)
+        else:
+            tips[tip_id] = entry
+        self.snapshot = build_snapshot(tips.values())
+
+    def record_saved(self, record: prisma.models.CareTip) -> CareTipEntry:
+        """
+        Applies a created or updated care tip.
+
+        Args:
+            record (prisma.models.CareTip): The record as written.
+
+        Returns:
+            CareTipEntry: The entry now in the snapshot.
+        """
+        entry = to_entry(record)
+        self._swap(record.id, entry)
+        return entry
+
+    def record_deleted(self, tip_id: str) -> None:
+        """
+        Removes a deleted care tip.
+
+        Args:
+            tip_id (str): The id of the deleted tip.
+        """
+        self._swap(tip_id, None)
+
+    async def _run_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Care tip reload failed")
+
+    def start(self, interval: float) -> None:
+        """
+        Starts reloading the snapshot in the background every interval seconds.
+
+        Args:
+            interval (float): Seconds between reloads.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run_periodically(interval), name="tip-store-refresh"
+            )
+
+    async def stop(self) -> None:
+        """
+        Cancels the background task, if any.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+tip_store = TipStore()
+
+
+def start_tip_store_refresh() -> None:
+    """
+    Starts the periodic reload if TIP_STORE_REFRESH_SECONDS is positive.
+    """
+    if TIP_STORE_REFRESH_SECONDS > 0:
+        tip_store.start(TIP_STORE_REFRESH_SECONDS)
@@ -3,6 +3,8 @@ from typing import Optional
 
 import prisma
 import prisma.models
+from project.compatibility_matrix import compatibility_matrix
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
 
@@ -47,6 +49,8 @@ async def updateCompatibility(
             "checkedAt": checkedAt,
         },
     )
+    await compatibility_matrix.record_updated(compatibility)
+    product_catalog_cache.details.invalidate(compatibility.hoseId)
     response = UpdateCompatibilityResponse(
         compatibilityId=compatibility.id,
         hoseId=compatibility.hoseId,
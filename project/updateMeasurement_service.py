@@ -1,5 +1,8 @@
 import prisma
 import prisma.models
+from project.hose_index import hose_index
+from project.measurement_stats import measurement_stats
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
 
@@ -27,17 +30,17 @@ async def updateMeasurement(
         UpdateMeasurementResponse: This model details the response returned after attempting to update a measurement. It will indicate either success or failure along with an appropriate message.
     """
     try:
-        existing_measurement = await prisma.models.HoseMeasurement.prisma().find_unique(
-            where={"id": measurementId}
+        updated_measurement = await prisma.models.HoseMeasurement.prisma().update(
+            where={"id": measurementId},
+            data={"Hose": {"update": {"length": length, "diameter": diameter}}},
         )
-        if not existing_measurement:
+        if updated_measurement is None:
             return UpdateMeasurementResponse(
                 success=False, message="Measurement not found"
             )
-        await prisma.models.HoseMeasurement.prisma().update(
-            where={"id": measurementId},
-            data={"Hose": {"update": {"length": length, "diameter": diameter}}},
-        )
+        product_catalog_cache.invalidate_hose(updated_measurement.hoseId)
+        hose_index.upsert(updated_measurement.hoseId, length, diameter)
+        measurement_stats.invalidate(updated_measurement.hoseId)
         return UpdateMeasurementResponse(
             success=True, message="Measurement updated successfully"
         )
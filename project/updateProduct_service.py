@@ -1,7 +1,22 @@
 import prisma
 import prisma.models
+from project.database import sql_now
+from project.hose_index import hose_index
+from project.measurement_stats import measurement_stats
+from project.product_cache import product_catalog_cache
 from pydantic import BaseModel
 
+# Updates the hose and returns its new and previous dimensions in one statement; the previous ones decide
+# which cached product lists the hose has to be dropped from.
+UPDATE_HOSE_LENGTH_QUERY = """
+UPDATE "Hose" AS h
+SET "length" = $2, "updatedAt" = $3::timestamp
+FROM (SELECT "id", "length", "diameter" FROM "Hose" WHERE "id" = $1 FOR UPDATE) AS old
+WHERE h."id" = old."id"
+RETURNING h."id", h."length", h."diameter",
+    old."length" AS "previousLength", old."diameter" AS "previousDiameter"
+"""
+
 
 class ProductDetails(BaseModel):
     """
@@ -46,15 +61,29 @@ async def updateProduct(
 
     Returns:
         ProductUpdateResponse: The response after updating a product showing the updated details of the product.
+
+    Raises:
+        ValueError: Raised if no product exists with the given productId.
     """
-    hose = await prisma.models.Hose.prisma().find_unique(where={"id": productId})
-    if not hose:
+    rows = await prisma.get_client().query_raw(
+        UPDATE_HOSE_LENGTH_QUERY, productId, productDetails.price, sql_now()
+    )
+    if not rows:
         raise ValueError("Product not found")
-    updated_hose = await prisma.models.Hose.prisma().update(
-        where={"id": productId}, data={"length": productDetails.price}
+    updated_hose = rows[0]
+    length, diameter = float(updated_hose["length"]), float(updated_hose["diameter"])
+    product_catalog_cache.invalidate_hose(
+        productId,
+        (
+            float(updated_hose["previousLength"]),
+            float(updated_hose["previousDiameter"]),
+        ),
+        (length, diameter),
     )
+    hose_index.upsert(productId, length, diameter)
+    measurement_stats.invalidate(productId)
     updated_product = Product(
-        id=updated_hose.id,
+        id=productId,
         name=productDetails.name,
         description=productDetails.description,
         price=productDetails.price,
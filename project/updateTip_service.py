@@ -2,6 +2,7 @@ from typing import List
 
 import prisma
 import prisma.models
+from project.tip_store import tip_store
 from pydantic import BaseModel
 
 
@@ -29,7 +30,8 @@ async def updateTip(
 ) -> UpdateTipResponse:
     """
     Allows administrators to update existing care tip details identified by tipId. The function modifies the
-    'CareTip' record in the database with new title, content, and applicable products and returns the updated tip object.
+    'CareTip' record in the database with new title, content, and applicable products, swaps the updated tip into
+    the in-memory tip store and returns the updated tip object.
 
     Args:
         tipId (str): The unique identifier of the hose care tip to be updated.
@@ -39,25 +41,26 @@ async def updateTip(
 
     Returns:
         UpdateTipResponse: The response model returning the updated hose care tip details.
+
+    Raises:
+        ValueError: Raised if no care tip exists with the given tipId.
     """
-    tip_record = await prisma.models.HoseCompatibility.prisma().find_unique(
-        where={"id": tipId}
+    tip = await prisma.models.CareTip.prisma().update(
+        where={"id": tipId},
+        data={
+            "title": tipTitle,
+            "description": tipContent,
+            "hoseIds": applicableProducts,
+        },
     )
-    if tip_record:
-        updated_record = await prisma.models.HoseCompatibility.prisma().update(
-            where={"id": tipId},
-            data={
-                "attachment": tipTitle,
-                "compatible": tipContent,
-                "checkedAt": applicableProducts,
-            },
-        )
-        updated_tip = CareTip(
-            id=updated_record.id,
-            title=updated_record.attachment,
-            content=updated_record.compatible,
-            applicableProducts=updated_record.checkedAt,
+    if tip is None:
+        raise ValueError(f"No care tip found with ID '{tipId}'")
+    tip_store.record_saved(tip)
+    return UpdateTipResponse(
+        updatedTip=CareTip(
+            id=tip.id,
+            title=tip.title,
+            content=tip.description,
+            applicableProducts=tip.hoseIds,
         )
-        return UpdateTipResponse(updatedTip=updated_tip)
-    else:
-        raise ValueError(f"No HoseCompatibility found with ID '{tipId}'")
+    )
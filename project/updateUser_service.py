@@ -4,6 +4,7 @@ from typing import List, Optional
 import prisma
 import prisma.enums
 import prisma.models
+from project.database import sql_now
 from pydantic import BaseModel
 
 
@@ -52,6 +53,20 @@ class User(BaseModel):
     ]  # TODO(autogpt): Type annotation not supported for this statement. reportInvalidTypeForm
 
 
+# Updates the user in one statement. The role only changes if the user being updated is an administrator.
+UPDATE_USER_QUERY = """
+UPDATE "User"
+SET "email" = $2,
+    "role" = CASE
+        WHEN $3::text IS NOT NULL AND "role" = 'ADMINISTRATOR' THEN $3::text::"UserRole"
+        ELSE "role"
+    END,
+    "updatedAt" = $4::timestamp
+WHERE "id" = $1
+RETURNING *
+"""
+
+
 class UpdateUserResponse(BaseModel):
     """
     Response model that confirms the user details have been updated. Returns updated user information.
@@ -70,19 +85,16 @@ async def updateUser(
     Args:
         userId (str): The ID of the user to update. This is required to fetch the correct user from the database.
         email (str): The new email address for the user.
-        name (str): The full name of the user.
+        name (str): The full name of the user. The User table has no name column, so it is not stored.
         role (Optional[str]): The user role, which can only be modified by administrators. Can be one of 'ADMINISTRATOR', 'STANDARD_USER', or 'GUEST'.
 
     Returns:
         UpdateUserResponse: Response model that confirms the user details have been updated. Returns updated user information.
     """
-    user = await prisma.models.User.prisma().find_unique(where={"id": userId})
-    if user is None:
-        return UpdateUserResponse(message="User not found", user=None)
-    update_data = {"email": email, "name": name}
-    if role is not None and user.role == "ADMINISTRATOR":
-        update_data["role"] = role
-    updated_user = await prisma.models.User.prisma().update(
-        where={"id": userId}, data=update_data
+    rows = await prisma.get_client().query_raw(
+        UPDATE_USER_QUERY, userId, email, role, sql_now()
     )
+    if not rows:
+        return UpdateUserResponse(message="User not found", user=None)
+    updated_user = prisma.models.User.model_validate(rows[0])
     return UpdateUserResponse(message="User updated successfully", user=updated_user)
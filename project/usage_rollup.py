@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import prisma
+import prisma.models
+from project.config import (
+    USAGE_ROLLUP_BATCH_SIZE,
+    USAGE_ROLLUP_INTERVAL_SECONDS,
+    USAGE_ROLLUP_LAG_SECONDS,
+)
+from project.pagination import keyset_after, keyset_order
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "usage_log"
+
+GRANULARITIES = ("hour", "day")
+
+# Moves the watermark from the position a batch was read after. Matches no row if another run has moved it.
+ADVANCE_WATERMARK_QUERY = """
+UPDATE "RollupWatermark"
+SET "lastViewedAt" = $4::timestamp, "lastId" = $5, "updatedAt" = $6::timestamp
+WHERE "name" = $1 AND "lastViewedAt" = $2::timestamp AND "lastId" = $3
+"""
+
+# Creates the watermark of the first batch ever. Matches no row if another run has created it.
+CREATE_WATERMARK_QUERY = """
+INSERT INTO "RollupWatermark" ("name", "lastViewedAt", "lastId", "updatedAt")
+VALUES ($1, $2::timestamp, $3, $4::timestamp)
+ON CONFLICT ("name") DO NOTHING
+"""
+
+INCREMENT_BUCKETS_QUERY = """
+INSERT INTO "UsageRollup" ("hoseId", "granularity", "bucketStart", "views")
+SELECT b."hoseId", b."granularity", b."bucketStart", b."views"
+FROM jsonb_to_recordset($1::jsonb)
+    AS b("hoseId" text, "granularity" text, "bucketStart" timestamp, "views" int)
+ON CONFLICT ("hoseId", "granularity", "bucketStart")
+DO UPDATE SET "views" = "UsageRollup"."views" + EXCLUDED."views"
+"""
+
+
+def _sql_timestamp(moment: datetime) -> str:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.isoformat()
+
+
+class WatermarkMoved(Exception):
+    """
+    Raised inside a batch transaction when another run has moved the watermark since the batch was read.
+    """
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """
+    Truncates a timestamp to the start of its hour or day bucket.
+
+    Args:
+        moment (datetime): The timestamp.
+        granularity (str): "hour" or "day".
+
+    Returns:
+        datetime: The start of the bucket containing moment.
+
+    Raises:
+        ValueError: Raised for an unknown granularity.
+    """
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(
+        f"Unknown granularity '{granularity}', expected one of {GRANULARITIES}"
+    )
+
+
+class RollupResult(NamedTuple):
+    """
+    Outcome of one incremental rollup run.
+    """
+
+    processed: int
+    buckets: int
+    watermark: Optional[datetime]
+
+
+class UsageRollupEngine:
+    """
+    Incrementally aggregates UsageLog rows into UsageRollup view counts per hose and hour/day bucket.
+
+    Progress is tracked with a (viewedAt, id) watermark stored in RollupWatermark, so each run reads only
+    rows after the previous one, in keyset order. Rows younger than the configured lag are left for a
+    later run so that slow inserts with an earlier viewedAt are not skipped. The bucket increments and the
+    new watermark of each batch are committed in one transaction, so a crash never double counts.
+
+    Every worker may run the rollup. Runs within this process are serialized by a lock; runs in other
+    workers or instances are fenced by the watermark itself: a batch only commits if it moves the
+    watermark from the exact position the batch was read after, and the transaction does that before
+    touching any bucket, so a concurrent run blocks on the watermark row, then finds it moved, rolls
+    back and stops.
+    """
+
+    def __init__(self, batch_size: int, lag_seconds: float) -> None:
+        self.batch_size = batch_size
+        self.lag = timedelta(seconds=lag_seconds)
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self) -> RollupResult:
+        """
+        Processes every UsageLog row between the stored watermark and now minus the lag.
+
+        Returns:
+            RollupResult: The number of rows processed, bucket rows touched and the resulting watermark.
+        """
+        async with self._lock:
+            watermark = await prisma.models.RollupWatermark.prisma().find_unique(
+                where={"name": WATERMARK_NAME}
+            )
+            position: Optional[Tuple[datetime, str]] = (
+                (watermark.lastViewedAt, watermark.lastId) if watermark else None
+            )
+            cutoff = datetime.now(timezone.utc) - self.lag
+            processed = 0
+            buckets = 0
+            while True:
+                where: Dict = {"viewedAt": {"lt": cutoff}}
+                if position is not None:
+                    where = {"AND": [where, keyset_after(*position, "viewedAt")]}
+                rows = await prisma.models.UsageLog.prisma().find_many(
+                    where=where, order=keyset_order("viewedAt"), take=self.batch_size
+                )
+                if not rows:
+                    break
+                counts: Counter = Counter()
+                for row in rows:
+                    for granularity in GRANULARITIES:
+                        counts[
+                            (
+                                row.hoseId,
+                                granularity,
+                                bucket_start(row.viewedAt, granularity),
+                            )
+                        ] += 1
+                previous, position = position, (rows[-1].viewedAt, rows[-1].id)
+                if not await self._commit(counts, previous, position):
+                    logger.info("Usage rollup stopped: another run moved the watermark")
+                    position = previous
+                    break
+                processed += len(rows)
+                buckets += len(counts)
+                if len(rows) < self.batch_size:
+                    break
+            return RollupResult(
+                processed, buckets, position[0] if position is not None else None
+            )
+
+    async def _commit(
+        self,
+        counts: Counter,
+        previous: Optional[Tuple[datetime, str]],
+        position: Tuple[datetime, str],
+    ) -> bool:
+        buckets = [
+            {
+                "hoseId": hose_id,
+                "granularity": granularity,
+                "bucketStart": _sql_timestamp(start),
+                "views": views,
+            }
+            for (hose_id, granularity, start), views in counts.items()
+        ]
+        now = _sql_timestamp(datetime.now(timezone.utc))
+        try:
+            async with prisma.get_client().tx() as transaction:
+                if previous is None:
+                    moved = await transaction.execute_raw(
+                        CREATE_WATERMARK_QUERY,
+                        WATERMARK_NAME,
+                        _sql_timestamp(position[0]),
+                        position[1],
+                        now,
+                    )
+                else:
+                    moved = await transaction.execute_raw(
+                        ADVANCE_WATERMARK_QUERY,
+                        WATERMARK_NAME,
+                        _sql_timestamp(previous[0]),
+                        previous[1],
+                        _sql_timestamp(position[0]),
+                        position[1],
+                        now,
+                    )
+                if not moved:
+                    raise WatermarkMoved()
+                await transaction.execute_raw(
+                    INCREMENT_BUCKETS_QUERY, json.dumps(buckets)
+                )
+        except WatermarkMoved:
+            return False
+        return True
+
+    async def _run_periodically(self, interval: float) -> None:
+        while True:
+            try:
+                result = await self.run()
+                if result.processed:
+                    logger.info(
+                        "Rolled up %d usage logs into %d buckets",
+                        result.processed,
+                        result.buckets,
+                    )
+            except Exception:
+                logger.exception("Usage rollup failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """
+        Starts running the rollup in the background every interval seconds.
+
+        Args:
+            interval (float): Seconds between runs.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run_periodically(interval), name="usage-rollup"
+            )
+
+    async def stop(self) -> None:
+        """
+        Cancels the background task, if any.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+usage_rollup = UsageRollupEngine(USAGE_ROLLUP_BATCH_SIZE, USAGE_ROLLUP_LAG_SECONDS)
+
+
+def start_usage_rollup() -> None:
+    """
+    Starts the periodic rollup if USAGE_ROLLUP_INTERVAL_SECONDS is positive.
+    """
+    if USAGE_ROLLUP_INTERVAL_SECONDS > 0:
+        usage_rollup.start(USAGE_ROLLUP_INTERVAL_SECONDS)
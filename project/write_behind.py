@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Accepts rows immediately and writes them to the database in the background with create_many.
+    A batch is flushed once it reaches batch_size rows or flush_interval seconds after its first row,
+    whichever comes first. When the queue is full, callers wait up to put_timeout seconds for space
+    (backpressure) and are then rejected (load shedding). If a batch insert fails, it is split in halves
+    that are retried on their own, down to single rows, so that a bad row does not drop the rest and
+    isolating it costs about 2 * log2(batch_size) inserts. on_written, if given, is called with the rows of
+    every successful write.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        actions: Callable[[], Any],
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        put_timeout: float,
+        on_written: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    ) -> None:
+        self.name = name
+        self._actions = actions
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._on_written = on_written
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.accepted = 0
+        self.shed = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """
+        Starts the background flusher. Must be called from within the running event loop.
+        """
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._worker = asyncio.create_task(self._run(), name=f"{self.name}-flusher")
+
+    async def stop(self) -> None:
+        """
+        Stops accepting rows and waits until every queued row has been written.
+        """
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+        leftover = [row for row in self._drain() if row is not None]
+        if leftover:
+            await self._flush(leftover)
+
+    def _drain(self) -> List[Optional[Dict[str, Any]]]:
+        rows = []
+        while not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        return rows
+
+    async def submit(self, row: Dict[str, Any]) -> bool:
+        """
+        Queues a row for writing.
+
+        Args:
+            row (Dict[str, Any]): The create_many data of the row.
+
+        Returns:
+            bool: True if the row was queued, False if it was shed because the queue stayed full.
+        """
+        try:
+            await asyncio.wait_for(self._queue.put(row), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        self.accepted += 1
+        return True
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        self.flushes += 1
+        await self._write(batch)
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            await self._actions().create_many(data=rows)
+        except Exception:
+            if len(rows) == 1:
+                self.failed += 1
+                logger.exception(
+                    "Dropping row %s written to %s", rows[0].get("id"), self.name
+                )
+                return
+            logger.warning(
+                "Batch write of %d rows to %s failed, retrying in halves",
+                len(rows),
+                self.name,
+            )
+            middle = len(rows) // 2
+            await self._write(rows[:middle])
+            await self._write(rows[middle:])
+            return
+        self.written += len(rows)
+        self._notify(rows)
+
+    def _notify(self, rows: List[Dict[str, Any]]) -> None:
+        if self._on_written is None:
+            return
+        try:
+            self._on_written(rows)
+        except Exception:
+            logger.exception("on_written callback of %s failed", self.name)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the queue depth and throughput counters of the buffer.
+
+        Returns:
+            Dict[str, float]: The counters, keyed by name.
+        """
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "accepted": self.accepted,
+            "shed": self.shed,
+            "written": self.written,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
@@ -0,0 +1,101 @@
+from project.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(max_entries: int = 3, ttl_seconds: float = 10.0):
+    clock = FakeClock()
+    return TTLCache("test", max_entries, ttl_seconds, clock=clock), clock
+
+
+def test_get_returns_fresh_values_and_counts_hits_and_misses():
+    cache, _ = make_cache()
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_the_ttl():
+    cache, clock = make_cache(ttl_seconds=5.0)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+    assert list(cache.keys()) == []
+
+
+def test_least_recently_used_entry_is_evicted_when_full():
+    cache, _ = make_cache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_zero_capacity_caches_nothing():
+    cache, _ = make_cache(max_entries=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_invalidate_and_invalidate_where_drop_matching_keys():
+    cache, _ = make_cache()
+    cache.set(("list", 1), "x")
+    cache.set(("list", 2), "y")
+    cache.set(("detail", 1), "z")
+    cache.invalidate(("detail", 1))
+    cache.invalidate_where(lambda key: key[0] == "list")
+    assert list(cache.keys()) == []
+    assert cache.stats()["invalidations"] == 3
+
+
+def test_set_skips_a_value_loaded_before_its_key_was_invalidated():
+    cache, _ = make_cache()
+    generation = cache.generation()
+    cache.invalidate("a")
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+    cache.set("a", "fresh", cache.generation())
+    assert cache.get("a") == "fresh"
+
+
+def test_invalidating_another_key_does_not_drop_the_value():
+    cache, _ = make_cache()
+    generation = cache.generation()
+    cache.invalidate("b")
+    cache.set("a", 1, generation)
+    assert cache.get("a") == 1
+
+
+def test_clear_and_invalidate_where_fence_every_key():
+    cache, _ = make_cache()
+    generation = cache.generation()
+    cache.clear()
+    cache.set("a", 1, generation)
+    assert cache.get("a") is None
+    generation = cache.generation()
+    cache.invalidate_where(lambda key: False)
+    cache.set("a", 1, generation)
+    assert cache.get("a") is None
+
+
+def test_tracked_invalidations_are_bounded_by_falling_back_to_a_fence():
+    cache, _ = make_cache(max_entries=2)
+    generation = cache.generation()
+    for key in ("x", "y", "z"):
+        cache.invalidate(key)
+    cache.set("a", 1, generation)
+    assert cache.get("a") is None
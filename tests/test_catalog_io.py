@@ -0,0 +1,34 @@
+import asyncio
+
+from project.catalog_io import MalformedCatalogLine, iter_catalog_rows
+from project.importCatalog_service import importCatalog
+from project.streaming import NDJSON_MEDIA_TYPE
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+def test_malformed_ndjson_line_is_reported_and_reading_goes_on():
+    catalog = chunks(
+        b'{"length": 10, "diameter": 0.5}\n\n{"length": 15, ',
+        b'"diameter"\n{"length": 20, "diameter": 0.75}\n',
+    )
+    rows = asyncio.run(collect(iter_catalog_rows(catalog, NDJSON_MEDIA_TYPE)))
+    assert rows[0] == {"length": 10, "diameter": 0.5}
+    assert isinstance(rows[1], MalformedCatalogLine) and rows[1].line == 3
+    assert rows[2] == {"length": 20, "diameter": 0.75}
+    assert len(rows) == 3
+
+
+def test_import_counts_a_malformed_line_as_a_failed_row():
+    catalog = chunks(b'{"length": 10}\n{"length": \n{"diameter": 0.5}\n')
+    progress = asyncio.run(importCatalog(catalog, NDJSON_MEDIA_TYPE))
+    assert progress.done and progress.rowsRead == 3 and progress.failed == 3
+    assert progress.errors[1].row == 2
+    assert progress.errors[1].message.startswith("Line 2: Invalid JSON")
@@ -0,0 +1,78 @@
+import math
+import random
+
+from project.hose_index import HoseRangeIndex
+
+HOSES = [
+    ("a", 10.0, 0.5),
+    ("b", 15.0, 0.625),
+    ("c", 15.0, 0.5),
+    ("d", 25.0, 0.75),
+    ("e", 50.0, 1.0),
+]
+
+
+def make_index(hoses=HOSES) -> HoseRangeIndex:
+    index = HoseRangeIndex()
+    index.load(list(hoses))
+    return index
+
+
+def test_range_is_inclusive_and_ordered_by_length_then_diameter():
+    index = make_index()
+    assert index.range(length_min=15.0, length_max=25.0) == ["c", "b", "d"]
+    assert index.range(diameter_min=0.625, diameter_max=0.75) == ["b", "d"]
+    assert index.range() == ["a", "c", "b", "d", "e"]
+    assert index.range(length_min=60.0) == []
+
+
+def test_range_follows_upserts_and_removals():
+    index = make_index()
+    index.upsert("a", 30.0, 0.5)
+    index.upsert("f", 12.0, 0.5)
+    index.remove("d")
+    index.remove("missing")
+    assert index.range(length_max=30.0) == ["f", "c", "b", "a"]
+    assert len(index) == 5
+
+
+def test_writes_before_loading_are_ignored():
+    index = HoseRangeIndex()
+    index.upsert("a", 10.0, 0.5)
+    assert len(index) == 0 and not index.loaded
+
+
+def test_nearest_returns_the_closest_hoses_first():
+    index = make_index()
+    nearest = index.nearest(14.0, 0.6, limit=2)
+    assert [hose_id for hose_id, *_ in nearest] == ["b", "c"]
+    assert math.isclose(nearest[0][3], math.hypot(1.0, 0.025))
+    assert index.nearest(14.0, 0.6, limit=0) == []
+    assert len(index.nearest(14.0, 0.6, limit=50)) == len(HOSES)
+
+
+def test_nearest_matches_a_brute_force_scan():
+    rng = random.Random(7)
+    hoses = [
+        (f"h{i}", float(rng.randint(1, 100)), rng.choice((0.5, 0.625, 0.75, 1.0)))
+        for i in range(300)
+    ]
+    index = make_index(hoses)
+    for _ in range(20):
+        length, diameter = rng.uniform(0, 110), rng.uniform(0.4, 1.1)
+        expected = sorted(
+            math.hypot(hose_length - length, hose_diameter - diameter)
+            for _, hose_length, hose_diameter in hoses
+        )[:5]
+        found = [distance for *_, distance in index.nearest(length, diameter, 5)]
+        assert found == expected
+
+
+def test_index_is_current_only_at_the_version_it_was_loaded_at():
+    index = HoseRangeIndex()
+    assert not index.is_current(None)
+    index.load(list(HOSES))
+    index.version = "v1"
+    assert index.is_current("v1")
+    assert not index.is_current("v2")
+    assert not index.is_current(None)
@@ -0,0 +1,9 @@
+from project.listUsers_service import build_user_include
+
+
+def test_included_relations_keep_their_most_recent_rows():
+    include = build_user_include(["UsageLogs", "Questions", "UsageLogs"], 5)
+    assert include == {
+        "UsageLogs": {"take": 5, "order_by": [{"viewedAt": "desc"}, {"id": "desc"}]},
+        "Questions": {"take": 5, "order_by": [{"createdAt": "desc"}, {"id": "desc"}]},
+    }
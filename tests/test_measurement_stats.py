@@ -0,0 +1,63 @@
+import math
+import statistics
+from array import array
+
+from project.measurement_stats import (
+    DAY_SECONDS,
+    HoseAggregate,
+    summarize,
+    trend_per_day,
+    weighted_distribution,
+)
+
+
+def test_weighted_distribution_matches_the_expanded_values():
+    values = array("d", [10.0, 25.0, 50.0, 15.0])
+    weights = array("d", [3, 1, 2, 0])
+    expanded = [10.0] * 3 + [25.0] + [50.0] * 2
+    distribution = weighted_distribution(values, weights)
+    assert distribution.count == 6
+    assert math.isclose(distribution.mean, statistics.fmean(expanded))
+    assert math.isclose(distribution.stddev, statistics.pstdev(expanded))
+    assert distribution.minimum == 10.0
+    assert distribution.maximum == 50.0
+    assert distribution.percentiles == (10.0, 50.0, 50.0)
+
+
+def test_weighted_distribution_of_nothing_is_empty():
+    distribution = weighted_distribution(array("d"), array("d"))
+    assert distribution.count == 0
+    assert distribution.mean is None
+    assert distribution.percentiles == (None, None, None)
+
+
+def test_trend_per_day_is_the_weighted_slope():
+    days = [0.0, DAY_SECONDS, 2 * DAY_SECONDS]
+    assert math.isclose(trend_per_day(days, [1, 1, 1], [10.0, 12.0, 14.0]), 2.0)
+    assert trend_per_day(days[:1], [1], [10.0]) is None
+    assert trend_per_day(days, [0, 0, 0], [10.0, 12.0, 14.0]) is None
+
+
+def test_summarize_weights_hoses_by_their_measurements():
+    day = 100 * DAY_SECONDS
+    summary = summarize(
+        [
+            HoseAggregate("b", 50.0, 1.0, 1, day, day, {day: 1}),
+            HoseAggregate(
+                "a",
+                10.0,
+                0.5,
+                3,
+                day,
+                day + DAY_SECONDS,
+                {day: 1, day + DAY_SECONDS: 2},
+            ),
+        ]
+    )
+    assert summary.hoseIds == ("a", "b")
+    assert summary.measurements == 4
+    assert math.isclose(summary.length.mean, 20.0)
+    assert summary.position("b") == 1 and summary.position("missing") is None
+    assert summary.dayStarts == (day, day + DAY_SECONDS)
+    assert list(summary.dayCounts) == [2.0, 2.0]
+    assert list(summary.dayLengthMeans) == [30.0, 10.0]
@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+import pytest
+from project.pagination import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+    keyset_order,
+    keyset_where,
+)
+
+CREATED = datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+
+
+def test_keyset_cursor_round_trips_and_is_url_safe():
+    cursor = encode_cursor(CREATED, "user-1")
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor) == (CREATED, "user-1")
+
+
+def test_keyset_where_selects_strictly_after_the_cursor():
+    cursor = encode_cursor(CREATED, "user-1")
+    assert keyset_where(None) == {}
+    assert keyset_where(cursor, "viewedAt") == {
+        "OR": [
+            {"viewedAt": {"gt": CREATED}},
+            {"viewedAt": CREATED, "id": {"gt": "user-1"}},
+        ]
+    }
+    assert keyset_order("viewedAt") == [{"viewedAt": "asc"}, {"id": "asc"}]
+
+
+def test_rank_cursor_round_trips():
+    cursor = encode_rank_cursor(3.1415926535, "answer:a1")
+    assert decode_rank_cursor(cursor) == (3.1415926535, "answer:a1")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", "eyJ0IjogMX0"])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+    with pytest.raises(ValueError):
+        decode_rank_cursor(cursor)
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from project.password_hashing import PasswordHasher
+
+
+def test_hash_verifies_only_the_original_password():
+    hasher = PasswordHasher(rounds=4, workers=2)
+    try:
+        hashed = asyncio.run(hasher.hash("correct horse"))
+        assert hashed.startswith("$2b$04$")
+        assert asyncio.run(hasher.verify("correct horse", hashed))
+        assert not asyncio.run(hasher.verify("wrong horse", hashed))
+    finally:
+        hasher.shutdown()
+
+
+def test_concurrent_calls_are_bounded_by_the_worker_count():
+    hasher = PasswordHasher(rounds=4, workers=2)
+
+    async def hash_many():
+        return await asyncio.gather(*(hasher.hash(f"pw-{i}") for i in range(6)))
+
+    try:
+        hashes = asyncio.run(hash_many())
+        assert len(set(hashes)) == 6
+        stats = hasher.stats()
+        assert stats["completed"] == 6
+        assert stats["max_queued"] == 4
+        assert stats["queued"] == 0 and stats["in_flight"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_unknown_executor_kind_is_rejected():
+    with pytest.raises(ValueError):
+        PasswordHasher(rounds=4, workers=1, executor_kind="fiber")
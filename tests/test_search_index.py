@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from project.search_index import InvertedIndex, tokenize
+
+CREATED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_index() -> InvertedIndex:
+    index = InvertedIndex()
+    index.add("question", "q1", "Garden hose leaking", "q1", "u1", CREATED)
+    index.add(
+        "question", "q2", "Which hose fits a kitchen faucet?", "q2", "u2", CREATED
+    )
+    index.add("answer", "a1", "Replace the hose washer", "q1", "u2", CREATED)
+    index.add("answer", "a2", "Tighten the faucet adapter", "q2", "u1", CREATED)
+    return index
+
+
+def keys(results) -> list:
+    return [hit.key for hit in results.hits]
+
+
+def test_tokenize_drops_short_tokens_and_stopwords():
+    assert tokenize("A hose, the Hose and 2 washers!") == ["hose", "hose", "washers"]
+
+
+def test_search_ranks_rare_terms_higher_and_counts_all_matches():
+    index = make_index()
+    results = index.search("leaking hose", limit=10)
+    assert keys(results)[0] == "question:q1"
+    assert set(keys(results)) == {"question:q1", "question:q2", "answer:a1"}
+    assert results.total == 3
+    assert index.search("unrelated", limit=10).total == 0
+
+
+def test_pages_continue_after_the_rank_cursor_without_repeats():
+    index = make_index()
+    full = keys(index.search("hose faucet", limit=10))
+    first = index.search("hose faucet", limit=2)
+    last = first.hits[-1]
+    second = index.search("hose faucet", limit=2, after=(last.score, last.key))
+    assert keys(first) + keys(second) == full
+
+
+def test_readding_a_document_replaces_its_terms():
+    index = make_index()
+    index.add("question", "q1", "Sprinkler timer", "q1", "u1", CREATED)
+    assert "question:q1" not in keys(index.search("leaking", limit=10))
+    assert keys(index.search("sprinkler", limit=10)) == ["question:q1"]
+    assert len(index) == 4
+
+
+def test_removing_a_question_removes_its_answers():
+    index = make_index()
+    index.remove_question("q1")
+    assert "answer:a1" not in index
+    assert "question:q1" not in index
+    assert index.search("leaking", limit=10).total == 0
+    assert len(index) == 2
+
+
+def test_removing_a_user_cascades_like_the_database():
+    index = make_index()
+    index.remove_user("u1")
+    # u1 wrote q1 (taking u2's answer a1 with it) and a2.
+    assert len(index) == 1
+    assert "question:q2" in index
+    index.remove_user("u2")
+    assert len(index) == 0 and index.terms == 0
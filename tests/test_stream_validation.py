@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from project.importCatalog_service import importCatalog, streamCatalogImport
+from project.listUsers_service import streamUsers
+
+
+async def no_chunks():
+    raise AssertionError("the stream must not be read")
+    yield b""
+
+
+def test_unknown_relation_is_rejected_before_streaming_users():
+    with pytest.raises(ValueError, match="Unknown relation"):
+        streamUsers(["Bogus"], 20)
+
+
+def test_unsupported_content_type_is_rejected_before_reading_the_catalog():
+    with pytest.raises(ValueError, match="Unsupported catalog content type"):
+        streamCatalogImport(no_chunks(), "text/plain")
+    with pytest.raises(ValueError, match="Unsupported catalog content type"):
+        asyncio.run(importCatalog(no_chunks(), "text/plain"))
+
+
+@pytest.mark.parametrize(
+    "params", [{"include": "Bogus"}, {"relation_limit": 0}], ids=["include", "limit"]
+)
+def test_streamed_user_list_with_invalid_parameters_is_an_error(params):
+    from fastapi.testclient import TestClient
+    from project.server import app
+
+    client = TestClient(app, raise_server_exceptions=False)
+    response = client.get("/users", params={"stream": 1, **params})
+    assert response.status_code == 500
+
+
+def test_streamed_import_with_unsupported_content_type_is_an_error():
+    from fastapi.testclient import TestClient
+    from project.server import app
+
+    client = TestClient(app, raise_server_exceptions=False)
+    response = client.post(
+        "/products:import",
+        params={"stream": 1},
+        content=b"hoseId\n",
+        headers={"content-type": "text/plain"},
+    )
+    assert response.status_code == 500
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from project.getUserTimeline_service import TIMELINE_RELATIONS, older_than
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+QUESTION = next(r for r in TIMELINE_RELATIONS if r.kind == "question")
+
+
+def matches(where: dict, time: datetime, record_id: str, field: str) -> bool:
+    if "OR" in where:
+        return any(matches(clause, time, record_id, field) for clause in where["OR"])
+    condition = where[field]
+    if isinstance(condition, datetime):
+        time_ok = time == condition
+    elif "lt" in condition:
+        time_ok = time < condition["lt"]
+    else:
+        time_ok = time <= condition["lte"]
+    return time_ok and ("id" not in where or record_id < where["id"]["lt"])
+
+
+def test_first_page_has_no_condition():
+    assert older_than(QUESTION, None) == {}
+
+
+def test_same_kind_breaks_ties_on_id():
+    position = (START, "question", "q5")
+    assert older_than(QUESTION, position) == {
+        "OR": [
+            {"createdAt": {"lt": START}},
+            {"createdAt": START, "id": {"lt": "q5"}},
+        ]
+    }
+
+
+def test_other_kinds_break_ties_on_kind_order():
+    assert older_than(QUESTION, (START, "answer", "a1")) == {"createdAt": {"lt": START}}
+    assert older_than(QUESTION, (START, "usage", "u1")) == {"createdAt": {"lte": START}}
+
+
+def test_every_position_selects_exactly_the_older_entries():
+    times = [START + timedelta(seconds=s) for s in (0, 0, 1, 1, 2)]
+    entries = [
+        (time, relation.kind, f"{relation.kind}-{i}", relation)
+        for relation in TIMELINE_RELATIONS
+        for i, time in enumerate(times)
+    ]
+    entries.sort(key=lambda entry: entry[:3], reverse=True)
+    for position, (time, kind, record_id, _) in enumerate(entries):
+        expected = [entry[2] for entry in entries[position + 1 :]]
+        selected = [
+            entry_id
+            for entry_time, _, entry_id, relation in entries
+            if matches(
+                older_than(relation, (time, kind, record_id)),
+                entry_time,
+                entry_id,
+                relation.time_field,
+            )
+        ]
+        assert sorted(selected) == sorted(expected)